@@ -8,8 +8,9 @@ import os
 import sys
 import random
 import time
-import threading
 import traceback
+import functools
+import hmac
 
 def configure_local_dev_environment():
     """
@@ -50,7 +51,7 @@ GAME_HISTORY_TABLE = os.environ.get('GAME_HISTORY_TABLE')
 print("Starting imports...")
 print(f"Environment: {os.environ.get('ENVIRONMENT', 'not set')}")
 
-from flask import Flask, request, jsonify, session
+from flask import Flask, request, jsonify, session, copy_current_request_context
 from flask_cors import CORS
 from flask_socketio import SocketIO, emit, join_room, leave_room
 
@@ -63,13 +64,26 @@ from database.game_history_service import game_history_service
 print("Database imports successful...")
 
 from api.auth_utils import require_auth, get_current_user, verify_cognito_token
+from api.state_sync import GameStateSync
+from api.broadcast import BroadcastCoalescer
+from api.lobby import LobbyFeed, LOBBY_ROOM
+from api.room_directory import RoomDirectory
+from api.room_actor import RoomCommandQueues, UnknownRoomError
+from api.sharding import shard_for_room, HttpMessageBus, LobbyAggregator, ShardSocketManager, SocketEventRelay
 
 print("Auth imports successful...")
 
 from game_engine.player import Player
 from game_engine.game_loop import GameLoop
+from game_engine.rules import RuleSet
+from game_engine.ledger import CardLedger
+from game_engine.history import GameHistory
 from game_engine.games.asshole import AssholeGame
 from game_engine.card import Card
+from game_engine.win_probability import WinProbabilityService
+from game_engine.bots.broker import BotDecisionBroker
+from game_engine.bots.scheduler import BotComputeScheduler
+from game_engine.hints import MoveHintEngine
 
 print("Game engine imports successful...")
 print("All imports completed successfully!")
@@ -104,7 +118,15 @@ frontend_origins = [origin for origin in frontend_origins if origin is not None]
 
 CORS(app, resources={r"/*": {"origins": frontend_origins}}, supports_credentials=True)
 
-socketio = SocketIO(app, cors_allowed_origins=frontend_origins, async_mode='eventlet', logger=True, engineio_logger=True)
+# Sharded deployment (see api/sharding.py): this process is shard SHARD_INDEX of SHARD_COUNT and only
+# creates rooms it owns. Shards share lobby diffs over the bus, so every shard can serve the whole lobby.
+SHARD_COUNT = int(os.environ.get('SHARD_COUNT', 1))
+SHARD_INDEX = int(os.environ.get('SHARD_INDEX', 0))
+# Emits to sockets held by another shard go over the shard bus (attached below); None is the default manager.
+socket_manager = ShardSocketManager() if SHARD_COUNT > 1 else None
+
+socketio = SocketIO(app, cors_allowed_origins=frontend_origins, async_mode='eventlet', logger=True, engineio_logger=True,
+                    client_manager=socket_manager)
 
 active_games = {}
 logger.debug(f"DEBUG_GLOBAL_ACTIVE_GAMES_ID_AT_START: {id(active_games)}")
@@ -121,25 +143,166 @@ except Exception as e:
 player_id_map = {}
 player_to_room_map = {}
 
+# Optional Monte Carlo win-probability estimates, published to each game room on a throttled channel.
+win_probability_service = None
+if os.environ.get('WIN_PROBABILITY_ENABLED', '').lower() == 'true':
+    win_probability_service = WinProbabilityService(
+        max_workers=int(os.environ.get('WIN_PROBABILITY_WORKERS', 1)),
+        min_publish_interval=float(os.environ.get('WIN_PROBABILITY_PUBLISH_INTERVAL', 1.0)),
+        publish=lambda room_code, estimate: socketio.emit('win_probability_update', estimate, room=room_code)
+    )
+
+# Every command that touches a room (routes, socket events, the interrupt timer, bot moves, broadcasts)
+# runs on that room's own queue. ROOM_ACTORS=0 runs them on the caller's thread instead.
+# Queues only exist for live rooms: commands naming any other room code raise UnknownRoomError.
+room_commands = RoomCommandQueues(
+    enabled=os.environ.get('ROOM_ACTORS', '1') != '0',
+    timeout=float(os.environ.get('ROOM_COMMAND_TIMEOUT', 30)),
+    room_exists=lambda room_code: room_code in active_games
+)
+
+# Bot seats from every room are decided together, one vectorized policy call per batching window.
+bot_broker = BotDecisionBroker(
+    window=float(os.environ.get('BOT_BROKER_WINDOW_MS', 5)) / 1000.0,
+    on_decision=lambda game: _on_bot_decision(game),
+    run_in_room=room_commands.run
+)
+
+# Optional search bots: thinking runs in worker processes under a CPU budget shared by all rooms,
+# falling back to the heuristic under load. When disabled, bots use the batched broker above.
+bot_scheduler = None
+if int(os.environ.get('BOT_SEARCH_WORKERS', 0)) > 0:
+    bot_scheduler = BotComputeScheduler(
+        max_workers=int(os.environ['BOT_SEARCH_WORKERS']),
+        time_slice=float(os.environ.get('BOT_SEARCH_TIME_SLICE', 0.25)),
+        cpu_budget=float(os.environ['BOT_SEARCH_CPU_BUDGET']) if os.environ.get('BOT_SEARCH_CPU_BUDGET') else None,
+        on_decision=lambda game: _on_bot_decision(game),
+        run_in_room=room_commands.submit
+    )
+
+# Per-player legal-move hints, cached until the pile or that player's hand changes.
+move_hint_engine = MoveHintEngine()
+
+# Fraction of new rooms whose card moves are checked against a CardLedger (0 disables it).
+CARD_LEDGER_SAMPLE_RATE = float(os.environ.get('CARD_LEDGER_SAMPLE_RATE', 0))
+
+# Per-room state history for /admin/game_history: a snapshot every GAME_HISTORY_INTERVAL actions,
+# at most GAME_HISTORY_CHECKPOINTS kept. GAME_HISTORY_CHECKPOINTS=0 disables it.
+GAME_HISTORY_INTERVAL = int(os.environ.get('GAME_HISTORY_INTERVAL', 20))
+GAME_HISTORY_CHECKPOINTS = int(os.environ.get('GAME_HISTORY_CHECKPOINTS', 10))
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+
+# Versioned game_state_update: clients that ack the versions they apply get deltas (game_state_delta).
+state_sync = GameStateSync(max_versions=int(os.environ.get('STATE_SYNC_VERSIONS', 16)))
+# Longest a GET /game_state?wait= long-poll is parked, in seconds.
+GAME_STATE_MAX_WAIT = float(os.environ.get('GAME_STATE_MAX_WAIT', 25))
+
+# Game state and lobby broadcasts go out at most once per tick; BROADCAST_TICK_MS=0 sends them immediately.
+BROADCAST_TICK = float(os.environ.get('BROADCAST_TICK_MS', 20)) / 1000.0
+broadcast_coalescer = BroadcastCoalescer(
+    flush_room=lambda game: _flush_game_state(game),
+    flush_lobby=lambda room_codes: _broadcast_lobby_changes(room_codes),
+    tick=BROADCAST_TICK
+)
+
+# Clients on the lobby screen join the LOBBY_ROOM channel: a full room list when they subscribe, then per-room diffs.
+lobby_feed = LobbyFeed()
+
+# Rooms indexed by status and game type for the paginated GET /rooms.
+room_directory = RoomDirectory()
+ROOMS_PAGE_DEFAULT = 50
+ROOMS_PAGE_MAX = 200
+
+# Sharded mode: a socket's events for a room on another shard are relayed there and run as if it were local.
+shard_bus = None
+lobby_aggregator = None
+socket_relay = None
+if SHARD_COUNT > 1:
+    shard_urls = [url.strip().rstrip('/') for url in os.environ.get('SHARD_URLS', '').split(',')]
+    shard_bus = HttpMessageBus(
+        [url for i, url in enumerate(shard_urls) if i != SHARD_INDEX and url],
+        os.environ.get('SHARD_BUS_TOKEN')
+    )
+    socket_manager.attach(shard_bus)
+    socket_relay = SocketEventRelay(shard_urls, os.environ.get('SHARD_BUS_TOKEN'))
+    lobby_aggregator = LobbyAggregator(
+        SHARD_INDEX, shard_bus,
+        on_changes=lambda changes: socketio.emit('lobby_update', changes, room=LOBBY_ROOM),
+        local_rooms=lambda: _get_all_rooms_state()['rooms']
+    )
+    lobby_aggregator.request_resync()
+
 # --- Helper functions ---
+def room_command(handler):
+    """
+    Runs a route or socket handler on the command queue of the room named in its
+    JSON body (or event data), with the request context copied over. Requests for
+    a room that does not exist never reach a queue: the handler runs on the
+    caller's thread and answers "not found" itself. Socket events for a room
+    owned by another shard are relayed to that shard.
+    """
+    @functools.wraps(handler)
+    def wrapper(*args, **kwargs):
+        data = args[0] if args else request.get_json(silent=True)
+        room_code = data.get('room_code') if isinstance(data, dict) else None
+        room_code = str(room_code).upper() if room_code else None
+        if room_code not in active_games:
+            if args and _is_other_shards_room(room_code):
+                return _relay_socket_event(room_code, args[0])
+            return handler(*args, **kwargs)
+        try:
+            return room_commands.run(room_code, copy_current_request_context(handler), *args, **kwargs)
+        except UnknownRoomError:
+            # Deleted between the check and queueing.
+            return handler(*args, **kwargs)
+    return wrapper
+
+def _is_other_shards_room(room_code):
+    return socket_relay is not None and bool(room_code) and shard_for_room(room_code, SHARD_COUNT) != SHARD_INDEX
+
+def _relay_socket_event(room_code, data):
+    """
+    Runs the current socket event on the shard that owns the room and returns its acknowledgement.
+    The socket stays on this shard; the owner's emits reach it over the shard bus.
+    """
+    event = request.event['message']
+    answer = socket_relay.send(shard_for_room(room_code, SHARD_COUNT), event, data, request.sid, session.get('player_id'))
+    if answer is None:
+        return {'success': False, 'error': 'Game room is unavailable.', 'status': 503}
+    if answer.get('player_id'):
+        session['player_id'] = answer['player_id']
+    return answer.get('ack')
+
 def generate_unique_room_code(length=4):
     characters = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
     while True:
         code = ''.join(random.choice(characters) for _ in range(length))
-        if code not in active_games:
+        if code not in active_games and shard_for_room(code, SHARD_COUNT) == SHARD_INDEX:
             return code
 
-def _get_game_state_for_player(game, player_id):
+def _get_game_state_for_player(game, player_id, public_state=None):
+    """
+    The game state as one player sees it: the shared public state plus their own hand and hints.
+    Pass `public_state` (from _get_public_game_state) when sending to several players at once.
+    """
     player = next((p for p in game.players if str(p.player_id) == player_id), None)
     if not player:
         return None
+    if public_state is None:
+        public_state = _get_public_game_state(game)
+
+    game_state = dict(public_state)
+    game_state['your_hand'] = [card.to_dict() for card in player.get_hand().cards]
+    game_state['move_hints'] = move_hint_engine.get_hints(game, player_id) if game.is_game_started else None
+    return game_state
+
+def _get_public_game_state(game):
+    """The part of the game state that is the same for every player; built once per broadcast."""
     all_players_data = [
         {'name': p.name, 'id': p.player_id, 'is_active': p.is_active, 'hand_size': len(p.get_hand().cards), 'rank': p.rank}
         for p in game.players
     ]
 
-    player_hand_cards_data = [card.to_dict() for card in player.get_hand().cards]
-
     pile_cards_data = [card.to_dict() for card in game.pile]
 
     current_player_name = game.get_current_player().name if game.get_current_player() else None
@@ -171,11 +334,17 @@ def _get_game_state_for_player(game, player_id):
     return {
         'room_code': game.room_code,
         'game_type': game.game_type,
+        'rules': game.rules.to_dict(),
+        'round_number': game.round_number,
+        # Who traded with whom before this round; the cards themselves show up in the two hands.
+        'card_exchange': [
+            {'from_player_id': e['from_player_id'], 'to_player_id': e['to_player_id'], 'count': len(e['cards'])}
+            for e in game.last_exchange
+        ],
         'host_id': game.host_id,
         'current_player_name': current_player_name,
         'current_turn_player_id': current_turn_player_id,
         'pile': pile_cards_data,
-        'your_hand': player_hand_cards_data,
         'all_players_data': all_players_data,
         'num_active_players': game.get_num_active_players(),
         'is_game_over': game.is_game_over,
@@ -195,11 +364,13 @@ def _get_game_state_for_player(game, player_id):
         'interrupt_bids': interrupt_bids_data,
         'interrupt_active_until': game.interrupt_active_until,
         'players_responded_to_interrupt': list(game.players_responded_to_interrupt),
+        # Hex string: a 64-bit int would lose precision as a JavaScript number.
+        'state_hash': format(game.state_hash, '016x'),
     }
 
 def _check_and_resolve_interrupts(game):
     """Checks if an active interrupt has expired and resolves it."""
-    if game.interrupt_active and game.interrupt_active_until and time.time() > game.interrupt_active_until:
+    if game.is_interrupt_expired():
         print(f"DEBUG: Interrupt for room {game.room_code} expired. Resolving now.")
         try:
             game.resolve_interrupt()
@@ -207,58 +378,97 @@ def _check_and_resolve_interrupts(game):
             print(f"ERROR: Failed to resolve expired interrupt for room {game.room_code}: {e}")
             traceback.print_exc()
 
+def _get_room_info(room_code, game):
+    """One room's lobby entry, with player profiles."""
+    # Get enhanced player info
+    players_info = []
+    for player in game.players:
+        player_info = {
+            'id': player.player_id,
+            'name': player.name,
+            'isHost': player.player_id == game.host_id
+        }
+        
+        # Add profile info if available
+        try:
+            profile = user_service.get_user_profile(player.player_id)
+            if profile:
+                player_info.update({
+                    'gamesWon': profile.get('gamesWon', 0),
+                    'winRate': profile.get('winRate', 0),
+                    'userType': profile.get('userType', 'anonymous')
+                })
+        except:
+            pass
+        
+        players_info.append(player_info)
+    
+    # Find the host player to get their name
+    host_player = next((p for p in game.players if p.player_id == game.host_id), None)
+    host_name = host_player.name if host_player else "Unknown"
+    
+    return {
+        'room_code': room_code,
+        'game_type': getattr(game, 'game_type', 'asshole'),
+        'status': getattr(game, 'status', 'WAITING_FOR_PLAYERS'),
+        'player_count': len(game.players),
+        'max_players': getattr(game, 'MAX_PLAYERS', 6),
+        'host_id': game.host_id,
+        'host_name': host_name,
+        'players': players_info,
+        'created_at': getattr(game, 'created_at', datetime.now(timezone.utc).isoformat()),
+        'is_game_started': getattr(game, 'is_game_started', False)
+    }
+
 def _get_all_rooms_state():
     """Enhanced room state with player profiles."""
     try:
-        rooms = []
-        for room_code, game in active_games.items():
-            # Get enhanced player info
-            players_info = []
-            for player in game.players:
-                player_info = {
-                    'id': player.player_id,
-                    'name': player.name,
-                    'isHost': player.player_id == game.host_id
-                }
-                
-                # Add profile info if available
-                try:
-                    profile = user_service.get_user_profile(player.player_id)
-                    if profile:
-                        player_info.update({
-                            'gamesWon': profile.get('gamesWon', 0),
-                            'winRate': profile.get('winRate', 0),
-                            'userType': profile.get('userType', 'anonymous')
-                        })
-                except:
-                    pass
-                
-                players_info.append(player_info)
-            
-            # Find the host player to get their name
-            host_player = next((p for p in game.players if p.player_id == game.host_id), None)
-            host_name = host_player.name if host_player else "Unknown"
-            
-            room_info = {
-                'room_code': room_code,
-                'game_type': getattr(game, 'game_type', 'asshole'),
-                'status': getattr(game, 'status', 'WAITING_FOR_PLAYERS'),
-                'player_count': len(game.players),
-                'max_players': getattr(game, 'MAX_PLAYERS', 6),
-                'host_id': game.host_id,
-                'host_name': host_name,
-                'players': players_info,
-                'created_at': getattr(game, 'created_at', datetime.now(timezone.utc).isoformat()),
-                'is_game_started': getattr(game, 'is_game_started', False)
-            }
-            rooms.append(room_info)
-        
+        rooms = [_get_room_info(room_code, game) for room_code, game in active_games.items()]
         return {'success': True, 'rooms': rooms}
     except Exception as e:
         print(f"Error getting rooms state: {e}")
         return {'success': False, 'rooms': []}
 
 def _send_game_state_update_to_room_players(game):
+    """
+    Queues the room's game state update and its lobby entry; the coalescer sends them at the next tick.
+    Also wakes the bot broker if the change left a bot seat owing a decision.
+    """
+    room_directory.update(game.room_code, game)
+    if bot_scheduler is None:
+        bot_broker.notify(game)
+    broadcast_coalescer.mark_room(game)
+    broadcast_coalescer.mark_lobby(game.room_code)
+
+def _send_lobby_update(room_code):
+    """Queues a lobby_update for a room that was created, changed or deleted without a game state update."""
+    room_directory.update(room_code, active_games.get(room_code))
+    broadcast_coalescer.mark_lobby(room_code)
+
+def _broadcast_lobby_changes(room_codes):
+    """Sends lobby subscribers the rooms among `room_codes` that were added, changed or removed since they last heard."""
+    with app.app_context():
+        changes = lobby_feed.diff(
+            room_codes,
+            lambda room_code: _get_room_info(room_code, active_games[room_code]) if room_code in active_games else None
+        )
+        if changes and lobby_aggregator is not None:
+            lobby_aggregator.publish(changes)
+        elif changes:
+            socketio.emit('lobby_update', changes, room=LOBBY_ROOM)
+
+def _flush_game_state(game):
+    """Queues the room's broadcast on its command queue without waiting, so a busy room does not hold up the others."""
+    try:
+        return room_commands.submit(game.room_code, _broadcast_game_state_in_app_context, game)
+    except UnknownRoomError:
+        return None  # Deleted after the update was queued; there is no one left to send it to
+
+def _broadcast_game_state_in_app_context(game):
+    with app.app_context():
+        _broadcast_game_state(game)
+
+def _broadcast_game_state(game):
     """Sends each player in the game their individual game state update."""
     _check_and_resolve_interrupts(game)
     
@@ -272,58 +482,109 @@ def _send_game_state_update_to_room_players(game):
             print(f"Warning: Could not save game results for room {game.room_code}: {e}")
     
     print(f"DEBUG: Preparing game_state_update for room {game.room_code} (players: {len(game.players)})")
+    public_state = _get_public_game_state(game)
+    payloads = {
+        p.player_id: _get_game_state_for_player(game, p.player_id, public_state)
+        for p in game.players if player_id_map.get(p.player_id)
+    }
+    state_sync.publish(game.room_code, payloads)
     for p in game.players:
         if player_id_map.get(p.player_id):
             sid = player_id_map[p.player_id]
-            game_state_payload = _get_game_state_for_player(game, p.player_id)
-            if game_state_payload:
-                socketio.emit('game_state_update', game_state_payload, room=sid)
-                print(f"DEBUG: Sent game_state_update to player {p.name} ({p.player_id}) at SID: {sid}")
-            else:
+            message = state_sync.message_for(game.room_code, p.player_id)
+            if message:
+                event, data = message
+                socketio.emit(event, data, room=sid)
+                print(f"DEBUG: Sent {event} v{data['state_version']} to player {p.name} ({p.player_id}) at SID: {sid}")
+            elif payloads.get(p.player_id) is None:
                 print(f"WARNING: Could not get game state for player {p.name} ({p.player_id}) in room {game.room_code}")
         else:
             print(f"DEBUG: Player {p.name} ({p.player_id}) in room {game.room_code} has no active SID in player_id_map. Cannot send direct update.")
 
+    if win_probability_service and game.is_game_started:
+        win_probability_service.request_update(game)
+
+def _send_full_game_state(game, player_id, sid):
+    """
+    Sends one player a full snapshot, e.g. on (re)join; they get deltas again once they ack it.
+    The snapshot is built from the live game, which may be ahead of the last broadcast, so it is
+    published as a new version: later deltas are then computed from exactly what the player holds.
+    Other players are not sent anything; their next update is a delta from the version they hold.
+    """
+    state_sync.reset_player(game.room_code, player_id)
+    public_state = _get_public_game_state(game)
+    payloads = {
+        p.player_id: _get_game_state_for_player(game, p.player_id, public_state)
+        for p in game.players if p.player_id == player_id or player_id_map.get(p.player_id)
+    }
+    state_sync.publish(game.room_code, payloads)
+    message = state_sync.message_for(game.room_code, player_id)
+    if message:
+        socketio.emit(*message, room=sid)
+
+def _on_bot_decision(game):
+    """Broadcasts the new state after the bot broker applied a bot's move."""
+    with app.app_context():
+        _send_game_state_update_to_room_players(game)
+
+def _resolve_interrupt_if_due(room_code, game):
+    """Resolves the room's interrupt window once it timed out or every active player responded."""
+    if not game.interrupt_active:
+        return
+    should_resolve_interrupt = False
+    
+    active_players_count = sum(1 for p in game.players if p.is_active)
+
+    if game.interrupt_type == 'bomb_opportunity':                    
+        timer_expired = game.is_interrupt_expired()
+
+        all_responded = (len(game.players_responded_to_interrupt) >= active_players_count)
+
+        if timer_expired:
+            print(f"DEBUG: Bomb interrupt timed out for room {room_code}.")
+            should_resolve_interrupt = True
+        elif all_responded:
+            print(f"DEBUG: Bomb interrupt: All active players responded for room {room_code}.")
+            should_resolve_interrupt = True
+
+    elif game.interrupt_type == 'three_play':
+        all_responded = (len(game.players_responded_to_interrupt) >= active_players_count)
+        if all_responded:
+            print(f"DEBUG: Three-play interrupt: All active players passed for room {room_code}.")
+            should_resolve_interrupt = True
+    
+    if should_resolve_interrupt:
+        if game.interrupt_active: 
+            game.resolve_interrupt()
+            with app.app_context():
+                _send_game_state_update_to_room_players(game)
+
 def game_timer_monitor():
     """
     Background thread that monitors active game timers (e.g., interrupt timers).
     """
     print("DEBUG: Game timer monitor thread started.")
+    checks = {}  # room_code -> Future of the interrupt check queued on the room
     while True:
+        for room_code, check in list(checks.items()):
+            if check.done():
+                del checks[room_code]
+                if not check.cancelled() and check.exception() is not None:
+                    print(f"ERROR: Interrupt check failed for room {room_code}: {check.exception()}")
+
         for room_code, game in list(active_games.items()):
-            if game.interrupt_active:
-                should_resolve_interrupt = False
-                
-                active_players_count = sum(1 for p in game.players if p.is_active)
-
-                if game.interrupt_type == 'bomb_opportunity':                    
-                    timer_expired = False
-                    if game.interrupt_active_until is not None:
-                        timer_expired = (time.time() >= game.interrupt_active_until)
-
-                    all_responded = (len(game.players_responded_to_interrupt) >= active_players_count)
-
-                    if timer_expired:
-                        print(f"DEBUG: Bomb interrupt timed out for room {room_code}.")
-                        should_resolve_interrupt = True
-                    elif all_responded:
-                        print(f"DEBUG: Bomb interrupt: All active players responded for room {room_code}.")
-                        should_resolve_interrupt = True
-
-                elif game.interrupt_type == 'three_play':
-                    all_responded = (len(game.players_responded_to_interrupt) >= active_players_count)
-                    if all_responded:
-                        print(f"DEBUG: Three-play interrupt: All active players passed for room {room_code}.")
-                        should_resolve_interrupt = True
-                
-                if should_resolve_interrupt:
-                    if game.interrupt_active: 
-                        game.resolve_interrupt()
-                        with app.app_context():
-                            _send_game_state_update_to_room_players(game)
+            # Queued without waiting, so a busy room does not delay the other rooms' timeouts.
+            if game.interrupt_active and room_code not in checks:
+                try:
+                    checks[room_code] = room_commands.submit(room_code, _resolve_interrupt_if_due, room_code, game)
+                except UnknownRoomError:
+                    pass  # Deleted since the snapshot of active_games was taken
 
             time.sleep(0.01) 
         
+        if win_probability_service:
+            win_probability_service.flush_pending()
+
         time.sleep(1)
 
 def _ensure_user_profile(player_id, player_name):
@@ -409,9 +670,20 @@ def create_room():
     else:
         return jsonify({'error': 'Invalid game type specified.'}), 400
 
+    game_options = {}
+    if data.get('rules') is not None:
+        try:
+            game_options['rules'] = RuleSet.from_dict(data['rules'])
+        except (ValueError, TypeError) as e:
+            return jsonify({"success": False, "message": f"Invalid rules: {e}"}), 400
+
     try:
-        new_game = GameClass(room_code=room_code, host_id=host_id, game_type=game_type)
+        new_game = GameClass(room_code=room_code, host_id=host_id, game_type=game_type, **game_options)
         new_game.created_at = datetime.utcnow().isoformat()  # Add timestamp
+        if CARD_LEDGER_SAMPLE_RATE and random.random() < CARD_LEDGER_SAMPLE_RATE:
+            new_game.ledger = CardLedger(name=room_code)
+        if GAME_HISTORY_CHECKPOINTS > 0:
+            GameHistory(GAME_HISTORY_INTERVAL, GAME_HISTORY_CHECKPOINTS).attach(new_game)
         
         host_player_obj = Player(player_id=host_id, name=player_name)
         new_game.add_player(host_player_obj)
@@ -420,7 +692,7 @@ def create_room():
         player_to_room_map[player_id] = room_code
         
         # Broadcast enhanced room update
-        socketio.emit('room_update', _get_all_rooms_state())
+        _send_lobby_update(room_code)
         socketio.emit('room_created', {
             'room_code': room_code,
             'host_name': player_name,
@@ -447,6 +719,7 @@ def create_room():
         return jsonify({'error': f'Failed to create room: {str(e)}'}), 500
 
 @app.route('/join_room', methods=['POST'])
+@room_command
 def join_room_http():
     player_id = session.get('player_id')
     if not player_id:
@@ -489,8 +762,6 @@ def join_room_http():
         player_to_room_map[player_id] = room_code
 
         _send_game_state_update_to_room_players(game)
-        socketio.emit('room_update', _get_all_rooms_state())
-        print(f"DEBUG: Emitted room_update globally after re-join for room {room_code}")
 
         game_state_payload = _get_game_state_for_player(game, player_id)
         return jsonify({
@@ -511,8 +782,6 @@ def join_room_http():
     print(f"Player {player_name} ({player_id}) joined room {room_code}. Current players: {game.get_num_players()}")
 
     _send_game_state_update_to_room_players(game)
-    socketio.emit('room_update', _get_all_rooms_state())
-    print(f"DEBUG: Emitted room_update globally after new player joined room {room_code}")
 
     game_state_payload = _get_game_state_for_player(game, player_id)
     if not game_state_payload:
@@ -526,24 +795,106 @@ def join_room_http():
         'game_state': game_state_payload
     }), 200
 
+@app.route('/add_bot', methods=['POST'])
+@room_command
+def add_bot():
+    data = request.get_json()
+    room_code = data.get('room_code', '').upper()
+    player_id = data.get('player_id')
+
+    game = active_games.get(room_code)
+
+    if not game:
+        return jsonify({'error': 'Game room not found.'}), 404
+
+    if game.host_id != player_id:
+        return jsonify({'error': 'Only the host can add bots.'}), 403
+
+    if game.status == "IN_PROGRESS" or game.status == "GAME_OVER":
+        return jsonify({'error': 'Game has already started or is not joinable.'}), 403
+
+    if len(game.players) >= game.MAX_PLAYERS:
+        return jsonify({'error': 'This room is full.'}), 400
+
+    bot_number = sum(1 for p in game.players if getattr(p, 'is_bot', False)) + 1
+    bot_player = Player(f"Bot {bot_number}", player_id=f"bot-{uuid.uuid4()}", is_bot=True)
+    game.add_player(bot_player)
+
+    print(f"Bot {bot_player.name} ({bot_player.player_id}) added to room {room_code}. Current players: {game.get_num_players()}")
+
+    _send_game_state_update_to_room_players(game)
+
+    return jsonify({
+        'message': f'{bot_player.name} added to room {room_code}',
+        'room_code': room_code,
+        'bot_player_id': bot_player.player_id,
+        'bot_name': bot_player.name
+    }), 200
+
 @app.route('/rooms', methods=['GET'])
 def get_room_list():
-    return jsonify(_get_all_rooms_state()), 200
+    """
+    One page of rooms, oldest first. Optional filters: `status` (comma-separated or repeated, e.g.
+    WAITING_FOR_PLAYERS,READY_TO_START for joinable rooms) and `game_type` (likewise). `limit`
+    caps the page size and `cursor` is the previous page's next_cursor.
+    """
+    try:
+        limit = int(request.args.get('limit', ROOMS_PAGE_DEFAULT))
+    except ValueError:
+        return jsonify({'success': False, 'error': 'limit must be a whole number.'}), 400
+    statuses = [status.strip().upper() for value in request.args.getlist('status')
+                for status in value.split(',') if status.strip()]
+    game_type = [game_type.strip().lower() for value in request.args.getlist('game_type')
+                 for game_type in value.split(',') if game_type.strip()]
+    try:
+        room_codes, next_cursor = room_directory.query(
+            statuses, game_type, min(limit, ROOMS_PAGE_MAX), request.args.get('cursor')
+        )
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
 
-@app.route('/leave_room', methods=['POST'])
-def leave_room_http():
-    data = request.json
+    rooms = [_get_room_info(room_code, active_games[room_code]) for room_code in room_codes if room_code in active_games]
+    return jsonify({'success': True, 'rooms': rooms, 'next_cursor': next_cursor}), 200
+
+def _run_game_command(command, data):
+    """
+    Runs one of the game commands shared by the HTTP routes and the socket events
+    and returns (result, status). A successful result carries the room's state
+    version that includes the change: the current one, or the next if the
+    coalescer has not sent it yet.
+    """
+    result, status = command(data)
+    if status < 400:
+        room_code = data.get('room_code', '').upper()
+        version = state_sync.current_version(room_code)
+        result['state_version'] = version + 1 if broadcast_coalescer.is_pending(room_code) else version
+    return result, status
+
+def _command_ack(result, status):
+    """The acknowledgement a socket command returns: success and the state version, or the error."""
+    if status < 400:
+        return {'success': True, 'message': result.get('message'), 'state_version': result['state_version']}
+    return {'success': False, 'error': result.get('error', 'Request failed.'), 'status': status}
+
+def _socket_command_data(data):
+    """Event data for a socket command, with the player taken from the session if not given."""
+    data = dict(data or {})
+    data.setdefault('player_id', session.get('player_id'))
+    return data
+
+def _leave_room_command(data):
+    """Removes a player from their room, deleting the room if they were the host or the last player."""
     room_code = data.get('room_code', '').upper()
     player_id = data.get('player_id')
 
     game = active_games.get(room_code)
 
     if not game:
-        return jsonify({'error': 'Game room not found.'}), 404
+        return {'error': 'Game room not found.'}, 404
 
     player_to_remove = game.get_player_by_id(player_id)
     if not player_to_remove:
-        return jsonify({'error': 'Player not found in this room.'}), 404
+        return {'error': 'Player not found in this room.'}, 404
     
     game.remove_player(player_id)
     if player_id in player_to_room_map:
@@ -551,20 +902,31 @@ def leave_room_http():
 
     if game.host_id == player_id or game.get_num_players() == 0:
         del active_games[room_code]
+        move_hint_engine.forget_room(room_code)
+        state_sync.forget_room(room_code)
+        room_commands.forget_room(room_code)
+        if win_probability_service:
+            win_probability_service.forget_room(room_code)
         print(f"Room {room_code} deleted because host ({player_id}) left or room is empty.")
         socketio.emit('room_deleted', {'room_code': room_code, 'message': 'Room has been disbanded'})
-        socketio.emit('room_update', _get_all_rooms_state())
-        return jsonify({'message': 'You left the room. Room deleted (host left or room empty).'}), 200
+        _send_lobby_update(room_code)
+        return {'message': 'You left the room. Room deleted (host left or room empty).'}, 200
     
     if game.is_game_started:
         pass
     
     print(f"Player {player_id} left room {room_code}. Current players: {[p.name for p in game.players]}")
     _send_game_state_update_to_room_players(game)
-    socketio.emit('room_update', _get_all_rooms_state())
-    return jsonify({'message': 'Successfully left the room.'}), 200
+    return {'message': 'Successfully left the room.'}, 200
+
+@app.route('/leave_room', methods=['POST'])
+@room_command
+def leave_room_http():
+    result, status = _run_game_command(_leave_room_command, request.get_json() or {})
+    return jsonify(result), status
 
 @app.route('/delete_room', methods=['POST'])
+@room_command
 def delete_room_http():
     data = request.json
     room_code = data.get('room_code', '').upper()
@@ -579,6 +941,11 @@ def delete_room_http():
         return jsonify({'error': 'Only the host can delete the room.'}), 403
 
     del active_games[room_code]
+    move_hint_engine.forget_room(room_code)
+    state_sync.forget_room(room_code)
+    room_commands.forget_room(room_code)
+    if win_probability_service:
+        win_probability_service.forget_room(room_code)
     players_in_room = [p.player_id for p in game.players]
     for p_id in players_in_room:
         if p_id in player_to_room_map:
@@ -586,67 +953,74 @@ def delete_room_http():
     print(f"Host ({player_id}) explicitly deleted room {room_code}.")
     
     socketio.emit('room_deleted', {'room_code': room_code, 'message': 'Room has been disbanded by the host.'})
-    socketio.emit('room_update', _get_all_rooms_state())
+    _send_lobby_update(room_code)
 
     return jsonify({'message': f'Room {room_code} has been successfully deleted.'}), 200
 
-@app.route('/start_game_round', methods=['POST'])
-def start_game_round():
-    data = request.json
+def _start_game_round_command(data):
+    """Starts the first round, or a rematch once the previous round is over. Host only."""
     room_code = data.get('room_code', '').upper()
     player_id = data.get('player_id')
 
     game = active_games.get(room_code)
 
     if not game:
-        return jsonify({'error': 'Game room not found.'}), 404
+        return {'error': 'Game room not found.'}, 404
     
     if game.host_id != player_id:
-        return jsonify({'error': 'Only the host can start the game.'}), 403
+        return {'error': 'Only the host can start the game.'}, 403
 
     try:
         if len(game.players) < game.MIN_PLAYERS:
-            return jsonify({'error': f'Need at least {game.MIN_PLAYERS} players to start. Current: {len(game.players)}'}), 400
+            return {'error': f'Need at least {game.MIN_PLAYERS} players to start. Current: {len(game.players)}'}, 400
         if len(game.players) > game.MAX_PLAYERS:
-            return jsonify({'error': f'Cannot exceed {game.MAX_PLAYERS} players. Current: {len(game.players)}'}), 400
-        if game.is_game_started:
-            return jsonify({'error': 'Game has already started in this room.'}), 400
+            return {'error': f'Cannot exceed {game.MAX_PLAYERS} players. Current: {len(game.players)}'}, 400
+        if game.is_game_started and not game.is_game_over:
+            return {'error': 'Game has already started in this room.'}, 400
         
-        game.start_game()
+        if game.round_number > 0:
+            # A rematch: same seats and cards, with the between-rounds card exchange if the rules use it.
+            game.start_next_round()
+        else:
+            game.start_game()
 
         _send_game_state_update_to_room_players(game)
-        socketio.emit('room_update', _get_all_rooms_state())
 
         game_state_payload = _get_game_state_for_player(game, player_id)
         if not game_state_payload:
             raise Exception("Failed to get game state after starting game.")
 
-        return jsonify({
+        return {
             'message': 'Game round started!',
             'room_code': room_code,
             'current_player_name': game_state_payload['current_player_name'],
             'game_state': game_state_payload,
             'player_hands_dealt': True
-        }), 200
+        }, 200
     
     except ValueError as e:
-        return jsonify({'error': str(e)}), 400
+        return {'error': str(e)}, 400
     except Exception as e:
-        return jsonify({'error': f'An unexpected error occurred while starting the game: {str(e)}'}), 500
+        return {'error': f'An unexpected error occurred while starting the game: {str(e)}'}, 500
 
-@app.route('/play_cards', methods=['POST'])
-def play_cards():
-    data = request.get_json()
+@app.route('/start_game_round', methods=['POST'])
+@room_command
+def start_game_round():
+    result, status = _run_game_command(_start_game_round_command, request.get_json() or {})
+    return jsonify(result), status
+
+def _play_cards_command(data):
+    """Plays cards for a player, first resolving an interrupt window that is over."""
     room_code = data.get('room_code', '').upper()
     player_id = data.get('player_id')
     cards_to_play_data = data.get('cards', [])
     game = active_games.get(room_code)
 
     if not game:
-        return jsonify({'success': False, 'error': 'Game room not found.'}), 404
+        return {'success': False, 'error': 'Game room not found.'}, 404
     
     if game.status != "IN_PROGRESS":
-        return jsonify({'success': False, 'error': 'Game is not in progress.'}), 400
+        return {'success': False, 'error': 'Game is not in progress.'}, 400
 
     _check_and_resolve_interrupts(game)
 
@@ -658,7 +1032,7 @@ def play_cards():
         except Exception as e:
             print(f"ERROR: Failed to resolve interrupt implicitly: {e}")
             traceback.print_exc()
-            return jsonify({'success': False, 'error': f"Failed to resolve interrupt: {str(e)}"}), 500
+            return {'success': False, 'error': f"Failed to resolve interrupt: {str(e)}"}, 500
     try:
         game.play_cards(player_id, cards_to_play_data)
 
@@ -668,27 +1042,32 @@ def play_cards():
         if not game_state_payload:
             raise Exception("Failed to get game state after playing cards.")
 
-        return jsonify({'message': 'Card(s) played', 'game_state': game_state_payload}), 200
+        return {'message': 'Card(s) played', 'game_state': game_state_payload}, 200
     except ValueError as e:
-        return jsonify({'error': str(e)}), 400
+        return {'error': str(e)}, 400
     except Exception as e:
         print(f"Error playing cards: {e}")
         traceback.print_exc()
-        return jsonify({'error': f'An unexpected error occurred: {str(e)}'}), 500
-    
-@app.route('/pass_turn', methods=['POST'])
-def pass_turn():
-    data = request.get_json()
+        return {'error': f'An unexpected error occurred: {str(e)}'}, 500
+
+@app.route('/play_cards', methods=['POST'])
+@room_command
+def play_cards():
+    result, status = _run_game_command(_play_cards_command, request.get_json() or {})
+    return jsonify(result), status
+
+def _pass_turn_command(data):
+    """Passes a player's turn, first resolving an interrupt window that is over."""
     room_code = data.get('room_code', '').upper()
     player_id = data.get('player_id')
 
     game = active_games.get(room_code)
 
     if not game:
-        return jsonify({'success': False, 'error': 'Game room not found.'}), 404
+        return {'success': False, 'error': 'Game room not found.'}, 404
 
     if game.status != "IN_PROGRESS":
-        return jsonify({'success': False, 'error': 'Game is not in progress.'}), 400
+        return {'success': False, 'error': 'Game is not in progress.'}, 400
 
     _check_and_resolve_interrupts(game)
 
@@ -700,7 +1079,7 @@ def pass_turn():
         except Exception as e:
             print(f"ERROR: Failed to resolve interrupt implicitly during pass: {e}")
             traceback.print_exc()
-            return jsonify({'success': False, 'error': f"Failed to resolve interrupt: {str(e)}"}), 500
+            return {'success': False, 'error': f"Failed to resolve interrupt: {str(e)}"}, 500
 
     try:
         game.pass_turn(player_id)    
@@ -710,14 +1089,21 @@ def pass_turn():
         game_state = _get_game_state_for_player(game, player_id)
         if not game_state:
             raise Exception("Failed to get game state after passing turn.")
-        return jsonify({'message': 'Turn passed', 'game_state': game_state}), 200
+        return {'message': 'Turn passed', 'game_state': game_state}, 200
     except ValueError as e:
-        return jsonify({'error': str(e)}), 400
+        return {'error': str(e)}, 400
     except Exception as e:
         print(f"Error passing turn: {e}")
-        return jsonify({'error': f'An unexpected error occurred: {str(e)}'}), 500
+        return {'error': f'An unexpected error occurred: {str(e)}'}, 500
+
+@app.route('/pass_turn', methods=['POST'])
+@room_command
+def pass_turn():
+    result, status = _run_game_command(_pass_turn_command, request.get_json() or {})
+    return jsonify(result), status
 
 @app.route('/submit_interrupt_bid', methods=['POST'])
+@room_command
 def submit_interrupt_bid_route():
     data = request.get_json()
     room_code = data.get('room_code', '').upper()
@@ -742,11 +1128,54 @@ def submit_interrupt_bid_route():
         traceback.print_exc()
         return jsonify({'success': False, 'error': 'An unexpected server error occurred.'}), 500
 
+def _validate_move(data, validator_name):
+    """
+    Runs AssholeGame.validate_play or validate_bid for a request payload.
+    Read-only: no interrupt resolution, no state change and no broadcast.
+    Returns (response dict, HTTP status).
+    """
+    room_code = (data.get('room_code') or '').upper()
+    player_id = data.get('player_id')
+    game = active_games.get(room_code)
+    if not game:
+        return {'success': False, 'error': 'Game room not found.'}, 404
+    try:
+        getattr(game, validator_name)(player_id, data.get('cards'))
+    except (ValueError, KeyError, TypeError) as e:
+        return {'success': True, 'valid': False, 'error': str(e)}, 200
+    return {'success': True, 'valid': True}, 200
+
+@app.route('/validate_play', methods=['POST'])
+@room_command
+def validate_play_route():
+    result, status = _validate_move(request.get_json() or {}, 'validate_play')
+    return jsonify(result), status
+
+@app.route('/validate_bid', methods=['POST'])
+@room_command
+def validate_bid_route():
+    result, status = _validate_move(request.get_json() or {}, 'validate_bid')
+    return jsonify(result), status
+
+def _read_game_state(game, player_id):
+    """Runs on the room's queue: the player's state with the version and ETag it was built at."""
+    game_state_data = _get_game_state_for_player(game, player_id)
+    return game_state_data, state_sync.current_version(game.room_code), state_sync.etag(game.room_code)
+
 @app.route('/game_state', methods=['GET'])
 def get_current_game_state():
+    """
+    The player's game state, tagged with the room's state version as an ETag.
+    With If-None-Match set to the current ETag the answer is 304, and with
+    `wait=<seconds>` the request is held until the room changes (or the wait runs out) first.
+    """
     room_code = request.args.get('room_code', '').upper()
     player_id = request.args.get('player_id', '')
     game_type = request.args.get('game_type', '').lower()
+    try:
+        wait = min(max(float(request.args.get('wait', 0)), 0.0), GAME_STATE_MAX_WAIT)
+    except ValueError:
+        return jsonify({'error': 'wait must be a number of seconds.'}), 400
 
     game = active_games.get(room_code)
 
@@ -754,11 +1183,145 @@ def get_current_game_state():
         traceback.print_exc()
         return jsonify({'error': 'Game room not found.'}), 404
 
-    game_state_data = _get_game_state_for_player(game, player_id)
+    etag = state_sync.etag(room_code)
+    if etag and request.if_none_match.contains(etag):
+        if not (wait and state_sync.wait_for_change(room_code, etag, wait)):
+            return '', 304, {'ETag': f'"{etag}"'}
+        game = active_games.get(room_code)
+        if not game:
+            return jsonify({'error': 'Game room not found.'}), 404
+
+    # The wait above stays off the room's queue; reading the game does not.
+    try:
+        game_state_data, state_version, etag = room_commands.run(room_code, _read_game_state, game, player_id)
+    except UnknownRoomError:
+        return jsonify({'error': 'Game room not found.'}), 404
 
     if not game_state_data:
         return jsonify({'error': 'Player not found in this game or invalid game state.'}), 404
-    return jsonify(game_state_data), 200
+    game_state_data['state_version'] = state_version
+    response = jsonify(game_state_data)
+    if etag:
+        response.set_etag(etag)
+    return response, 200
+
+@app.route('/internal/bus', methods=['POST'])
+def receive_bus_message():
+    """Messages published by the other shards (lobby diffs, resync requests)."""
+    if shard_bus is None or not shard_bus.is_authorized(request.headers.get('X-Bus-Token')):
+        return jsonify({'error': 'Forbidden'}), 403
+    data = request.get_json(silent=True) or {}
+    if not data.get('topic') or not isinstance(data.get('message'), dict):
+        return jsonify({'error': 'topic and message are required.'}), 400
+    shard_bus.deliver(data['topic'], data['message'])
+    return jsonify({'success': True}), 200
+
+@app.route('/internal/socket_event', methods=['POST'])
+def receive_relayed_socket_event():
+    """A socket event relayed by the shard holding the socket (see _relay_socket_event), run as if the socket were here."""
+    if socket_relay is None or not shard_bus.is_authorized(request.headers.get('X-Bus-Token')):
+        return jsonify({'error': 'Forbidden'}), 403
+    data = request.get_json(silent=True) or {}
+    event, sid = data.get('event'), data.get('sid')
+    handler = socketio.server.handlers.get('/', {}).get(event)
+    if handler is None or not sid:
+        return jsonify({'error': 'A known event and sid are required.'}), 400
+
+    socket_manager.add_remote_socket(sid)
+    request.sid, request.namespace = sid, '/'
+    request.event = {'message': event, 'args': (data.get('data'),)}
+    if data.get('player_id'):
+        session['player_id'] = data['player_id']
+    handler = getattr(handler, '__wrapped__', handler)  # The function registered with @socketio.on
+    if event == 'disconnect':
+        ack = handler()
+        socket_manager.forget_remote_socket(sid)
+    else:
+        ack = handler(data.get('data'))
+    return jsonify({'ack': ack, 'player_id': session.get('player_id')}), 200
+
+@app.route('/win_probability', methods=['GET'])
+def get_win_probability():
+    """Latest cached President/Asshole odds for the room's current state."""
+    room_code = request.args.get('room_code', '').upper()
+
+    if not win_probability_service:
+        return jsonify({'error': 'Win probability estimates are disabled.'}), 404
+
+    game = active_games.get(room_code)
+    if not game:
+        return jsonify({'error': 'Game room not found.'}), 404
+
+    estimate = win_probability_service.request_update(game)
+    return jsonify({'room_code': room_code, 'estimate': estimate}), 200
+
+@app.route('/bot_metrics', methods=['GET'])
+def get_bot_metrics():
+    metrics = {
+        'broker': {
+            'pending': bot_broker.pending_count,
+            'batches_evaluated': bot_broker.batches_evaluated,
+            'decisions_applied': bot_broker.decisions_applied,
+            'decisions_skipped': bot_broker.decisions_skipped
+        }
+    }
+    if bot_scheduler:
+        metrics['scheduler'] = bot_scheduler.metrics()
+    return jsonify(metrics), 200
+
+def _describe_action(move, name, args, kwargs):
+    return {
+        'move': move,
+        'action': name,
+        'args': [arg.to_dict() if hasattr(arg, 'to_dict') else arg for arg in args],
+        'kwargs': kwargs,
+    }
+
+def _get_admin_game_view(game):
+    """Full state of a (usually rebuilt) game for operators, including every hand."""
+    current_player = game.get_current_player()
+    return {
+        'players': [dict(p.to_dict(), hand=[card.to_dict() for card in p.get_hand().cards]) for p in game.players],
+        'current_turn_player_id': current_player.player_id if current_player else None,
+        'pile': [card.to_dict() for card in game.pile],
+        'discard_pile_size': len(game.discard_pile),
+        'current_play_rank': game.current_play_rank,
+        'current_play_count': game.current_play_count,
+        'interrupt_active': game.interrupt_active,
+        'interrupt_type': game.interrupt_type,
+        'interrupt_rank': game.interrupt_rank,
+        'game_status': game.status,
+        'game_message': game.game_message,
+        'state_hash': format(game.state_hash, '016x'),
+    }
+
+@app.route('/admin/game_history', methods=['GET'])
+def get_admin_game_history():
+    """Checkpoint summary for a room and, with ?move=k, the state rebuilt at move k plus the actions leading to it."""
+    if not ADMIN_TOKEN:
+        return jsonify({'error': 'Admin access is not configured.'}), 403
+    if not hmac.compare_digest(request.headers.get('X-Admin-Token', ''), ADMIN_TOKEN):
+        return jsonify({'error': 'Invalid admin token.'}), 403
+
+    room_code = request.args.get('room_code', '').upper()
+    game = active_games.get(room_code)
+    if not game:
+        return jsonify({'error': 'Game room not found.'}), 404
+    history = getattr(game, 'history', None)
+    if history is None:
+        return jsonify({'error': 'History is not recorded for this room.'}), 404
+
+    response = {'room_code': room_code, 'history': history.summary()}
+    move = request.args.get('move', type=int)
+    if move is not None:
+        try:
+            response['state'] = _get_admin_game_view(history.state_at(move))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        response['move'] = move
+        response['actions'] = [_describe_action(*action)
+                               for action in history.action_log(move - history.checkpoint_interval, move)]
+    return jsonify(response), 200
 
 @app.route('/user_profile', methods=['GET'])
 def get_user_profile():
@@ -1057,12 +1620,28 @@ def handle_connect():
             # Send initial game state
             game = active_games.get(room_code)
             if game:
-                socketio.emit('game_state_update', _get_game_state_for_player(game, player_id_from_session), room=current_sid)
+                try:
+                    room_commands.run(
+                        room_code, copy_current_request_context(_send_full_game_state),
+                        game, player_id_from_session, current_sid
+                    )
+                except UnknownRoomError:
+                    pass  # Deleted since the lookup above
     else:
         print(f'Client {current_sid} connected (no player ID in session).')
         emit('status', {'msg': f'Connected to server! Your SID: {current_sid}'})
 
-    socketio.emit('room_update', _get_all_rooms_state())
+def _forget_disconnected_player(room_code, player_id):
+    """Runs on the room's queue: drops the player's room mapping and updates the others in the room."""
+    if player_to_room_map.get(player_id) == room_code:
+        del player_to_room_map[player_id]
+
+    game = active_games.get(room_code)
+    if game:
+        print(f"Triggering game state update for room {room_code}.")
+        _send_game_state_update_to_room_players(game)
+    else:
+        print(f"DEBUG: Disconnected player {player_id} was in room {room_code}, but game no longer exists in active_games.")
 
 @socketio.on('disconnect')
 def handle_disconnect():
@@ -1072,6 +1651,8 @@ def handle_disconnect():
     """
     current_sid = request.sid
     disconnected_player_id = None
+    if socket_relay is not None:
+        socket_relay.disconnect(current_sid)
 
     for p_id, sid_in_map in list(player_id_map.items()):
         if sid_in_map == current_sid:
@@ -1103,20 +1684,15 @@ def handle_disconnect():
     if disconnected_player_id and disconnected_player_id in player_to_room_map:
         room_code = player_to_room_map[disconnected_player_id]
         print(f"Player {disconnected_player_id} was in game room {room_code}.")
-        
-        del player_to_room_map[disconnected_player_id]
-        
-        game = active_games.get(room_code)
-        if game:
-            print(f"Triggering game state update for room {room_code}.")
-            _send_game_state_update_to_room_players(game)
-        else:
-            print(f"DEBUG: Disconnected player {disconnected_player_id} was in room {room_code}, but game no longer exists in active_games.")
+        try:
+            room_commands.run(
+                room_code, copy_current_request_context(_forget_disconnected_player), room_code, disconnected_player_id
+            )
+        except UnknownRoomError:
+            _forget_disconnected_player(room_code, disconnected_player_id)
     else:
         print(f"Disconnected player {disconnected_player_id} not found in player_to_room_map or player_id was not found.")
 
-    socketio.emit('room_update', _get_all_rooms_state())
-    print("Emitted global room_update.")
 
 @socketio.on('send_chat_message')
 def handle_chat_message(data):
@@ -1127,6 +1703,8 @@ def handle_chat_message(data):
     
     if not message:
         return
+    if room_code not in active_games and _is_other_shards_room(room_code):
+        return _relay_socket_event(room_code, data)
     
     # Get sender info
     sender_name = "Anonymous"
@@ -1172,6 +1750,8 @@ def handle_typing_indicator(data):
     room_code = data.get('room_code')
     sender_id = session.get('player_id')
     is_typing = data.get('is_typing', False)
+    if room_code not in active_games and _is_other_shards_room(room_code):
+        return _relay_socket_event(room_code, data)
     
     if sender_id and room_code and room_code in active_games:
         # Get sender name
@@ -1190,7 +1770,21 @@ def handle_typing_indicator(data):
             'is_typing': is_typing
         }, room=room_code, include_self=False)
 
+@socketio.on('subscribe_lobby')
+def handle_subscribe_lobby(data=None):
+    """Joins the lobby channel: the full room list now (as room_update), lobby_update diffs after that."""
+    join_room(LOBBY_ROOM)
+    if lobby_aggregator is not None:
+        emit('room_update', {'success': True, 'rooms': lobby_aggregator.rooms()}, room=request.sid)
+    else:
+        emit('room_update', _get_all_rooms_state(), room=request.sid)
+
+@socketio.on('unsubscribe_lobby')
+def handle_unsubscribe_lobby(data=None):
+    leave_room(LOBBY_ROOM)
+
 @socketio.on('join_game_room_socket')
+@room_command
 def handle_join_game_room_socket(data):
     room_code = data.get('room_code')
     player_id = data.get('player_id') or session.get('player_id')
@@ -1204,6 +1798,7 @@ def handle_join_game_room_socket(data):
     
     if room_code and room_code in active_games:
         player_id_map[player_id] = request.sid
+        leave_room(LOBBY_ROOM)
         join_room(room_code)
         player_to_room_map[player_id] = room_code
         print(f'Client {request.sid} (Player ID: {player_id}) joined SocketIO room: {room_code}')
@@ -1211,12 +1806,23 @@ def handle_join_game_room_socket(data):
 
         game = active_games.get(room_code)
         if game:
-            socketio.emit('game_state_update', _get_game_state_for_player(game, player_id), room=request.sid)
+            _send_full_game_state(game, player_id, request.sid)
             print(f"Emitted initial game_state_update to {player_id} upon joining socket room {room_code}")
     else:
         emit('status', {'msg': f'Error: Room {room_code} not found or invalid.'}, room=request.sid)
 
+@socketio.on('ack_game_state')
+def on_ack_game_state(data):
+    """A client reports the state_version it has applied, so later updates can be sent as deltas."""
+    player_id = data.get('player_id') or session.get('player_id')
+    room_code = (data.get('room_code') or player_to_room_map.get(player_id) or '').upper()
+    if room_code not in active_games and _is_other_shards_room(room_code):
+        return _relay_socket_event(room_code, data)
+    if not state_sync.ack(room_code, player_id, data.get('state_version')):
+        emit('status', {'msg': f"Ignored ack for unknown state version {data.get('state_version')}."}, room=request.sid)
+
 @socketio.on('leave_game_room_socket')
+@room_command
 def on_leave_game_room_socket(data):
     """
     Handles a client's request to leave a specific SocketIO room.
@@ -1245,6 +1851,7 @@ def on_leave_game_room_socket(data):
         emit('status', {'msg': f'Warning: Room {room_code} not found or invalid on leave.'}, room=request.sid)
 
 @socketio.on('submit_interrupt_bid')
+@room_command
 def on_submit_interrupt_bid(data):
     """
     Handles a player's attempt to submit an interrupt bid (e.g., playing 3s out of turn).
@@ -1276,7 +1883,50 @@ def on_submit_interrupt_bid(data):
         traceback.print_exc()
         emit('status', {'msg': f'An unexpected error occurred during interrupt bid: {str(e)}'}, room=request.sid)    
 
+@socketio.on('validate_play')
+@room_command
+def on_validate_play(data):
+    """Dry-run check of a play. The result goes back in the acknowledgement only."""
+    result, _ = _validate_move(data or {}, 'validate_play')
+    return result
+
+@socketio.on('validate_bid')
+@room_command
+def on_validate_bid(data):
+    """Dry-run check of an interrupt bid. The result goes back in the acknowledgement only."""
+    result, _ = _validate_move(data or {}, 'validate_bid')
+    return result
+
+@socketio.on('play_cards')
+@room_command
+def on_play_cards(data):
+    """Socket version of POST /play_cards. The outcome goes back in the acknowledgement; the new state follows as usual."""
+    return _command_ack(*_run_game_command(_play_cards_command, _socket_command_data(data)))
+
+@socketio.on('pass_turn')
+@room_command
+def on_pass_turn(data):
+    """Socket version of POST /pass_turn."""
+    return _command_ack(*_run_game_command(_pass_turn_command, _socket_command_data(data)))
+
+@socketio.on('start_game_round')
+@room_command
+def on_start_game_round(data):
+    """Socket version of POST /start_game_round."""
+    return _command_ack(*_run_game_command(_start_game_round_command, _socket_command_data(data)))
+
+@socketio.on('leave_room')
+@room_command
+def on_leave_room(data):
+    """Socket version of POST /leave_room; on success the socket also leaves the room's channel."""
+    data = _socket_command_data(data)
+    result, status = _run_game_command(_leave_room_command, data)
+    if status < 400:
+        leave_room(data['room_code'].upper())
+    return _command_ack(result, status)
+
 @socketio.on('game_finished')
+@room_command
 def handle_game_finished(data):
     """Handle when a game finishes."""
     room_code = data.get('room_code')
@@ -1438,14 +2088,30 @@ def handle_toggle_mute_voice(data):
         broadcast_voice_users_update(room_code)
         print(f"Player {sender_id} mute status toggled to {not current_mute_status} in room {room_code}")
 
+def _start_background_tasks():
+    """
+    Starts the interrupt timer, the bot runner and the broadcast coalescer. Runs when the module
+    loads, so the tasks run under gunicorn (`api.api:app`) as well as when run as a script.
+    """
+    socketio.start_background_task(game_timer_monitor)
+    print("Game timer monitor thread started.")
+
+    if bot_scheduler:
+        socketio.start_background_task(bot_scheduler.run_forever, lambda: list(active_games.values()))
+    else:
+        socketio.start_background_task(bot_broker.run_forever)
+    print("Bot decision broker thread started.")
+
+    if BROADCAST_TICK > 0:
+        broadcast_coalescer.start(socketio.start_background_task)
+        print("Broadcast coalescer thread started.")
+
+_start_background_tasks()
+
 if __name__ == '__main__':
     print("Starting Flask-SocketIO server...")
     print(f"Environment: {os.environ.get('ENVIRONMENT', 'not set')}")
     print(f"Port: {os.environ.get('PORT', 8080)}")
     print(f"Debug mode: True")
-    
-    timer_thread = threading.Thread(target=game_timer_monitor, daemon=True)
-    timer_thread.start()
-    print("Game timer monitor thread started.")
-    
+
     socketio.run(app, debug=True, host='0.0.0.0', port=int(os.environ.get('PORT', 8080)))
@@ -0,0 +1,110 @@
+import threading
+import time
+
+
+class BroadcastCoalescer:
+    """
+    Collapses bursts of room broadcasts into at most one flush per tick.
+
+    Callers mark a room's game state (or its lobby entry) dirty instead of sending at once.
+    The run_forever thread wakes up on the first mark, flushes right away if the
+    last flush was at least `tick` seconds ago and otherwise waits out the rest of
+    the tick, so an idle room still gets its update immediately while a burst of
+    changes (a play that resolves an interrupt, then the timer resolving the next
+    one) goes out once, built from the latest state. Until start() (or
+    run_forever) is called, e.g. in scripts, marks flush synchronously.
+
+    flush_room may hand the send off and return a Future (e.g. from a room's
+    command queue), so one busy room does not hold up the others; the room
+    stays pending until that Future completes.
+    """
+
+    def __init__(self, flush_room, flush_lobby, tick=0.02, clock=time.monotonic):
+        self.flush_room = flush_room
+        self.flush_lobby = flush_lobby
+        self.tick = tick
+        self.clock = clock
+        self.running = False
+        self._dirty_rooms = {}  # room_code -> game
+        self._lobby_dirty = set()  # room codes whose lobby entry may have changed
+        self._flushing = set()  # room codes taken by the current flush and not sent yet
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._last_flush = float('-inf')
+        self.marks = 0
+        self.flushes = 0
+        self.rooms_flushed = 0
+
+    def mark_room(self, game):
+        self.marks += 1
+        if not self.running:
+            sending = self.flush_room(game)
+            if hasattr(sending, 'result'):
+                sending.result()
+            return
+        with self._lock:
+            self._dirty_rooms[game.room_code] = game
+        self._wakeup.set()
+
+    def mark_lobby(self, room_code):
+        self.marks += 1
+        if not self.running:
+            self.flush_lobby([room_code])
+            return
+        with self._lock:
+            self._lobby_dirty.add(room_code)
+        self._wakeup.set()
+
+    def is_pending(self, room_code):
+        """Whether a game state update for the room is queued or being sent, i.e. its next version is on the way."""
+        with self._lock:
+            return room_code in self._dirty_rooms or room_code in self._flushing
+
+    def flush(self):
+        """Sends every dirty room once, then the dirty lobby entries together. Returns how many rooms were sent."""
+        with self._lock:
+            rooms, self._dirty_rooms = self._dirty_rooms, {}
+            lobby_dirty, self._lobby_dirty = self._lobby_dirty, set()
+            self._flushing.update(rooms)
+        self._last_flush = self.clock()
+        for game in rooms.values():
+            try:
+                sending = self.flush_room(game)
+            except Exception as e:
+                print(f"Error broadcasting room {game.room_code}: {e}")
+                sending = None
+            if hasattr(sending, 'add_done_callback'):
+                sending.add_done_callback(lambda future, room_code=game.room_code: self._sent(room_code, future))
+            else:
+                self._sent(game.room_code)
+        if lobby_dirty:
+            try:
+                self.flush_lobby(sorted(lobby_dirty))
+            except Exception as e:
+                print(f"Error broadcasting lobby changes: {e}")
+        if rooms or lobby_dirty:
+            self.flushes += 1
+            self.rooms_flushed += len(rooms)
+        return len(rooms)
+
+    def _sent(self, room_code, future=None):
+        if future is not None and not future.cancelled() and future.exception() is not None:
+            print(f"Error broadcasting room {room_code}: {future.exception()}")
+        with self._lock:
+            self._flushing.discard(room_code)
+
+    def start(self, spawn):
+        """Switches marks to coalescing right away and runs run_forever through spawn(fn), e.g. a background task."""
+        self.running = True
+        spawn(self.run_forever)
+
+    def run_forever(self, sleep=time.sleep):
+        """Waits for marks and flushes them, at most once per tick."""
+        self.running = True
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            remaining = self._last_flush + self.tick - self.clock()
+            if remaining > 0:
+                sleep(remaining)
+            self.flush()
@@ -0,0 +1,43 @@
+LOBBY_ROOM = 'lobby'
+
+
+class LobbyFeed:
+    """
+    What lobby subscribers were last told about each room.
+
+    Subscribers get the full room list once, when they join the lobby channel,
+    and then only changes: diff() rebuilds the rooms that were marked dirty and
+    reports the ones that appeared, changed or disappeared since the last diff.
+    Added and updated entries are full room entries, so clients can apply them
+    as upserts; a client that subscribed while a diff was pending just sees
+    entries it already has.
+    """
+
+    def __init__(self):
+        self._rooms = {}  # room_code -> room entry last sent to the lobby
+        self.diffs_sent = 0
+
+    def diff(self, room_codes, get_room):
+        """
+        `get_room(room_code)` returns the room's current lobby entry, or None if the
+        room is gone. Returns {'added', 'updated', 'removed'} for the rooms that
+        changed, or None if none did.
+        """
+        added, updated, removed = [], [], []
+        for room_code in room_codes:
+            room = get_room(room_code)
+            previous = self._rooms.get(room_code)
+            if room is None:
+                if room_code in self._rooms:
+                    del self._rooms[room_code]
+                    removed.append(room_code)
+            elif previous is None:
+                self._rooms[room_code] = room
+                added.append(room)
+            elif previous != room:
+                self._rooms[room_code] = room
+                updated.append(room)
+        if not (added or updated or removed):
+            return None
+        self.diffs_sent += 1
+        return {'added': added, 'updated': updated, 'removed': removed}
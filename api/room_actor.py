@@ -0,0 +1,118 @@
+import queue
+import threading
+from concurrent.futures import Future
+
+_current = threading.local()  # .room_code: the room whose actor this thread is
+
+
+class UnknownRoomError(ValueError):
+    """Raised for a command sent to a room that does not exist; no actor is started for it."""
+
+
+class RoomActor:
+    """One room's command queue, drained in order by one (green) thread."""
+
+    def __init__(self, room_code):
+        self.room_code = room_code
+        self.commands_run = 0
+        self._commands = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name=f"room-{room_code}", daemon=True)
+        self._thread.start()
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        self._commands.put((future, fn, args, kwargs))
+        return future
+
+    def stop(self):
+        """Lets the commands already queued finish, then ends the thread."""
+        self._commands.put(None)
+
+    @property
+    def pending(self):
+        return self._commands.qsize()
+
+    def _run(self):
+        _current.room_code = self.room_code
+        while True:
+            command = self._commands.get()
+            if command is None:
+                return
+            future, fn, args, kwargs = command
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+            self.commands_run += 1
+
+
+class RoomCommandQueues:
+    """
+    Runs every command that touches a room on that room's actor.
+
+    Commands for one room execute one at a time in submission order, so HTTP
+    routes, socket handlers, the interrupt timer and bots never interleave their
+    changes to a game, while different rooms run in parallel on their own green
+    threads. A command that runs another command for its own room (e.g. a route
+    that broadcasts) executes it inline instead of queueing behind itself.
+    With enabled=False commands run inline on the caller's thread.
+
+    `room_exists(room_code)`, if given, is checked before an actor is started, so
+    commands for made-up or already deleted room codes raise UnknownRoomError
+    instead of leaving a thread behind.
+    """
+
+    def __init__(self, enabled=True, timeout=None, room_exists=None):
+        self.enabled = enabled
+        self.timeout = timeout
+        self.room_exists = room_exists
+        self._actors = {}
+        self._lock = threading.Lock()
+
+    def _actor(self, room_code):
+        with self._lock:
+            actor = self._actors.get(room_code)
+            if actor is None:
+                if self.room_exists is not None and not self.room_exists(room_code):
+                    raise UnknownRoomError(f"Room {room_code} does not exist.")
+                actor = self._actors[room_code] = RoomActor(room_code)
+            return actor
+
+    @staticmethod
+    def current_room():
+        """The room whose actor is running the calling code, or None."""
+        return getattr(_current, 'room_code', None)
+
+    def submit(self, room_code, fn, *args, **kwargs):
+        """
+        Queues fn on the room's actor without waiting. Returns a Future. Like run(),
+        it runs fn inline (and returns a finished Future) if queueing is disabled or
+        the caller already is the room's actor.
+        """
+        if not self.enabled or self.current_room() == room_code:
+            future = Future()
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+            return future
+        return self._actor(room_code).submit(fn, *args, **kwargs)
+
+    def run(self, room_code, fn, *args, **kwargs):
+        """Runs fn on the room's actor and returns its result (or raises its exception)."""
+        if not self.enabled or self.current_room() == room_code:
+            return fn(*args, **kwargs)
+        return self.submit(room_code, fn, *args, **kwargs).result(self.timeout)
+
+    def forget_room(self, room_code):
+        with self._lock:
+            actor = self._actors.pop(room_code, None)
+        if actor is not None:
+            actor.stop()
+
+    def __len__(self):
+        return len(self._actors)
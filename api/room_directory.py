@@ -0,0 +1,101 @@
+import bisect
+import heapq
+import itertools
+
+
+class RoomDirectory:
+    """
+    Index of live rooms for the paginated /rooms listing.
+
+    Rooms are ordered by when they were first listed. Besides the full order the
+    directory keeps one sorted index per status, per game type and per
+    (status, game type) pair, so a query reads only the index that matches its
+    filters: a bisect to the cursor plus one step per room returned. update() is
+    called whenever a room is created, changes or goes away, and only re-files a
+    room whose status or game type actually changed.
+    """
+
+    def __init__(self):
+        self._seq = itertools.count(1)
+        self._rooms = {}  # room_code -> (seq, status, game_type)
+        self._all = []  # sorted (seq, room_code)
+        self._indexes = {}  # ('status', s) / ('game_type', t) / ('both', s, t) -> sorted (seq, room_code)
+
+    def __len__(self):
+        return len(self._rooms)
+
+    def _index_keys(self, status, game_type):
+        return ('status', status), ('game_type', game_type), ('both', status, game_type)
+
+    def update(self, room_code, game):
+        """Files the room under its current status and game type, or removes it if `game` is None."""
+        if game is None:
+            self.remove(room_code)
+            return
+        entry = self._rooms.get(room_code)
+        status, game_type = game.status, game.game_type
+        if entry is not None:
+            if entry[1:] == (status, game_type):
+                return
+            self._unfile(room_code, *entry)
+            seq = entry[0]
+        else:
+            seq = next(self._seq)
+            bisect.insort(self._all, (seq, room_code))
+        self._rooms[room_code] = (seq, status, game_type)
+        for key in self._index_keys(status, game_type):
+            bisect.insort(self._indexes.setdefault(key, []), (seq, room_code))
+
+    def _unfile(self, room_code, seq, status, game_type):
+        for key in self._index_keys(status, game_type):
+            index = self._indexes[key]
+            del index[bisect.bisect_left(index, (seq, room_code))]
+            if not index:
+                del self._indexes[key]
+
+    def remove(self, room_code):
+        entry = self._rooms.pop(room_code, None)
+        if entry is not None:
+            self._unfile(room_code, *entry)
+            del self._all[bisect.bisect_left(self._all, (entry[0], room_code))]
+
+    def query(self, statuses=None, game_type=None, limit=50, cursor=None):
+        """
+        Up to `limit` room codes matching any of `statuses` and `game_type` (a type or
+        a list of types; None for any), after `cursor`. Returns (room_codes,
+        next_cursor); next_cursor is None on the last page.
+        """
+        if limit < 1:
+            raise ValueError("limit must be at least 1.")
+        after = self._parse_cursor(cursor)
+        # A repeated filter would merge the same index twice and list its rooms twice.
+        statuses = list(dict.fromkeys(statuses or []))
+        game_types = list(dict.fromkeys([game_type] if isinstance(game_type, str) else game_type or []))
+        if statuses and game_types:
+            keys = [('both', status, t) for status in statuses for t in game_types]
+        elif statuses:
+            keys = [('status', status) for status in statuses]
+        elif game_types:
+            keys = [('game_type', t) for t in game_types]
+        else:
+            keys = None
+        indexes = [self._indexes.get(key, []) for key in keys] if keys else [self._all]
+        tails = []
+        for index in indexes:
+            start = bisect.bisect_left(index, (after + 1,))
+            tails.append(index[start:start + limit + 1])
+        page = list(itertools.islice(heapq.merge(*tails), limit + 1))
+        next_cursor = str(page[limit - 1][0]) if len(page) > limit else None
+        return [room_code for _, room_code in page[:limit]], next_cursor
+
+    @staticmethod
+    def _parse_cursor(cursor):
+        if cursor in (None, ''):
+            return 0
+        try:
+            after = int(cursor)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid cursor: {cursor}.")
+        if after < 0:
+            raise ValueError(f"Invalid cursor: {cursor}.")
+        return after
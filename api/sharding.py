@@ -0,0 +1,455 @@
+import hmac
+import itertools
+import json
+import os
+import queue
+import socket
+import threading
+import uuid
+import zlib
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+import requests
+import socketio
+
+# Message bus topics used between shards.
+LOBBY_TOPIC = 'lobby'
+LOBBY_RESYNC_TOPIC = 'lobby_resync'
+SOCKETIO_TOPIC = 'socketio'
+
+# Headers that are hop-by-hop or recomputed, so the router does not forward them.
+_SKIPPED_HEADERS = {'host', 'content-length', 'connection', 'transfer-encoding', 'keep-alive', 'content-encoding'}
+
+
+def shard_for_room(room_code, num_shards):
+    """The shard that owns a room. Stable across processes and restarts, unlike hash()."""
+    return zlib.crc32(room_code.upper().encode('utf-8')) % num_shards
+
+
+def _pipe(source, destination):
+    """Copies bytes from one socket to the other until either side closes, then closes both."""
+    try:
+        while True:
+            data = source.recv(65536)
+            if not data:
+                break
+            destination.sendall(data)
+    except OSError:
+        pass
+    finally:
+        for sock in (source, destination):
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+class LocalMessageBus:
+    """
+    In-process stand-in for the message bus between shards: publish() delivers
+    to this process's subscribers right away. Used by tests and single-process runs.
+    """
+
+    def __init__(self):
+        self._handlers = {}
+
+    def subscribe(self, topic, handler):
+        self._handlers.setdefault(topic, []).append(handler)
+
+    def deliver(self, topic, message):
+        for handler in self._handlers.get(topic, []):
+            handler(message)
+
+    def publish(self, topic, message):
+        self.deliver(topic, message)
+
+
+class HttpMessageBus(LocalMessageBus):
+    """
+    Message bus between shard processes: publish() delivers locally and POSTs the
+    message to every peer's /internal/bus endpoint, which hands it to deliver().
+    Messages are signed with a shared token; delivery to peers is best effort and
+    happens off the caller's thread, one peer's messages in publish order.
+    """
+
+    def __init__(self, peer_urls, token, post=requests.post, timeout=2.0):
+        super().__init__()
+        self.peer_urls = list(peer_urls)
+        self.token = token
+        self.post = post
+        self.timeout = timeout
+        self._outboxes = {}  # peer url -> queue of bodies, drained by one thread per peer
+        self._outboxes_lock = threading.Lock()
+
+    def publish(self, topic, message):
+        self.deliver(topic, message)
+        body = {'topic': topic, 'message': message}
+        for url in self.peer_urls:
+            self._outbox(url).put(body)
+
+    def _outbox(self, url):
+        with self._outboxes_lock:
+            outbox = self._outboxes.get(url)
+            if outbox is None:
+                outbox = self._outboxes[url] = queue.Queue()
+                threading.Thread(target=self._drain, args=(url, outbox), daemon=True).start()
+            return outbox
+
+    def _drain(self, url, outbox):
+        while True:
+            self._post(url, outbox.get())
+
+    def _post(self, url, body):
+        try:
+            self.post(f"{url}/internal/bus", json=body, headers={'X-Bus-Token': self.token}, timeout=self.timeout)
+        except Exception as e:
+            print(f"WARNING: Could not deliver bus message to {url}: {e}")
+
+    def is_authorized(self, token):
+        return bool(self.token) and hmac.compare_digest(token or '', self.token)
+
+
+class LobbyAggregator:
+    """
+    The lobby of every shard, kept on each shard.
+
+    Each shard publishes its own lobby diffs (from LobbyFeed) on the bus; every
+    shard applies all of them, so its lobby subscribers see rooms from every
+    shard and get a full listing on subscribe without asking the other shards.
+    A shard that starts late publishes a resync request, and the others answer
+    with their whole room list as one diff.
+    """
+
+    def __init__(self, shard_index, bus, on_changes=None, local_rooms=None):
+        self.shard_index = shard_index
+        self.bus = bus
+        self.on_changes = on_changes
+        self.local_rooms = local_rooms
+        self._rooms = {}  # room_code -> lobby entry
+        self._lock = threading.Lock()
+        bus.subscribe(LOBBY_TOPIC, self._apply)
+        bus.subscribe(LOBBY_RESYNC_TOPIC, self._answer_resync)
+
+    def publish(self, changes):
+        """Shares this shard's lobby diff with every shard, including this one."""
+        self.bus.publish(LOBBY_TOPIC, {'shard': self.shard_index, 'changes': changes})
+
+    def request_resync(self):
+        self.bus.publish(LOBBY_RESYNC_TOPIC, {'shard': self.shard_index})
+
+    def rooms(self):
+        with self._lock:
+            return list(self._rooms.values())
+
+    def _apply(self, message):
+        changes = message['changes']
+        with self._lock:
+            for room in itertools.chain(changes.get('added', []), changes.get('updated', [])):
+                self._rooms[room['room_code']] = room
+            for room_code in changes.get('removed', []):
+                self._rooms.pop(room_code, None)
+        if self.on_changes is not None:
+            self.on_changes(changes)
+
+    def _answer_resync(self, message):
+        if message['shard'] != self.shard_index and self.local_rooms is not None:
+            rooms = self.local_rooms()
+            if rooms:
+                self.publish({'added': rooms, 'updated': [], 'removed': []})
+
+
+class ShardSocketManager(socketio.Manager):
+    """
+    Socket.IO client manager for sharded mode.
+
+    A socket stays on the shard it connected to, but its room events run on the
+    shard that owns the room (see SocketEventRelay). That shard then emits to a
+    socket it does not hold and adds it to the room's channel. Such emits and
+    room changes are published on the bus, and the shard holding the socket
+    carries them out. Emits that only reach this shard's sockets stay local.
+    """
+
+    def __init__(self, bus=None):
+        super().__init__()
+        self.bus = None
+        self.host_id = uuid.uuid4().hex
+        self._remote = {}  # (namespace, room) -> sids held by other shards; each such sid is its own room
+        self._remote_lock = threading.Lock()
+        if bus is not None:
+            self.attach(bus)
+
+    def attach(self, bus):
+        self.bus = bus
+        bus.subscribe(SOCKETIO_TOPIC, self._deliver)
+
+    def add_remote_socket(self, sid, namespace='/'):
+        """Registers a socket held by another shard, so emits to it get published."""
+        with self._remote_lock:
+            self._remote.setdefault((namespace, sid), set()).add(sid)
+
+    def forget_remote_socket(self, sid, namespace='/'):
+        with self._remote_lock:
+            for key, sids in list(self._remote.items()):
+                if key[0] == namespace:
+                    sids.discard(sid)
+                    if not sids:
+                        del self._remote[key]
+
+    def has_remote_members(self, namespace, room):
+        if room is None:
+            return False  # Broadcasts to a whole namespace stay on each shard
+        rooms = room if isinstance(room, (list, tuple)) else [room]
+        with self._remote_lock:
+            return any(self._remote.get((namespace, r)) for r in rooms)
+
+    def emit(self, event, data, namespace, room=None, skip_sid=None, callback=None, to=None, **kwargs):
+        room = to or room
+        if self.bus is not None and self.has_remote_members(namespace, room):
+            self._publish('emit', namespace, room=room, event=event, skip_sid=skip_sid,
+                          data=list(data) if isinstance(data, tuple) else data, spread=isinstance(data, tuple))
+        return super().emit(event, data, namespace, room=room, skip_sid=skip_sid, callback=callback, **kwargs)
+
+    def enter_room(self, sid, namespace, room, eio_sid=None):
+        if self.bus is None or self.is_connected(sid, namespace):
+            return super().enter_room(sid, namespace, room, eio_sid=eio_sid)
+        with self._remote_lock:
+            self._remote.setdefault((namespace, room), set()).add(sid)
+        self._publish('enter_room', namespace, room=room, sid=sid)
+
+    def leave_room(self, sid, namespace, room):
+        if self.bus is None or self.is_connected(sid, namespace):
+            return super().leave_room(sid, namespace, room)
+        with self._remote_lock:
+            sids = self._remote.get((namespace, room), set())
+            sids.discard(sid)
+            if not sids:
+                self._remote.pop((namespace, room), None)
+        self._publish('leave_room', namespace, room=room, sid=sid)
+
+    def _publish(self, method, namespace, **message):
+        self.bus.publish(SOCKETIO_TOPIC, dict(message, method=method, namespace=namespace, host=self.host_id))
+
+    def _deliver(self, message):
+        if message.get('host') == self.host_id:
+            return
+        namespace, room = message['namespace'], message.get('room')
+        if message['method'] == 'emit':
+            data = tuple(message['data']) if message.get('spread') else message['data']
+            super().emit(message['event'], data, namespace, room=room, skip_sid=message.get('skip_sid'))
+        elif message['method'] == 'enter_room' and self.is_connected(message['sid'], namespace):
+            super().enter_room(message['sid'], namespace, room)
+        elif message['method'] == 'leave_room' and self.is_connected(message['sid'], namespace):
+            super().leave_room(message['sid'], namespace, room)
+
+
+class SocketEventRelay:
+    """
+    Hands socket events for a room owned by another shard to that shard.
+
+    The router pins a socket to one shard (shard 0 for the lobby), so a client
+    that opens its socket in the lobby and then joins a room keeps talking to
+    shard 0. That shard POSTs each event for the room to the owner's
+    /internal/socket_event, which runs the event's handler for the socket and
+    answers with its acknowledgement; replies reach the socket through
+    ShardSocketManager. When the socket disconnects, the owners it used are told.
+    """
+
+    def __init__(self, shard_urls, token, post=requests.post, timeout=10.0):
+        self.shard_urls = list(shard_urls)
+        self.token = token
+        self.post = post
+        self.timeout = timeout
+        self._owners = {}  # sid -> shards that ran its events
+        self._lock = threading.Lock()
+
+    def send(self, shard, event, data, sid, player_id=None):
+        """
+        Runs the event on `shard` and returns its answer, {'ack': ..., 'player_id': ...},
+        where player_id is the socket's player once the handler ran. None if the shard failed.
+        """
+        with self._lock:
+            self._owners.setdefault(sid, set()).add(shard)
+        return self._post(shard, {'event': event, 'data': data, 'sid': sid, 'player_id': player_id})
+
+    def disconnect(self, sid):
+        """Runs the disconnect handler for the socket on every shard that ran its events."""
+        with self._lock:
+            shards = self._owners.pop(sid, set())
+        for shard in shards:
+            self._post(shard, {'event': 'disconnect', 'data': None, 'sid': sid, 'player_id': None})
+
+    def _post(self, shard, body):
+        url = f"{self.shard_urls[shard]}/internal/socket_event"
+        try:
+            response = self.post(url, json=body, headers={'X-Bus-Token': self.token}, timeout=self.timeout)
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            print(f"WARNING: Could not relay socket event {body['event']} to {url}: {e}")
+            return None
+
+
+class ShardRouter:
+    """
+    Front WSGI app for a sharded deployment.
+
+    Requests that name a room (room_code in the query string or JSON body) go to
+    the shard that owns it; create_room and room-less requests are spread
+    round-robin (shards only create rooms they own). GET /rooms pages through
+    the shards one after another with a '<shard>:<cursor>' cursor.
+
+    Socket.IO goes through the router too, so clients only ever talk to its
+    origin (and its session cookie). A socket is pinned to the shard of the
+    room_code in its connection query, which Socket.IO clients repeat on every
+    polling request and on the WebSocket upgrade. Sockets without a room (the
+    lobby) go to shard 0, whose lobby lists the rooms of every shard; events for
+    rooms it joins later are relayed to their shard (SocketEventRelay). WebSocket
+    upgrades are piped to the shard byte for byte.
+
+    `transport(shard_url, method, path, query, body, headers)` returns
+    (status, headers, body); the default forwards over HTTP with requests.
+    `tunnel(shard_url, environ, start_response)` serves a WebSocket upgrade; the
+    default needs the raw client socket that eventlet servers expose.
+    """
+
+    def __init__(self, shard_urls, transport=None, tunnel=None):
+        if not shard_urls:
+            raise ValueError("A ShardRouter needs at least one shard.")
+        self.shard_urls = list(shard_urls)
+        self.transport = transport or self._http_transport
+        self.tunnel = tunnel or self._websocket_tunnel
+        self._next_shard = itertools.count()
+        self.requests_routed = [0] * len(self.shard_urls)
+
+    def shard_for_request(self, path, query, body):
+        room_code = (query.get('room_code') or [None])[0]
+        if not room_code and body:
+            try:
+                data = json.loads(body)
+            except ValueError:
+                data = None
+            if isinstance(data, dict):
+                room_code = data.get('room_code')
+        if room_code:
+            return shard_for_room(str(room_code), len(self.shard_urls))
+        return next(self._next_shard) % len(self.shard_urls)
+
+    def shard_for_socket(self, query):
+        room_code = (query.get('room_code') or [None])[0]
+        return shard_for_room(room_code, len(self.shard_urls)) if room_code else 0
+
+    def __call__(self, environ, start_response):
+        method = environ['REQUEST_METHOD']
+        path = environ.get('PATH_INFO', '/')
+        query = parse_qs(environ.get('QUERY_STRING', ''))
+        length = int(environ.get('CONTENT_LENGTH') or 0)
+        body = environ['wsgi.input'].read(length) if length else b''
+        headers = {
+            key[5:].replace('_', '-').title(): value for key, value in environ.items()
+            if key.startswith('HTTP_') and key[5:].replace('_', '-').lower() not in _SKIPPED_HEADERS
+        }
+        if environ.get('CONTENT_TYPE'):
+            headers['Content-Type'] = environ['CONTENT_TYPE']
+
+        if path.startswith('/internal/'):
+            return self._respond(start_response, 404, {}, {'error': 'Not found.'})
+        if path.startswith('/socket.io'):
+            shard = self.shard_for_socket(query)
+            if environ.get('HTTP_UPGRADE', '').lower() == 'websocket':
+                self.requests_routed[shard] += 1
+                return self.tunnel(self.shard_urls[shard], environ, start_response)
+        elif method == 'GET' and path == '/rooms':
+            return self._list_rooms(start_response, query, headers)
+        else:
+            shard = self.shard_for_request(path, query, body)
+
+        status, response_headers, response_body = self._forward(shard, method, path, query, body, headers)
+        return self._respond(start_response, status, response_headers, response_body)
+
+    def _forward(self, shard, method, path, query, body, headers):
+        self.requests_routed[shard] += 1
+        status, response_headers, response_body = self.transport(
+            self.shard_urls[shard], method, path, query, body, headers
+        )
+        return status, dict(response_headers), response_body
+
+    def _list_rooms(self, start_response, query, headers):
+        shard, cursor = 0, None
+        if query.get('cursor'):
+            try:
+                shard_text, _, cursor = query['cursor'][0].partition(':')
+                shard = int(shard_text)
+            except ValueError:
+                shard = -1
+            if not 0 <= shard < len(self.shard_urls):
+                return self._respond(start_response, 400, {}, {'success': False, 'error': 'Invalid cursor.'})
+        shard_query = {key: values for key, values in query.items() if key != 'cursor'}
+        if cursor:
+            shard_query['cursor'] = [cursor]
+        status, _, body = self._forward(shard, 'GET', '/rooms', shard_query, b'', headers)
+        if status != 200:
+            return self._respond(start_response, status, {}, body)
+        page = json.loads(body)
+        if page.get('next_cursor'):
+            page['next_cursor'] = f"{shard}:{page['next_cursor']}"
+        elif shard + 1 < len(self.shard_urls):
+            page['next_cursor'] = f"{shard + 1}:"
+        return self._respond(start_response, 200, {}, page)
+
+    @staticmethod
+    def _respond(start_response, status, headers, body):
+        if not isinstance(body, (bytes, str)):
+            body = json.dumps(body)
+            headers = dict(headers, **{'Content-Type': 'application/json'})
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        headers = {key: value for key, value in headers.items() if key.lower() not in _SKIPPED_HEADERS}
+        try:
+            reason = HTTPStatus(status).phrase
+        except ValueError:
+            reason = ''
+        start_response(f"{status} {reason}", list(headers.items()) + [('Content-Length', str(len(body)))])
+        return [body]
+
+    @staticmethod
+    def _http_transport(shard_url, method, path, query, body, headers):
+        url = f"{shard_url}{path}"
+        if query:
+            url = f"{url}?{urlencode(query, doseq=True)}"
+        response = requests.request(method, url, data=body or None, headers=headers, timeout=30, allow_redirects=False)
+        return response.status_code, response.headers, response.content
+
+    @staticmethod
+    def _websocket_tunnel(shard_url, environ, start_response):
+        import eventlet
+        from eventlet import wsgi
+
+        if 'eventlet.input' in environ:
+            client = environ['eventlet.input'].get_socket()
+        elif 'gunicorn.socket' in environ:
+            client = environ['gunicorn.socket']
+        else:
+            return ShardRouter._respond(start_response, 400, {}, {'error': 'WebSocket upgrades need the eventlet server.'})
+        shard = urlsplit(shard_url)
+        upstream = eventlet.connect((shard.hostname, shard.port or 80))
+        target = environ.get('PATH_INFO', '/')
+        if environ.get('QUERY_STRING'):
+            target = f"{target}?{environ['QUERY_STRING']}"
+        lines = [f"GET {target} HTTP/1.1", f"Host: {shard.netloc}"] + [
+            f"{key[5:].replace('_', '-').title()}: {value}" for key, value in environ.items()
+            if key.startswith('HTTP_') and key != 'HTTP_HOST'
+        ]
+        upstream.sendall(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        pipes = [eventlet.spawn(_pipe, client, upstream), eventlet.spawn(_pipe, upstream, client)]
+        for pipe in pipes:
+            pipe.wait()
+        upstream.close()
+        # Tells eventlet's server that the response was written on the socket directly.
+        wsgi.WSGI_LOCAL.already_handled = True
+        return []
+
+
+def create_router_app():
+    """WSGI app for `gunicorn 'api.sharding:create_router_app()'`; shard URLs come from SHARD_URLS."""
+    return ShardRouter([url.strip().rstrip('/') for url in os.environ['SHARD_URLS'].split(',') if url.strip()])
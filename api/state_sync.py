@@ -0,0 +1,171 @@
+import itertools
+import threading
+from collections import OrderedDict
+
+# Keys diffed specially instead of being resent whole when they change.
+_PILE = 'pile'
+_HAND = 'your_hand'
+_VERSION = 'state_version'
+
+
+def encode_delta(old, new):
+    """
+    Describes how to turn payload `old` into payload `new`. Top-level fields that
+    changed are sent whole under 'changes'; cards added on top of the pile go in
+    'pile_appended' and hand changes in 'hand_removed' (card IDs) / 'hand_added'.
+    """
+    delta = {_VERSION: new[_VERSION], 'base_version': old[_VERSION]}
+    changes = {}
+    for key, value in new.items():
+        if key in (_VERSION, _PILE, _HAND):
+            continue
+        if key not in old or old[key] != value:
+            changes[key] = value
+    for key in old:
+        if key not in new:
+            changes[key] = None
+
+    old_pile, new_pile = old.get(_PILE) or [], new.get(_PILE) or []
+    old_pile_ids = [card['id'] for card in old_pile]
+    if [card['id'] for card in new_pile[:len(old_pile)]] == old_pile_ids:
+        if len(new_pile) > len(old_pile):
+            delta['pile_appended'] = new_pile[len(old_pile):]
+    else:
+        changes[_PILE] = new_pile
+
+    old_hand_ids = {card['id'] for card in old.get(_HAND) or []}
+    new_hand = new.get(_HAND) or []
+    new_hand_ids = {card['id'] for card in new_hand}
+    removed = [card_id for card_id in old_hand_ids if card_id not in new_hand_ids]
+    added = [card for card in new_hand if card['id'] not in old_hand_ids]
+    if removed:
+        delta['hand_removed'] = removed
+    if added:
+        delta['hand_added'] = added
+
+    delta['changes'] = changes
+    return delta
+
+
+class _RoomLog:
+    __slots__ = ('epoch', 'version', 'payloads', 'sent', 'acked', 'changed')
+
+    def __init__(self, epoch):
+        self.epoch = epoch  # Tells apart rooms that reuse a room code
+        # Long-polls on this room park here, so a publish only wakes the room's own pollers.
+        # A green lock under eventlet's monkey patching, so a parked long-poll only costs a green thread.
+        self.changed = threading.Condition()
+        self.version = 0
+        self.payloads = OrderedDict()  # version -> {player_id: payload}
+        self.sent = {}  # player_id -> last version sent to the client
+        self.acked = {}  # player_id -> last version the client acknowledged
+
+
+class GameStateSync:
+    """
+    Versioned game_state_update protocol.
+
+    Every broadcast gives the room a new state version and keeps the per-player
+    payloads of the last `max_versions` versions. A client that acknowledges the
+    versions it applies is sent deltas from the version it was last sent (Socket.IO
+    delivers in order, so that is the version it will hold). It gets a full snapshot
+    instead when it has not acknowledged anything yet (a fresh join, a reconnect,
+    an old client that never acks), or when its last ack is more than `max_lag`
+    versions behind, so a client that silently dropped updates catches up.
+
+    The version also backs HTTP polling: it is the /game_state ETag, and
+    wait_for_change parks a long-poll until the next publish.
+    """
+
+    SNAPSHOT_EVENT = 'game_state_update'
+    DELTA_EVENT = 'game_state_delta'
+
+    def __init__(self, max_versions=16, max_lag=None):
+        if max_versions < 1:
+            raise ValueError("max_versions must be at least 1.")
+        self.max_versions = max_versions
+        self.max_lag = max_versions if max_lag is None else max_lag
+        self._rooms = {}
+        self._epochs = itertools.count(1)
+        self._lock = threading.Lock()  # Guards creating and forgetting rooms
+        self.snapshots_sent = 0
+        self.deltas_sent = 0
+
+    def current_version(self, room_code):
+        log = self._rooms.get(room_code)
+        return log.version if log else 0
+
+    def publish(self, room_code, payloads):
+        """Records a new version of the room from {player_id: full payload}. Stamps and returns the version."""
+        with self._lock:
+            log = self._rooms.get(room_code)
+            if log is None:
+                log = self._rooms[room_code] = _RoomLog(next(self._epochs))
+        with log.changed:
+            log.version += 1
+            for payload in payloads.values():
+                payload[_VERSION] = log.version
+            log.payloads[log.version] = payloads
+            while len(log.payloads) > self.max_versions:
+                log.payloads.popitem(last=False)
+            log.changed.notify_all()
+            return log.version
+
+    def etag(self, room_code):
+        """An ETag for the room's current version, or None before its first publish."""
+        log = self._rooms.get(room_code)
+        return f"{log.epoch}.{log.version}" if log else None
+
+    def wait_for_change(self, room_code, etag, timeout):
+        """Blocks until the room's ETag is no longer `etag` (or the room is gone) or `timeout` seconds pass."""
+        log = self._rooms.get(room_code)
+        if log is None:
+            return self.etag(room_code) != etag
+        with log.changed:
+            return log.changed.wait_for(lambda: self.etag(room_code) != etag, timeout)
+
+    def message_for(self, room_code, player_id):
+        """
+        Returns (event, data) bringing the player up to the latest published version,
+        or None if they were already sent it.
+        """
+        log = self._rooms.get(room_code)
+        if not log or not log.payloads:
+            return None
+        latest = log.payloads[log.version].get(player_id)
+        if latest is None:
+            return None
+        sent = log.sent.get(player_id)
+        if sent == log.version:
+            return None
+        log.sent[player_id] = log.version
+
+        acked = log.acked.get(player_id)
+        base = log.payloads.get(sent, {}).get(player_id)
+        if acked is None or base is None or log.version - acked > self.max_lag:
+            self.snapshots_sent += 1
+            return self.SNAPSHOT_EVENT, latest
+        self.deltas_sent += 1
+        return self.DELTA_EVENT, encode_delta(base, latest)
+
+    def ack(self, room_code, player_id, version):
+        """Notes the version a client holds. Returns False for versions the server never sent it."""
+        log = self._rooms.get(room_code)
+        if not log or not isinstance(version, int) or not 0 < version <= log.sent.get(player_id, 0):
+            return False
+        log.acked[player_id] = max(version, log.acked.get(player_id, 0))
+        return True
+
+    def reset_player(self, room_code, player_id):
+        """Forgets what a player holds, so their next update is a full snapshot (e.g. after a rejoin)."""
+        log = self._rooms.get(room_code)
+        if log:
+            log.sent.pop(player_id, None)
+            log.acked.pop(player_id, None)
+
+    def forget_room(self, room_code):
+        with self._lock:
+            log = self._rooms.pop(room_code, None)
+        if log is not None:
+            with log.changed:
+                log.changed.notify_all()
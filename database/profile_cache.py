@@ -0,0 +1,100 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class _Flight:
+    """One in-progress load that concurrent misses for the same key wait on."""
+    __slots__ = ('done', 'value', 'error', 'superseded')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+        self.superseded = False
+
+
+class ProfileCache:
+    """
+    In-process cache of user profiles keyed by user ID.
+
+    Entries expire after `ttl` seconds and the least recently used entry is
+    evicted beyond `max_entries`. A loader result of None (no such user) is
+    cached too, for `negative_ttl` seconds, so bots and guests without a profile
+    do not cost a lookup each time. Concurrent misses for the same user share a
+    single load. put() writes through after the service updates a profile; it
+    wins over a load that was already in flight, whose result would be stale.
+    """
+
+    def __init__(self, ttl=60.0, negative_ttl=10.0, max_entries=10000, clock=time.monotonic):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries = OrderedDict()  # user_id -> (profile or None, expires_at)
+        self._in_flight = {}  # user_id -> _Flight
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+
+    def get(self, user_id, loader):
+        """Returns the cached profile (None for an unknown user), calling loader(user_id) on a miss."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[1] > self.clock():
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            flight = self._in_flight.get(user_id)
+            leader = flight is None
+            if leader:
+                flight = self._in_flight[user_id] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            self.loads += 1
+            flight.value = loader(user_id)
+        except Exception as e:
+            flight.error = e  # Errors are not cached; the next miss retries
+            raise
+        else:
+            with self._lock:
+                if not flight.superseded:
+                    self._store(user_id, flight.value)
+        finally:
+            with self._lock:
+                del self._in_flight[user_id]
+            flight.done.set()
+        return flight.value
+
+    def put(self, user_id, profile):
+        """Stores a profile the caller just wrote, replacing whatever is cached or being loaded."""
+        with self._lock:
+            flight = self._in_flight.get(user_id)
+            if flight is not None:
+                flight.superseded = True
+            self._store(user_id, profile)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+            flight = self._in_flight.get(user_id)
+            if flight is not None:
+                flight.superseded = True
+
+    def _store(self, user_id, profile):
+        ttl = self.ttl if profile is not None else self.negative_ttl
+        self._entries[user_id] = (profile, self.clock() + ttl)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
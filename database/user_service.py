@@ -3,6 +3,7 @@ from datetime import datetime
 import os
 import boto3
 from botocore.exceptions import ClientError
+from database.profile_cache import ProfileCache
 
 class UserService:
     def __init__(self):
@@ -16,6 +17,13 @@ class UserService:
             self.db_client = AmplifyDynamoDBClient()
             self.users_table = self.db_client.get_users_table()
 
+        # Profiles are read for every player in the lobby and every chat message; writes below go through the cache.
+        self.profile_cache = ProfileCache(
+            ttl=float(os.environ.get('PROFILE_CACHE_TTL', 60)),
+            negative_ttl=float(os.environ.get('PROFILE_CACHE_NEGATIVE_TTL', 10)),
+            max_entries=int(os.environ.get('PROFILE_CACHE_SIZE', 10000))
+        )
+
     def _format_profile_for_frontend(self, profile):
         """Helper to convert Decimal objects to floats/ints for frontend compatibility."""
         if not profile:
@@ -39,15 +47,19 @@ class UserService:
 
         return formatted_profile
 
+    def _load_user_profile(self, user_id):
+        response = self.users_table.get_item(
+            Key={'user_id': user_id}
+        )
+        # Use the helper function here
+        return self._format_profile_for_frontend(response['Item']) if 'Item' in response else None
+
     def get_user_profile(self, user_id):
         try:
-            response = self.users_table.get_item(
-                Key={'user_id': user_id}
-            )
+            profile = self.profile_cache.get(user_id, self._load_user_profile)
 
-            if 'Item' in response:
-                # Use the helper function here
-                return {'success': True, 'profile': self._format_profile_for_frontend(response['Item'])}
+            if profile is not None:
+                return {'success': True, 'profile': dict(profile)}
             else:
                 return {'success': False, 'error': 'User not found'}
         except ClientError as e:
@@ -73,7 +85,9 @@ class UserService:
 
             self.users_table.put_item(Item=item)
             # When returning the newly created item, also format it
-            return {'success': True, 'profile': self._format_profile_for_frontend(item)}
+            profile = self._format_profile_for_frontend(item)
+            self.profile_cache.put(user_id, profile)
+            return {'success': True, 'profile': dict(profile)}
         except Exception as e:
             print(f"Error creating user: {e}")
             return {'success': False, 'error': str(e)}
@@ -109,8 +123,11 @@ class UserService:
                 item['win_rate'] = Decimal('0.0') # Set to 0.0 if no games played
 
 
-            return {'success': True, 'profile': self._format_profile_for_frontend(item)} # <--- Also format here
+            profile = self._format_profile_for_frontend(item) # <--- Also format here
+            self.profile_cache.put(user_id, profile)
+            return {'success': True, 'profile': dict(profile)}
         except Exception as e:
+            self.profile_cache.invalidate(user_id)  # The ADD may have been applied
             print(f"Error updating user stats: {e}")
             return {'success': False, 'error': str(e)}
 
@@ -0,0 +1,206 @@
+import asyncio
+import random
+import time
+
+from game_engine.bots.heuristic import HeuristicPolicy
+from game_engine.game_loop import parse_cards
+from game_engine.simulation import (
+    DEFAULT_MAX_STEPS, advance_without_decision, apply_decision, create_simulated_game, pending_decision, quiet_engine,
+)
+
+PASS = "pass"
+
+
+def resolve_action(player, action):
+    """
+    Turns an agent's answer into cards from the player's hand, or None to pass.
+    An action may be None or "pass", typed cards such as "S3 H3", or a list of Cards.
+    """
+    if action is None or (isinstance(action, str) and action.strip().lower() == PASS):
+        return None
+    if isinstance(action, str):
+        return parse_cards(player.get_hand().cards, action)
+    return list(action)
+
+
+class BotAgent:
+    """A seat played by a synchronous policy such as HeuristicPolicy, optionally with a think time."""
+
+    def __init__(self, policy=None, think_time=0.0):
+        self.policy = policy if policy is not None else HeuristicPolicy()
+        self.think_time = think_time
+
+    async def choose_play(self, game, player):
+        if self.think_time:
+            await asyncio.sleep(self.think_time)
+        return self.policy.choose_play(game, player)
+
+    async def choose_interrupt_bid(self, game, player):
+        if self.think_time:
+            await asyncio.sleep(self.think_time)
+        return self.policy.choose_interrupt_bid(game, player)
+
+
+class QueueAgent:
+    """
+    A human seat. Whatever talks to the human (a socket handler, a terminal reader)
+    calls submit() with their move; the game loop waits on the queue without blocking
+    any other table. Rejected moves are kept in `errors` so they can be shown back.
+    """
+
+    def __init__(self):
+        self.actions = asyncio.Queue()
+        self.errors = []
+
+    def submit(self, action):
+        self.actions.put_nowait(action)
+
+    async def choose_play(self, game, player):
+        return await self._next_action(player)
+
+    async def choose_interrupt_bid(self, game, player):
+        return await self._next_action(player)
+
+    async def _next_action(self, player):
+        while True:
+            action = await self.actions.get()
+            try:
+                return resolve_action(player, action)
+            except ValueError as e:
+                self.reject(e)
+
+    def reject(self, error):
+        self.errors.append(str(error))
+
+
+class ScriptedAgent:
+    """Replays a fixed list of moves, in order, for a recorded game or a test. Passes once the script runs out."""
+
+    def __init__(self, moves):
+        self.moves = list(moves)
+        self.position = 0
+        self.errors = []
+
+    async def choose_play(self, game, player):
+        return self._next_action(player)
+
+    async def choose_interrupt_bid(self, game, player):
+        return self._next_action(player)
+
+    def _next_action(self, player):
+        if self.position >= len(self.moves):
+            return None
+        action = self.moves[self.position]
+        self.position += 1
+        return resolve_action(player, action)
+
+    def reject(self, error):
+        self.errors.append(str(error))
+
+
+class AsyncGameLoop:
+    """
+    Drives one game with an async agent per seat.
+
+    The loop yields to the event loop after every decision, so thousands of tables
+    can share one process. A decision that takes longer than `decision_timeout`
+    seconds (or outlasts the open interrupt window) is made by `fallback_policy`
+    instead. Moves the engine rejects are reported to the agent's reject() and the
+    same seat is asked again.
+    """
+
+    def __init__(self, game, agents, decision_timeout=None, fallback_policy=None, max_steps=DEFAULT_MAX_STEPS):
+        missing = [p.player_id for p in game.players if p.player_id not in agents]
+        if missing:
+            raise ValueError(f"No agent for players: {', '.join(missing)}")
+        self.game = game
+        self.agents = agents
+        self.decision_timeout = decision_timeout
+        self.fallback_policy = fallback_policy if fallback_policy is not None else HeuristicPolicy()
+        self.max_steps = max_steps
+        self.steps = 0
+        self.timeouts = 0
+        self.rejections = 0
+
+    async def run(self):
+        """Plays until the game is over or max_steps decisions have been made. Returns the number of steps."""
+        game = self.game
+        while not game.is_game_over and self.steps < self.max_steps:
+            if game.is_interrupt_expired():
+                game.resolve_interrupt()
+            else:
+                player, is_interrupt_response = pending_decision(game)
+                if player is None:
+                    advance_without_decision(game)
+                else:
+                    await self._take_decision(player, is_interrupt_response)
+            self.steps += 1
+            await asyncio.sleep(0)  # Let the other tables move
+        return self.steps
+
+    async def _take_decision(self, player, is_interrupt_response):
+        agent = self.agents[player.player_id]
+        choose = agent.choose_interrupt_bid if is_interrupt_response else agent.choose_play
+        timeout = self._timeout_for(is_interrupt_response)
+        try:
+            if timeout is None:
+                cards = await choose(self.game, player)
+            else:
+                cards = await asyncio.wait_for(choose(self.game, player), timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            if is_interrupt_response:
+                cards = self.fallback_policy.choose_interrupt_bid(self.game, player)
+            else:
+                cards = self.fallback_policy.choose_play(self.game, player)
+        except ValueError as e:
+            self._reject(agent, e)
+            return
+
+        try:
+            apply_decision(self.game, player, is_interrupt_response, cards)
+        except ValueError as e:
+            self._reject(agent, e)
+
+    def _timeout_for(self, is_interrupt_response):
+        timeout = self.decision_timeout
+        if is_interrupt_response and self.game.interrupt_active_until is not None:
+            remaining = max(0.0, self.game.interrupt_active_until - self.game.clock.now())
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        return timeout
+
+    def _reject(self, agent, error):
+        self.rejections += 1
+        if hasattr(agent, 'reject'):
+            agent.reject(error)
+
+
+async def run_game_loops(loops):
+    """Runs game loops concurrently on the current event loop. Returns each loop's step count, in order."""
+    return await asyncio.gather(*(loop.run() for loop in loops))
+
+
+def run_bot_tables(num_tables, num_players=4, seed=0, think_time=0.0):
+    """
+    Soak test: plays `num_tables` all-bot games concurrently in one event loop.
+    Returns (steps per table, wall-clock seconds).
+    """
+    rng = random.Random(seed)
+    loops = []
+    with quiet_engine():
+        for _ in range(num_tables):
+            game = create_simulated_game(num_players, seed=rng.getrandbits(32))
+            agents = {p.player_id: BotAgent(HeuristicPolicy(rng=random.Random(rng.getrandbits(32))), think_time)
+                      for p in game.players}
+            loops.append(AsyncGameLoop(game, agents))
+        # The engine's prints are silenced once around the whole run; per-task redirects would interleave.
+        started = time.perf_counter()
+        steps = asyncio.run(run_game_loops(loops))
+    return steps, time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    table_count = 1000
+    table_steps, elapsed = run_bot_tables(table_count)
+    print(f"{table_count} tables, {sum(table_steps)} decisions in {elapsed:.2f}s "
+          f"({sum(table_steps) / elapsed:.0f} decisions/s)")
@@ -0,0 +1,169 @@
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from game_engine.bots.linear import LinearPolicy
+from game_engine.rl.encoding import (
+    OBSERVATION_SIZE, ACTION_SIZE, encode_observation, legal_action_mask, cards_for_action,
+)
+from game_engine.simulation import apply_decision
+
+
+def pending_bot_decisions(game):
+    """
+    Yields (player, is_interrupt_response) for every bot seat that owes a decision right now.
+    During an interrupt every bot that has not responded is due, not just the next one in seat order.
+    """
+    if not game.is_game_started or game.is_game_over:
+        return
+    if game.interrupt_active:
+        for player in game.players:
+            if (getattr(player, 'is_bot', False) and not player.is_out
+                    and player.player_id != game.interrupt_initiator_player_id
+                    and player.player_id not in game.players_responded_to_interrupt):
+                yield player, True
+        return
+    player = game.get_current_player()
+    if player is not None and getattr(player, 'is_bot', False) and player.get_hand().cards:
+        yield player, False
+
+
+def _still_pending(game, player, is_interrupt_response):
+    return any(p is player and i == is_interrupt_response for p, i in pending_bot_decisions(game))
+
+
+class BotDecisionBroker:
+    """
+    Batches bot decisions from every room into one vectorized policy evaluation.
+
+    collect() queues the bot seats that are due across all live games. flush()
+    encodes the queued seats into one observation matrix, asks the policy for
+    every action at once and applies them. A seat whose game moved on between
+    encoding and dispatch (for example, an earlier bid in the same batch closed
+    the interrupt) is skipped and picked up again on the next round.
+
+    `run_in_room(room_code, fn, *args)`, if given, runs each staleness check and
+    move on the room's own command queue, so it cannot interleave with players' moves.
+
+    run_forever() does not scan the live games: the code that changes a turn or
+    opens an interrupt calls notify(game), which files the room if one of its bot
+    seats is due, and the loop sleeps until a room is filed.
+    """
+
+    def __init__(self, policy=None, window=0.005, max_batch=1024, on_decision=None, run_in_room=None):
+        self.policy = policy if policy is not None else LinearPolicy.from_heuristic()
+        self.window = window
+        self.max_batch = max_batch
+        self.on_decision = on_decision
+        self.run_in_room = run_in_room
+        self._queue = OrderedDict()  # (room_code, player_id) -> (game, player, is_interrupt_response)
+        self._due_rooms = {}  # room_code -> game with a bot seat that owes a decision
+        self._due_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._observations = np.zeros((max_batch, OBSERVATION_SIZE), dtype=np.float32)
+        self._action_masks = np.zeros((max_batch, ACTION_SIZE), dtype=bool)
+        self.batches_evaluated = 0
+        self.decisions_applied = 0
+        self.decisions_skipped = 0
+
+    @property
+    def pending_count(self):
+        return len(self._queue)
+
+    def submit(self, game, player, is_interrupt_response):
+        """Queues one bot decision. Re-submitting a seat that is already queued is a no-op."""
+        self._queue.setdefault((game.room_code, player.player_id), (game, player, is_interrupt_response))
+
+    @property
+    def due_room_count(self):
+        return len(self._due_rooms)
+
+    def notify(self, game):
+        """Files a game whose turn or interrupt state changed, if one of its bot seats now owes a decision."""
+        if next(pending_bot_decisions(game), None) is None:
+            return
+        with self._due_lock:
+            self._due_rooms[game.room_code] = game
+        self._wakeup.set()
+
+    def _take_due_games(self):
+        with self._due_lock:
+            games, self._due_rooms = list(self._due_rooms.values()), {}
+        return games
+
+    def collect(self, games):
+        """Queues every bot decision that is due in the given games."""
+        for game in games:
+            for player, is_interrupt_response in pending_bot_decisions(game):
+                self.submit(game, player, is_interrupt_response)
+
+    def flush(self):
+        """Evaluates up to max_batch queued decisions in one policy call and applies them. Returns how many were applied."""
+        if not self._queue:
+            return 0
+        batch = []
+        while self._queue and len(batch) < self.max_batch:
+            batch.append(self._queue.popitem(last=False)[1])
+
+        hashes = []
+        for row, (game, player, is_interrupt_response) in enumerate(batch):
+            encode_observation(game, player, out=self._observations[row])
+            legal_action_mask(game, player, is_interrupt_response, out=self._action_masks[row])
+            hashes.append(game.state_hash)
+        actions = self.policy.select_actions(self._observations[:len(batch)], self._action_masks[:len(batch)])
+        self.batches_evaluated += 1
+
+        applied = 0
+        for (game, player, is_interrupt_response), action, state_hash in zip(batch, actions, hashes):
+            if self.run_in_room is not None:
+                try:
+                    ok = self.run_in_room(game.room_code, self._apply, game, player, is_interrupt_response, action, state_hash)
+                except Exception as e:
+                    # E.g. the room was deleted since the seat was collected.
+                    print(f"WARNING: Could not run bot move in room {game.room_code}: {e}")
+                    self.decisions_skipped += 1
+                    ok = False
+            else:
+                ok = self._apply(game, player, is_interrupt_response, action, state_hash)
+            applied += ok
+        self.decisions_applied += applied
+        return applied
+
+    def _apply(self, game, player, is_interrupt_response, action, state_hash):
+        if game.state_hash != state_hash or not _still_pending(game, player, is_interrupt_response):
+            self.decisions_skipped += 1
+            self.notify(game)  # Picked up again if the seat owes a different decision now
+            return False
+        try:
+            apply_decision(game, player, is_interrupt_response, cards_for_action(player, action))
+        except ValueError as e:
+            print(f"WARNING: Bot {player.name} in room {game.room_code} could not act: {e}")
+            self.decisions_skipped += 1
+            self.notify(game)
+            return False
+        self.notify(game)  # The next seat may be a bot too
+        if self.on_decision is not None:
+            self.on_decision(game)
+        return True
+
+    def run_once(self, timeout=None, sleep=time.sleep):
+        """
+        Waits up to `timeout` seconds for a room to be filed, lets the window pass so
+        more rooms can join the batch, then flushes. Returns how many moves were applied.
+        """
+        if not self._wakeup.wait(timeout):
+            return 0
+        self._wakeup.clear()
+        self.collect(self._take_due_games())
+        sleep(self.window)
+        self.collect(self._take_due_games())
+        applied = 0
+        while self._queue:
+            applied += self.flush()
+        return applied
+
+    def run_forever(self, sleep=time.sleep):
+        while True:
+            self.run_once(sleep=sleep)
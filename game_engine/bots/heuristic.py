@@ -0,0 +1,73 @@
+import random
+
+from game_engine.card import Rank
+
+# Tunable knobs of the heuristic. Plays are scored (lower is better) and the
+# cheapest one is made unless it scores above pass_threshold.
+DEFAULT_WEIGHTS = {
+    'two_cost': 16.0,            # Score of spending 2s; above pass_threshold means "hoard them"
+    'three_cost': 15.0,          # Score of spending 3s outside an interrupt
+    'break_set_penalty': 3.0,    # Added per card of the rank left behind when splitting a set
+    'pass_threshold': 14.5,      # Pass instead of making a play scoring above this
+    'endgame_hand_size': 4,      # At or below this many cards, 2s and 3s cost nothing
+    'bomb_bid_probability': 1.0,   # Chance of bombing when holding the missing cards
+    'three_bid_probability': 1.0,  # Chance of answering a single 3 with another 3
+}
+
+
+class HeuristicPolicy:
+    """
+    Cheap rule-of-thumb bot for AssholeGame, used for rollouts and bot seats.
+    Decisions only read public state and the acting player's own hand.
+    """
+
+    def __init__(self, weights=None, rng=None):
+        self.weights = dict(DEFAULT_WEIGHTS)
+        if weights:
+            self.weights.update(weights)
+        self.rng = rng if rng is not None else random.Random()
+
+    def score_play(self, game, player, cards):
+        """Scores a legal play for the player; lower scores are preferred."""
+        hand_size = len(player.get_hand().cards)
+        if len(cards) == hand_size:
+            return float('-inf')  # Going out always wins
+
+        rank_str = cards[0].rank
+        if hand_size <= self.weights['endgame_hand_size'] and rank_str in (Rank.TWO, Rank.THREE):
+            return 0.0
+        if rank_str == Rank.TWO:
+            return self.weights['two_cost']
+        if rank_str == Rank.THREE:
+            return self.weights['three_cost']
+
+        held_of_rank = sum(1 for card in player.get_hand().cards if card.rank == rank_str)
+        return cards[0].get_value() + self.weights['break_set_penalty'] * (held_of_rank - len(cards))
+
+    def choose_play(self, game, player):
+        """
+        Returns the cards to play, or None to pass.
+        Never passes on an empty pile, where the engine requires a play.
+        """
+        legal_plays = game.get_legal_plays(player.player_id)
+        if not legal_plays:
+            return None
+
+        best_play = min(legal_plays, key=lambda cards: self.score_play(game, player, cards))
+        if game.pile and self.score_play(game, player, best_play) > self.weights['pass_threshold']:
+            return None
+        return best_play
+
+    def choose_interrupt_bid(self, game, player):
+        """Returns the cards to bid on the open interrupt, or None to pass on it."""
+        hand_cards = player.get_hand().cards
+        if game.interrupt_type == 'bomb_opportunity':
+            cards_needed = 4 - game.interrupt_initial_pile_count
+            matching = [card for card in hand_cards if card.get_value() == game.interrupt_rank]
+            if len(matching) >= cards_needed and self.rng.random() < self.weights['bomb_bid_probability']:
+                return matching[:cards_needed]
+        elif game.interrupt_type == 'three_play':
+            threes = [card for card in hand_cards if card.rank == Rank.THREE]
+            if threes and self.rng.random() < self.weights['three_bid_probability']:
+                return threes[:1]
+        return None
@@ -0,0 +1,55 @@
+import numpy as np
+
+from game_engine.bots.heuristic import DEFAULT_WEIGHTS
+from game_engine.rl.encoding import (
+    OBSERVATION_SIZE, ACTION_SIZE, PASS_ACTION, MAX_CARDS_PER_PLAY, HAND_OFFSET, INTERRUPT_OFFSET,
+    encode_action, rank_index,
+)
+
+# Added to every bid while the seat owes an interrupt response, so holding the cards means bidding.
+INTERRUPT_BID_BONUS = 100.0
+
+
+class LinearPolicy:
+    """
+    Batched policy: each action's score is a linear function of the encoded observation.
+    select_actions() picks the best legal action for every row of a batch in one call.
+    """
+
+    def __init__(self, weights, bias):
+        self.weights = np.asarray(weights, dtype=np.float32)  # (OBSERVATION_SIZE, ACTION_SIZE)
+        self.bias = np.asarray(bias, dtype=np.float32)        # (ACTION_SIZE,)
+        if self.weights.shape != (OBSERVATION_SIZE, ACTION_SIZE) or self.bias.shape != (ACTION_SIZE,):
+            raise ValueError("LinearPolicy weights must be (OBSERVATION_SIZE, ACTION_SIZE) and bias (ACTION_SIZE,).")
+
+    @classmethod
+    def from_heuristic(cls, heuristic_weights=None):
+        """
+        Builds the linear equivalent of HeuristicPolicy's play scoring (negated, so higher is better).
+        The going-out and endgame special cases of the heuristic are not linear and are left out.
+        """
+        h = dict(DEFAULT_WEIGHTS)
+        if heuristic_weights:
+            h.update(heuristic_weights)
+        weights = np.zeros((OBSERVATION_SIZE, ACTION_SIZE), dtype=np.float32)
+        bias = np.zeros(ACTION_SIZE, dtype=np.float32)
+        bias[PASS_ACTION] = -h['pass_threshold']
+        for rank_value in range(2, 15):
+            for count in range(1, MAX_CARDS_PER_PLAY + 1):
+                action = encode_action(rank_value, count)
+                weights[INTERRUPT_OFFSET, action] = INTERRUPT_BID_BONUS
+                if rank_value == 2:
+                    bias[action] = -h['two_cost']
+                elif rank_value == 3:
+                    bias[action] = -h['three_cost']
+                else:
+                    # value + penalty * (held - count), with `held` read from the hand counts
+                    bias[action] = -rank_value + h['break_set_penalty'] * count
+                    weights[HAND_OFFSET + rank_index(rank_value), action] = -h['break_set_penalty']
+        return cls(weights, bias)
+
+    def select_actions(self, observations, action_masks):
+        """Returns the highest-scoring legal action index for every row."""
+        scores = observations @ self.weights + self.bias
+        scores[~action_masks] = -np.inf
+        return np.argmax(scores, axis=1)
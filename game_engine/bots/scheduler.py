@@ -0,0 +1,251 @@
+import copy
+import random
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+from game_engine.bots.broker import pending_bot_decisions
+from game_engine.bots.heuristic import HeuristicPolicy
+from game_engine.bots.search import search_decision
+from game_engine.simulation import apply_decision
+
+
+class _BotRequest:
+    __slots__ = ('game', 'player', 'is_interrupt_response', 'state_hash', 'submitted_at', 'dispatched_at', 'future')
+
+    def __init__(self, game, player, is_interrupt_response, submitted_at):
+        self.game = game
+        self.player = player
+        self.is_interrupt_response = is_interrupt_response
+        self.state_hash = game.state_hash
+        self.submitted_at = submitted_at
+        self.dispatched_at = None
+        self.future = None
+
+    @property
+    def key(self):
+        return (self.game.room_code, self.player.player_id, self.is_interrupt_response)
+
+
+class BotComputeScheduler:
+    """
+    Shares a pool of search workers fairly between rooms under a global CPU budget.
+
+    Every bot move gets at most `time_slice` seconds of search in a worker
+    process. Worker time is paid for from a token bucket refilled at
+    `cpu_budget` worker-seconds per second, and each room has at most one search
+    in flight, served round-robin, so one room with slow bots cannot starve the
+    others. A move is decided by the cheap fallback policy instead whenever the
+    budget or the queue would make it wait longer than `max_wait`, or when its
+    search overruns its slice. pump() never blocks; call it from a background loop.
+    Moves are applied through `run_in_room(room_code, fn, *args)` when given, e.g.
+    a room command queue's non-blocking submit.
+    """
+
+    def __init__(self, max_workers=2, time_slice=0.25, cpu_budget=None, max_wait=None, degrade_queue_depth=None,
+                 fallback_policy=None, on_decision=None, executor=None, clock=time.monotonic, latency_window=1000,
+                 run_in_room=None):
+        self.max_workers = max_workers
+        self.time_slice = time_slice
+        self.cpu_budget = cpu_budget if cpu_budget is not None else float(max_workers)
+        self.max_wait = max_wait if max_wait is not None else time_slice
+        self.degrade_queue_depth = degrade_queue_depth if degrade_queue_depth is not None else 4 * max_workers
+        self.fallback_policy = fallback_policy if fallback_policy is not None else HeuristicPolicy()
+        self.on_decision = on_decision
+        self.run_in_room = run_in_room
+        self._executor = executor
+        self._clock = clock
+        self._queues = OrderedDict()  # room_code -> deque of waiting requests, in round-robin order
+        self._queued_keys = set()
+        self._in_flight = {}  # room_code -> dispatched request
+        self._abandoned = set()  # futures of overrun searches still holding a worker
+        self._applying = set()  # keys whose decided move is waiting on the room's queue
+        self._tokens = self.max_workers * self.time_slice
+        self._tokens_updated_at = clock()
+        self._seed = random.Random()
+        self._latencies = deque(maxlen=latency_window)
+        self.searched = 0
+        self.degraded = 0
+        self.stale = 0
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    @property
+    def queue_depth(self):
+        return sum(len(queue) for queue in self._queues.values())
+
+    def submit(self, game, player, is_interrupt_response):
+        """Queues a bot move. A seat that is already queued or being searched is not queued twice."""
+        request = _BotRequest(game, player, is_interrupt_response, self._clock())
+        in_flight = self._in_flight.get(game.room_code)
+        if (request.key in self._queued_keys or request.key in self._applying
+                or (in_flight is not None and in_flight.key == request.key)):
+            return
+        self._queued_keys.add(request.key)
+        self._queues.setdefault(game.room_code, deque()).append(request)
+
+    def collect(self, games):
+        for game in games:
+            for player, is_interrupt_response in pending_bot_decisions(game):
+                self.submit(game, player, is_interrupt_response)
+
+    def pump(self):
+        """Applies finished searches, degrades overdue work and dispatches what the budget allows."""
+        now = self._clock()
+        self._refill(now)
+        self._finish_searches(now)
+        self._degrade_overdue(now)
+        self._dispatch(now)
+
+    def run_forever(self, get_games, sleep=time.sleep, interval=0.01):
+        while True:
+            self.collect(get_games())
+            self.pump()
+            sleep(interval)
+
+    def _refill(self, now):
+        capacity = self.max_workers * self.time_slice
+        self._tokens = min(capacity, self._tokens + (now - self._tokens_updated_at) * self.cpu_budget)
+        self._tokens_updated_at = now
+
+    def _finish_searches(self, now):
+        self._abandoned = {future for future in self._abandoned if not future.done()}
+        for room_code, request in list(self._in_flight.items()):
+            if request.future.done():
+                del self._in_flight[room_code]
+                if request.future.cancelled() or request.future.exception() is not None:
+                    print(f"WARNING: Bot search failed in room {room_code}: {request.future.exception() if not request.future.cancelled() else 'cancelled'}")
+                    self._decide_with_fallback(request, now)
+                    continue
+                cards_data, _, cpu_seconds = request.future.result()
+                # Refund the part of the slice the search did not use.
+                self._tokens += max(0.0, self.time_slice - cpu_seconds)
+                self.searched += 1
+                self._apply(request, self._cards_from_data(request.player, cards_data), now)
+            elif now - request.dispatched_at > 2 * self.time_slice:
+                # The worker cannot be interrupted; stop waiting for it and answer cheaply.
+                # Until it finishes, its worker stays busy and counts against max_workers.
+                del self._in_flight[room_code]
+                if not request.future.cancel():
+                    self._abandoned.add(request.future)
+                self._decide_with_fallback(request, now)
+
+    def _degrade_overdue(self, now):
+        overloaded = self.queue_depth > self.degrade_queue_depth
+        for room_code, queue in list(self._queues.items()):
+            while queue and (overloaded or now - queue[0].submitted_at > self.max_wait):
+                request = queue.popleft()
+                self._queued_keys.discard(request.key)
+                self._decide_with_fallback(request, now)
+                overloaded = self.queue_depth > self.degrade_queue_depth
+            if not queue:
+                del self._queues[room_code]
+
+    def _dispatch(self, now):
+        for room_code in list(self._queues):
+            if len(self._in_flight) + len(self._abandoned) >= self.max_workers or self._tokens < self.time_slice:
+                return
+            if room_code in self._in_flight:
+                continue
+            queue = self._queues.pop(room_code)
+            request = queue.popleft()
+            self._queued_keys.discard(request.key)
+            if queue:
+                self._queues[room_code] = queue  # Back of the round-robin line
+            if not self._is_current(request):
+                self.stale += 1
+                continue
+            try:
+                request.future = self._get_executor().submit(
+                    search_decision, copy.deepcopy(request.game), request.player.player_id,
+                    request.is_interrupt_response, self.time_slice, self._seed.getrandbits(32)
+                )
+            except Exception as e:
+                print(f"WARNING: Could not schedule bot search for room {room_code}: {e}")
+                self._decide_with_fallback(request, now)
+                continue
+            request.dispatched_at = now
+            self._tokens -= self.time_slice
+            self._in_flight[room_code] = request
+
+    def _decide_with_fallback(self, request, now):
+        if not self._is_current(request):
+            self.stale += 1
+            return
+        game, player = request.game, request.player
+        if request.is_interrupt_response:
+            cards = self.fallback_policy.choose_interrupt_bid(game, player)
+        else:
+            cards = self.fallback_policy.choose_play(game, player)
+        self.degraded += 1
+        self._apply(request, cards, now)
+
+    def _apply(self, request, cards, now):
+        # The seat stays reserved until the move lands, so collect() does not decide it a second time meanwhile.
+        self._applying.add(request.key)
+        if self.run_in_room is not None:
+            try:
+                self.run_in_room(request.game.room_code, self._apply_now, request, cards, now)
+            except Exception as e:
+                # E.g. the room was deleted since the seat was collected.
+                print(f"WARNING: Could not queue bot move in room {request.game.room_code}: {e}")
+                self._applying.discard(request.key)
+        else:
+            self._apply_now(request, cards, now)
+
+    def _apply_now(self, request, cards, now):
+        try:
+            if not self._is_current(request):
+                self.stale += 1
+                return
+            apply_decision(request.game, request.player, request.is_interrupt_response, cards)
+        except ValueError as e:
+            print(f"WARNING: Bot {request.player.name} in room {request.game.room_code} could not act: {e}")
+            return
+        finally:
+            self._applying.discard(request.key)
+        self._latencies.append(now - request.submitted_at)
+        if self.on_decision is not None:
+            self.on_decision(request.game)
+
+    @staticmethod
+    def _is_current(request):
+        if request.game.state_hash != request.state_hash:
+            return False
+        return any(p is request.player and i == request.is_interrupt_response
+                   for p, i in pending_bot_decisions(request.game))
+
+    @staticmethod
+    def _cards_from_data(player, cards_data):
+        if not cards_data:
+            return None
+        ids = {card['id'] for card in cards_data}
+        return [card for card in player.get_hand().cards if card.id in ids]
+
+    def metrics(self):
+        """Queue depth, in-flight searches, decision counts and per-decision latency percentiles (ms)."""
+        latencies = sorted(self._latencies)
+
+        def percentile(fraction):
+            if not latencies:
+                return None
+            return round(1000.0 * latencies[min(len(latencies) - 1, int(fraction * len(latencies)))], 2)
+
+        return {
+            'queue_depth': self.queue_depth,
+            'in_flight': len(self._in_flight),
+            'abandoned': len(self._abandoned),
+            'searched': self.searched,
+            'degraded': self.degraded,
+            'stale': self.stale,
+            'cpu_tokens': round(self._tokens, 3),
+            'latency_ms': {'p50': percentile(0.5), 'p95': percentile(0.95), 'max': percentile(1.0)},
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,60 @@
+import random
+import time
+
+from game_engine.bots.heuristic import HeuristicPolicy
+from game_engine.simulation import apply_decision, run_headless_game, finishing_reward, quiet_engine
+from game_engine.win_probability import determinize
+
+
+def candidate_moves(game, player, is_interrupt_response):
+    """Lists the moves worth searching: each legal play (or the bid) plus passing where passing is allowed."""
+    if is_interrupt_response:
+        # A bid-always heuristic proposes the only bid shape that can succeed.
+        bid = HeuristicPolicy(weights={'bomb_bid_probability': 1.0, 'three_bid_probability': 1.0}).choose_interrupt_bid(game, player)
+        return [None, bid] if bid else [None]
+    moves = list(game.get_legal_plays(player.player_id))
+    if game.pile or not moves:
+        moves.append(None)
+    return moves
+
+
+def search_decision(game, player_id, is_interrupt_response, time_limit, seed, weights=None):
+    """
+    Flat Monte Carlo search for one decision, run inside a worker process.
+
+    Each candidate move is tried in determinized copies of the game, which are
+    then played out by HeuristicPolicy. Candidates take turns so that stopping
+    at `time_limit` (checked between rollouts) still leaves comparable sample
+    counts. Returns (cards_data or None, rollouts, cpu_seconds).
+    """
+    started_cpu = time.process_time()
+    deadline = time.monotonic() + time_limit
+    rng = random.Random(seed)
+    policy = HeuristicPolicy(weights=weights, rng=rng)
+    player = game.get_player_by_id(player_id)
+    candidates = candidate_moves(game, player, is_interrupt_response)
+    totals = [0.0] * len(candidates)
+    counts = [0] * len(candidates)
+
+    with quiet_engine():
+        while len(candidates) > 1 and time.monotonic() < deadline:
+            for index, move in enumerate(candidates):
+                sample = determinize(game, rng, viewer_id=player_id)
+                sample_player = sample.get_player_by_id(player_id)
+                cards = [card for card in sample_player.get_hand().cards if card in move] if move else None
+                try:
+                    apply_decision(sample, sample_player, is_interrupt_response, cards)
+                except ValueError:
+                    totals[index] = float('-inf')  # The engine rejects this move outright
+                else:
+                    run_headless_game(sample, policy)
+                    totals[index] += finishing_reward(sample, player_id)
+                counts[index] += 1
+
+    if len(candidates) == 1:
+        best = candidates[0]
+    else:
+        best = max(range(len(candidates)), key=lambda i: totals[i] / counts[i] if counts[i] else float('-inf'))
+        best = candidates[best]
+    cards_data = [card.to_dict() for card in best] if best else None
+    return cards_data, sum(counts), time.process_time() - started_cpu
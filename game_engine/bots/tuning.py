@@ -0,0 +1,225 @@
+import argparse
+import json
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from game_engine.bots.heuristic import HeuristicPolicy, DEFAULT_WEIGHTS
+from game_engine.simulation import create_simulated_game, run_headless_game, finishing_reward
+
+CANDIDATE_SEAT = "bot-1"
+CONFIDENCE_Z = 1.96  # 95% normal-approximation intervals
+
+# Search range of every tunable weight: (low, high, is_integer).
+PARAMETER_BOUNDS = {
+    'two_cost': (0.0, 30.0, False),
+    'three_cost': (0.0, 30.0, False),
+    'break_set_penalty': (0.0, 10.0, False),
+    'pass_threshold': (0.0, 30.0, False),
+    'endgame_hand_size': (0, 13, True),
+    'bomb_bid_probability': (0.0, 1.0, False),
+    'three_bid_probability': (0.0, 1.0, False),
+}
+
+
+def play_evaluation_games(weights, seeds, num_players=4):
+    """
+    Plays one game per seed with `weights` in the candidate seat and default bots everywhere else.
+    Returns the candidate's finishing reward for each seed, in order. Runs inside pool workers.
+    """
+    rewards = []
+    for seed in seeds:
+        game = create_simulated_game(num_players, seed=seed)
+        # Every seat gets an rng seeded from the deal, so all candidates face the same luck.
+        policies = {p.player_id: HeuristicPolicy(rng=random.Random(seed)) for p in game.players}
+        policies[CANDIDATE_SEAT] = HeuristicPolicy(weights=weights, rng=random.Random(seed))
+        run_headless_game(game, policies)
+        rewards.append(finishing_reward(game, CANDIDATE_SEAT))
+    return rewards
+
+
+def summarize(rewards, baseline_rewards):
+    """
+    Mean reward with a confidence interval, plus the paired advantage over the default
+    weights on the same deals. Pairing removes most of the deal-to-deal variance.
+    """
+    games = len(rewards)
+    mean = sum(rewards) / games
+    differences = [r - b for r, b in zip(rewards, baseline_rewards)]
+    advantage = sum(differences) / games
+    return {
+        'games': games,
+        'mean_reward': mean,
+        'mean_reward_ci': _half_width(rewards, mean),
+        'advantage': advantage,
+        'advantage_ci': _half_width(differences, advantage),
+    }
+
+
+def _half_width(values, mean):
+    if len(values) < 2:
+        return float('inf')
+    variance = sum((v - mean) ** 2 for v in values) / (len(values) - 1)
+    return CONFIDENCE_Z * math.sqrt(variance / len(values))
+
+
+def mutate(weights, rng, scale):
+    """Returns a copy of the weights with every parameter jittered by scale * its range, clipped to bounds."""
+    child = dict(weights)
+    for name, (low, high, is_integer) in PARAMETER_BOUNDS.items():
+        value = child[name] + rng.gauss(0.0, scale * (high - low))
+        value = min(high, max(low, value))
+        child[name] = int(round(value)) if is_integer else value
+    return child
+
+
+class TournamentTuner:
+    """
+    Evolutionary search over HeuristicPolicy weights.
+
+    Each generation every candidate plays the same freshly drawn deals against
+    default bots, so candidates are compared on common random numbers. The games
+    are cut into small tasks and all of them are queued on the process pool at
+    once, which keeps every core busy until the generation is done. The best
+    `elite_count` candidates survive and the rest of the next population are
+    their mutants. A JSON checkpoint is written after every generation and
+    picked up again if the tuner is restarted with the same path.
+    """
+
+    def __init__(self, population_size=16, elite_count=4, games_per_candidate=2000, games_per_task=50,
+                 num_players=4, mutation_scale=0.1, max_workers=None, checkpoint_path=None, seed=0,
+                 executor=None):
+        if not 0 < elite_count <= population_size:
+            raise ValueError("elite_count must be between 1 and population_size.")
+        self.population_size = population_size
+        self.elite_count = elite_count
+        self.games_per_candidate = games_per_candidate
+        self.games_per_task = games_per_task
+        self.num_players = num_players
+        self.mutation_scale = mutation_scale
+        self.max_workers = max_workers or os.cpu_count()
+        self.checkpoint_path = checkpoint_path
+        self._executor = executor
+        self._owns_executor = executor is None
+        self.rng = random.Random(seed)
+        self.generation = 0
+        self.history = []  # Per generation: the summarized results, best first
+        self.population = self._initial_population()
+        if checkpoint_path and os.path.exists(checkpoint_path):
+            self.load_checkpoint()
+
+    def _initial_population(self):
+        population = [dict(DEFAULT_WEIGHTS)]
+        while len(population) < self.population_size:
+            population.append(mutate(DEFAULT_WEIGHTS, self.rng, self.mutation_scale * 2))
+        return population
+
+    def run(self, generations):
+        """Runs until `generations` generations are complete. Returns the last generation's results, best first."""
+        try:
+            while self.generation < generations:
+                results = self.evaluate(self.population)
+                self.history.append(results)
+                self.generation += 1
+                self.population = self._next_population(results)
+                if self.checkpoint_path:
+                    self.save_checkpoint()
+                print(f"Generation {self.generation}/{generations}:\n{format_report(results, top=3)}")
+        finally:
+            if self._owns_executor and self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+        return self.history[-1] if self.history else []
+
+    def evaluate(self, candidates):
+        """Plays every candidate and the default weights on one shared set of deals and summarizes them, best first."""
+        seeds = [self.rng.getrandbits(32) for _ in range(self.games_per_candidate)]
+        blocks = [seeds[i:i + self.games_per_task] for i in range(0, len(seeds), self.games_per_task)]
+        entrants = [dict(DEFAULT_WEIGHTS)] + list(candidates)
+
+        executor = self._get_executor()
+        futures = [[executor.submit(play_evaluation_games, weights, block, self.num_players) for block in blocks]
+                   for weights in entrants]
+        rewards = [[reward for future in candidate_futures for reward in future.result()]
+                   for candidate_futures in futures]
+
+        baseline = rewards[0]
+        results = [dict(summarize(candidate_rewards, baseline), weights=weights)
+                   for weights, candidate_rewards in zip(candidates, rewards[1:])]
+        results.sort(key=lambda result: result['advantage'], reverse=True)
+        return results
+
+    def _next_population(self, results):
+        elites = [result['weights'] for result in results[:self.elite_count]]
+        population = [dict(weights) for weights in elites]
+        while len(population) < self.population_size:
+            population.append(mutate(self.rng.choice(elites), self.rng, self.mutation_scale))
+        return population
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def save_checkpoint(self):
+        version, internal_state, gauss_next = self.rng.getstate()
+        checkpoint = {
+            'generation': self.generation,
+            'population': self.population,
+            'history': self.history,
+            'rng_state': [version, list(internal_state), gauss_next],
+        }
+        with open(self.checkpoint_path + ".tmp", 'w') as f:
+            json.dump(checkpoint, f)
+        os.replace(self.checkpoint_path + ".tmp", self.checkpoint_path)
+
+    def load_checkpoint(self):
+        with open(self.checkpoint_path) as f:
+            checkpoint = json.load(f)
+        self.generation = checkpoint['generation']
+        self.population = checkpoint['population']
+        self.history = checkpoint['history']
+        version, internal_state, gauss_next = checkpoint['rng_state']
+        self.rng.setstate((version, tuple(internal_state), gauss_next))
+        print(f"Resumed tuning from {self.checkpoint_path} at generation {self.generation}.")
+
+
+def format_report(results, top=5):
+    """Formats the best results as one line each: advantage over the defaults, mean reward and weights."""
+    lines = []
+    for place, result in enumerate(results[:top], start=1):
+        weights = ", ".join(f"{name}={value:.2f}" if isinstance(value, float) else f"{name}={value}"
+                            for name, value in result['weights'].items())
+        lines.append(
+            f"  #{place}: advantage {result['advantage']:+.3f} ± {result['advantage_ci']:.3f}, "
+            f"mean reward {result['mean_reward']:+.3f} ± {result['mean_reward_ci']:.3f} "
+            f"over {result['games']} games ({weights})"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tune HeuristicPolicy weights with simulated tournaments.")
+    parser.add_argument('--generations', type=int, default=20)
+    parser.add_argument('--population', type=int, default=16)
+    parser.add_argument('--elites', type=int, default=4)
+    parser.add_argument('--games', type=int, default=2000, help="Games per candidate per generation")
+    parser.add_argument('--games-per-task', type=int, default=50)
+    parser.add_argument('--players', type=int, default=4)
+    parser.add_argument('--workers', type=int, default=None, help="Defaults to every core")
+    parser.add_argument('--checkpoint', default="tuning_checkpoint.json")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    tuner = TournamentTuner(
+        population_size=args.population, elite_count=args.elites, games_per_candidate=args.games,
+        games_per_task=args.games_per_task, num_players=args.players, max_workers=args.workers,
+        checkpoint_path=args.checkpoint, seed=args.seed,
+    )
+    results = tuner.run(args.generations)
+    print(f"Best weights after {tuner.generation} generations:\n{format_report(results)}")
+
+
+if __name__ == "__main__":
+    main()
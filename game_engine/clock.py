@@ -0,0 +1,33 @@
+import time
+
+
+class WallClock:
+    """Real time, in seconds since the epoch. The default clock for live games."""
+
+    def now(self):
+        return time.time()
+
+
+class ManualClock:
+    """
+    A clock that only moves when told to, for simulations and tests.
+    Timed rules such as the bomb window can then be expired instantly by
+    advancing the clock instead of sleeping.
+    """
+
+    def __init__(self, start=0.0):
+        self._now = float(start)
+
+    def now(self):
+        return self._now
+
+    def advance(self, seconds):
+        if seconds < 0:
+            raise ValueError("A clock cannot go backwards.")
+        self._now += seconds
+        return self._now
+
+    def set(self, timestamp):
+        if timestamp < self._now:
+            raise ValueError("A clock cannot go backwards.")
+        self._now = float(timestamp)
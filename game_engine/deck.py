@@ -14,8 +14,8 @@ class Deck:
         ]
         return [Card(suit, rank) for suit in suits for rank in ranks]
     
-    def shuffle(self):
-        random.shuffle(self.cards)
+    def shuffle(self, rng=None):
+        (rng or random).shuffle(self.cards)
 
     def deal_card(self):
         if self.cards:
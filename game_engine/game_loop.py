@@ -1,6 +1,6 @@
 import sys
 
-from .card import Card
+from .card import Card, Rank, Suit
 from .game_state import GameState
 
 class GameLoop:
@@ -81,61 +81,40 @@ class GameLoop:
 
     def parse_card_input(self, player, card_input):
         print(f"{player.name}'s hand: {[str(card) for card in player.hand.cards]}")
-        cards = []
-        card_strings = card_input.split()
-        if not card_strings:
+        if not card_input.split():
             print("You must enter cards to play or 'Pass'.")
             return []
+        return parse_cards(player.hand.cards, card_input)
 
-        for card_str in card_strings:
-            print(f"Processing card string: {card_str}")  # Debug print
-            if len(card_str) >= 2:
-                suit_char = card_str[0].upper()
-                rank_str = card_str[1:]
-                suit = None
-                rank = None
-                print(f"  Suit char: {suit_char}, Rank str: {rank_str}") # Debug print
-                if suit_char == 'S':
-                    suit = "Spades"
-                    print(f"  Suit: {suit}") # Debug print
-                elif suit_char == 'H':
-                    suit = "Hearts"
-                    print(f"  Suit: {suit}") # Debug print
-                elif suit_char == 'D':
-                    suit = "Diamonds"
-                    print(f"  Suit: {suit}") # Debug print
-                elif suit_char == 'C':
-                    suit = "Clubs"
-                    print(f"  Suit: {suit}") # Debug print
-                else:
-                    raise ValueError(f"Invalid suit: {suit_char}")
 
-                try:
-                    rank = int(rank_str)
-                    print(f"  Rank: {rank}") # Debug print                    
-                    if not 2 <= rank <= 10 and rank not in [11, 12, 13, 14]:
-                        raise ValueError(f"Invalid rank: {rank_str}")
-                except ValueError:
-                    if rank_str == 'J':
-                        rank = 11
-                    elif rank_str == 'Q':
-                        rank = 12
-                    elif rank_str == 'K':
-                        rank = 13
-                    elif rank_str == 'A':
-                        rank = 14
-                    else:
-                        raise ValueError(f"Invalid rank: {rank_str}")
+_RANK_ALIASES = {'11': Rank.JACK, '12': Rank.QUEEN, '13': Rank.KING, '14': Rank.ACE, '1': Rank.ACE}
 
-                card = Card(suit, rank)
-                if not player.has_card(card):
-                    raise ValueError(f"You don't have the card: {card}")
-                cards.append(card)
-            else:
-                raise ValueError(f"Invalid card format: {card_str}")
 
-        # Basic validation: all played cards must be the same rank
-        if cards and not all(card.rank == cards[0].rank for card in cards):
-            raise ValueError("All played cards must be of the same rank.")
+def parse_cards(hand_cards, card_input):
+    """
+    Parses typed cards such as "S3 H3 D3" (suit letter, then rank) into the matching
+    Card objects from `hand_cards`, so their IDs can be sent to the engine.
+    Ranks may be written 2-10, J/Q/K/A or 11-14.
+    """
+    cards = []
+    remaining = list(hand_cards)
+    for card_str in card_input.upper().split():
+        if len(card_str) < 2:
+            raise ValueError(f"Invalid card format: {card_str}")
+        suit = card_str[0]
+        rank = _RANK_ALIASES.get(card_str[1:], card_str[1:])
+        if suit not in Suit.ALL_SUITS:
+            raise ValueError(f"Invalid suit: {suit}")
+        if rank not in Rank.all_ranks():
+            raise ValueError(f"Invalid rank: {card_str[1:]}")
+        held = next((card for card in remaining if card.suit == suit and card.rank == rank), None)
+        if held is None:
+            raise ValueError(f"You don't have the card: {Card(suit, rank)}")
+        remaining.remove(held)
+        cards.append(held)
+
+    # Basic validation: all played cards must be the same rank
+    if cards and not all(card.rank == cards[0].rank for card in cards):
+        raise ValueError("All played cards must be of the same rank.")
 
-        return cards
\ No newline at end of file
+    return cards
@@ -1,21 +1,49 @@
 import random
-import time
 from game_engine.card import Card, Rank, Suit
 from game_engine.game_loop import GameLoop
 from game_engine.game_state import GameState
 from game_engine.player import Player
-from game_engine.deck import Deck
+from game_engine.clock import WallClock
+from game_engine.rules import DEFAULT_RULES, CLEAR, THREES, STANDARD
+from game_engine.history import recorded_action
+from game_engine.zobrist import zobrist_keys, HashedAttribute, PILE, DISCARD
 class AssholeGame(GameState):
 
-
-    def __init__(self, room_code=None, host_id=None, game_type="asshole"):
+    # Attributes folded into state_hash on every assignment (turn and pile changes).
+    current_player_index = HashedAttribute()
+    current_play_rank = HashedAttribute()
+    current_play_count = HashedAttribute()
+    consecutive_passes = HashedAttribute()
+    interrupt_type = HashedAttribute()
+    HASHED_ATTRIBUTES = ('current_player_index', 'current_play_rank', 'current_play_count', 'consecutive_passes', 'interrupt_type')
+
+    def __init__(self, room_code=None, host_id=None, game_type="asshole", clock=None, rules=None, ledger=None, rng=None):
+        # Incremental Zobrist hash of the game state; must exist before any hashed attribute is set.
+        self.state_hash = 0
+        self._pile_clear_delta = 0
+        # Bumped whenever cards go onto or come off the pile, so callers can cache pile-derived data.
+        self.pile_version = 0
         super(AssholeGame, self).__init__()
         self.room_code = room_code
         self.host_id = host_id
         self.game_type = game_type
+        # Source of time for interrupt windows; swap in a ManualClock to fast-forward timers.
+        self.clock = clock if clock is not None else WallClock()
+        # Source of randomness for the deck, seats and a random first player; None uses the random module.
+        self.rng = rng
         self.status = "WAITING" if room_code else "CLI_MODE"
-        self.deck = Deck()
-        self.special_card_rules = True
+        # GameState built the deck; its 52 cards are reused for every round of the match.
+        self._all_cards = list(self.deck.cards)
+        self.round_number = 0
+        self.last_exchange = []
+        # House rules, compiled into a rank -> handler table for play_cards.
+        self.rules = rules if rules is not None else DEFAULT_RULES
+        self._play_handlers = self._dispatch_table(self.rules)
+        self.special_card_rules = self.rules.has_special_cards
+        # Optional CardLedger that checks every card move; None costs nothing.
+        self.ledger = ledger
+        # Optional GameHistory (see GameHistory.attach) for rebuilding past states.
+        self.history = None
         self.MIN_PLAYERS = 4
         self.MAX_PLAYERS = 10        
         self.player_went_out = 0
@@ -29,6 +57,7 @@ class AssholeGame(GameState):
         self.cards_of_rank_played = {rank: 0 for rank in range(2, 15)}
         self.game_message = "Waiting for players to join..."
         self.last_played_cards = []
+        self.discard_pile = []
         self.current_play_rank = None
         self.current_play_count = 0
         self.round_leader_player_id = None
@@ -49,6 +78,17 @@ class AssholeGame(GameState):
             self.status = "CLI_MODE"
             print("AssholeGame initialized in CLI/direct setup mode.")
 
+    def __getstate__(self):
+        # Copies and snapshots of a game (deepcopy, pickling for workers, history
+        # checkpoints) leave its ledger and history behind.
+        state = self.__dict__.copy()
+        state['ledger'] = None
+        state['history'] = None
+        return state
+
+    add_player = recorded_action(GameState.add_player)
+
+    @recorded_action
     def start_game(self):
         """
         Initializes and starts a new round of Asshole.
@@ -56,10 +96,45 @@ class AssholeGame(GameState):
         """
         super().start_game()
 
-        self.deck = Deck()
-        self.deck.shuffle()
+        self._collect_cards()
+        self.deck.shuffle(self.rng)
+
+        # Randomize who sits next to each other in game order
+        (self.rng or random).shuffle(self.players)
+
+        self._deal_round()
+
+    @recorded_action
+    def start_next_round(self):
+        """
+        Starts another round of a match once the current one is over. Seats stay
+        where they are and the same card objects and hands are reused. When the
+        rules ask for it, the Asshole and President (and, with four or more
+        players, the Vice Asshole and Vice President) exchange cards first.
+        """
+        if self.round_number == 0:
+            raise ValueError("The first round of a match must be started with start_game.")
+        if not self.is_game_over:
+            raise ValueError("The current round is still being played.")
+        standings = self.get_finishing_order()
+        super().start_game()
+
+        self._collect_cards()
+        self.deck.shuffle(self.rng)
+        self._deal_round(standings if self.rules.card_exchange else None)
+
+    def _collect_cards(self):
+        """Gathers the game's 52 cards back into the deck in their original order, without creating new ones."""
         for player in self.players:
             player.hand.clear()
+        self.pile.clear()
+        self.discard_pile.clear()
+        self.deck.cards[:] = self._all_cards
+
+    def _deal_round(self, exchange_standings=None):
+        """Resets the per-round state and deals the deck to the seats in their current order."""
+        self.round_number += 1
+        for player in self.players:
             player.is_active = True
             player.is_out = False
             player.rank = None
@@ -69,7 +144,7 @@ class AssholeGame(GameState):
         self.should_skip_next_player = False
         self.pile_cleared_this_turn = False
         self.player_went_out = 0
-        self.pile = []
+        self.pile_version += 1
         self.current_play_count = 0 
         self.current_play_rank = None
         self.consecutive_passes = 0
@@ -84,14 +159,9 @@ class AssholeGame(GameState):
         self.cards_of_rank_played = {rank_str: 0 for rank_str in Rank.all_ranks()}
         self.rankings = {}
 
-        # Randomize who sits next to each other in game order
-        random.shuffle(self.players)
-
-        for player in self.players:
-            player.is_active = True
-
         # Deal all the cards
         self.deal_all_cards()
+        self.last_exchange = self._exchange_cards(exchange_standings) if exchange_standings else []
 
         # Determine starting player by Ace of Spades
         self.current_player_index = self.determine_starting_player()
@@ -103,7 +173,7 @@ class AssholeGame(GameState):
         else:
             self.game_message = "Game started, but could not determine first player's turn (Ace of Spades not found or no active players)." 
             if self.players:
-                self.current_player_index = random.randint(0, len(self.players) - 1)
+                self.current_player_index = (self.rng or random).randint(0, len(self.players) - 1)
                 start_player = self.players[self.current_player_index]
                 self.game_message = f"Game started! Ace of Spades, {start_player.name} starts randomly."
                 self.round_leader_player_id = start_player.player_id
@@ -114,18 +184,66 @@ class AssholeGame(GameState):
         self.players_who_passed_this_round = set()
         self.round_active_players = [p.player_id for p in self.players if p.is_active and not p.is_out]
 
+        # Seats may have been reshuffled and every card was redealt, so seed the incremental hash from scratch.
+        self._pile_clear_delta = 0
+        self.state_hash = self.compute_state_hash()
+        if self.ledger is not None:
+            self.ledger.reset(self)
+
         print(f"DEBUG: Game started! First player: {self.get_current_player().name if self.get_current_player() else 'N/A'}")
 
+    def _exchange_strength(self, card):
+        # The clear card beats everything, then 3s (when they are special), then rank order.
+        rank_kind = self.rules.rank_kinds[card.rank]
+        return (rank_kind == CLEAR, rank_kind == THREES, card.get_value())
+
+    def _exchange_cards(self, standings):
+        """
+        Traditional exchange after a round: the Asshole hands their two best cards to the
+        President and gets the President's two worst back; with four or more players the
+        Vice Asshole and Vice President swap one card the same way. Seats whose player has
+        left are skipped. Returns the exchanges made.
+        """
+        pairs = [(standings[0], standings[-1], 2)]
+        if len(standings) >= 4:
+            pairs.append((standings[1], standings[-2], 1))
+
+        exchanges = []
+        for top_id, bottom_id, count in pairs:
+            top, bottom = self.get_player_by_id(top_id), self.get_player_by_id(bottom_id)
+            if not top or not bottom:
+                continue
+            tribute = sorted(bottom.hand.cards, key=self._exchange_strength, reverse=True)[:count]
+            returned = sorted(top.hand.cards, key=self._exchange_strength)[:count]
+            for card in tribute:
+                bottom.hand.remove_card(card)
+                top.hand.add_card(card)
+            for card in returned:
+                top.hand.remove_card(card)
+                bottom.hand.add_card(card)
+            exchanges.append({'from_player_id': bottom_id, 'to_player_id': top_id, 'cards': tribute})
+            exchanges.append({'from_player_id': top_id, 'to_player_id': bottom_id, 'cards': returned})
+        return exchanges
+
+    def get_finishing_order(self):
+        """
+        Returns player IDs from President to Asshole.
+        Players who never went out are ordered by cards left, fewest first.
+        """
+        return [p.player_id for p in sorted(
+            self.players,
+            key=lambda p: (p.rank if p.rank is not None else float('inf'), len(p.get_hand().cards))
+        )]
+
     # Create a method to deal all the cards to players
     def deal_all_cards(self):
         """Deals all the cards from the deck to the players in a round-robin fashion."""
         self.number_of_players = len(self.players)
         player_index = 0
-        while len(self.deck) > 0:
-            card_to_deal = self.deck.deal_card()
-            if card_to_deal:
-                self.players[player_index].hand.add_card(card_to_deal)
-                player_index = (player_index + 1) % self.number_of_players
+        for card_to_deal in self.deck.cards:
+            self.players[player_index].hand.add_card(card_to_deal)
+            player_index = (player_index + 1) % self.number_of_players
+        self.deck.cards.clear()
 
     # Create a method that determines the starting player
     def determine_starting_player(self):
@@ -143,7 +261,14 @@ class AssholeGame(GameState):
         return 0
 
     def clear_pile(self):
+        if self.ledger is not None:
+            for card in self.pile:
+                self.ledger.move(card, PILE, DISCARD, "clear_pile")
+        self.discard_pile.extend(self.pile)
         self.pile = []
+        self.pile_version += 1
+        self.state_hash ^= self._pile_clear_delta
+        self._pile_clear_delta = 0
         self.current_play_rank = None
         self.current_play_count = 0
         self.consecutive_passes = 0
@@ -175,132 +300,156 @@ class AssholeGame(GameState):
             return True
         return False
 
+    def _add_cards_to_pile(self, cards, from_seat, event="play"):
+        """
+        Puts cards taken from a seat's hand onto the pile, folding each move into state_hash.
+        With a ledger attached, each move is also checked against it.
+        """
+        if self.ledger is not None:
+            for card in cards:
+                self.ledger.move(card, from_seat, PILE, event)
+            self.ledger.check_count(from_seat, len(self.players[from_seat].get_hand().cards), event)
+        self.pile.extend(cards)
+        self.pile_version += 1
+        for card in cards:
+            self.state_hash ^= zobrist_keys.move_key(card, from_seat, PILE)
+            # Pre-accumulate the pile -> discard move so clear_pile is a single XOR.
+            self._pile_clear_delta ^= zobrist_keys.move_key(card, PILE, DISCARD)
+
+    def _move_cards_to_pile(self, player, cards):
+        """Removes cards from the player's hand and puts them on the pile."""
+        player.play_cards(cards)
+        self._add_cards_to_pile(cards, self.players.index(player))
+
+    def _set_player_active(self, player, is_active):
+        """Sets a player's active flag, folding a seat-out change into state_hash."""
+        if player.is_active != is_active:
+            self.state_hash ^= zobrist_keys.seat_out_key(self.players.index(player))
+        player.is_active = is_active
+
+    def compute_state_hash(self):
+        """
+        Recomputes the Zobrist state hash from scratch.
+        The engine keeps state_hash up to date incrementally; this full scan is only
+        used to seed it at the start of a round and to verify it (e.g. in tests or replays).
+        """
+        state_hash = 0
+        for seat, player in enumerate(self.players):
+            for card in player.get_hand().cards:
+                state_hash ^= zobrist_keys.card_key(card, seat)
+            if not player.is_active:
+                state_hash ^= zobrist_keys.seat_out_key(seat)
+        for card in self.pile:
+            state_hash ^= zobrist_keys.card_key(card, PILE)
+        for card in self.discard_pile:
+            state_hash ^= zobrist_keys.card_key(card, DISCARD)
+        for name in self.HASHED_ATTRIBUTES:
+            state_hash ^= zobrist_keys.attribute_key(name, getattr(self, name))
+        return state_hash
+
+    @recorded_action
     def play_cards(self, player_id, cards_to_play_data):
         """
         Overrides the play_turn method in GameState to implement Asshole-specific rules.
+        The rank played picks its handler from the dispatch table compiled from self.rules.
         """
+        # Every rejection happens here, before anything is mutated.
+        cards_to_play = self.validate_play(player_id, cards_to_play_data)
         player = self.get_player_by_id(player_id)
-        if not player:
-            raise ValueError("Player not found in this game.")    
-        
-        # Basic turn validation
-        if player_id != self.get_current_player_id():
-            raise ValueError("It's not this player's turn.")
-        if not player.is_active:
-            raise ValueError("This player is out of the game and cannot play.")
+        self._play_handlers[cards_to_play[0].rank](self, player, cards_to_play)
 
-        cards_to_play = [Card(c['suit'], c['rank'], id=c.get('id')) for c in cards_to_play_data]
-        
-        if not cards_to_play:
-            raise ValueError("No cards selected to play.")        
-        
-        # --- Basic checks (player's turn, has cards) ---
-        current_player = self.get_current_player()
-        if current_player != player:
-            raise ValueError("It's not this player's turn.")
-        
-        # Check if player has the cards in their hand
-        for card_to_play in cards_to_play:
-            if card_to_play not in player.get_hand().cards:
-                raise ValueError(f"{player.name} does not have the card {card_to_play} in their hand.")
+    def _play_clear_card(self, player, cards_to_play):
+        # --- Rule 1: The clearing card (2s unless the room's rules say otherwise) ---
+        played_count = len(cards_to_play)
+        self._move_cards_to_pile(player, cards_to_play)
+        self.last_played_cards = cards_to_play
+        self.clear_pile()
+        self.current_player_index = self.players.index(player)
 
-        # Ensure all cards played are of the same rank
-        if len(cards_to_play) > 1 and not all(card.rank == cards_to_play[0].rank for card in cards_to_play):
-            raise ValueError("All cards played must be of the same rank.")
-        
+        self.current_play_rank = None # Reset pile state
+        self.current_play_count = 0   # Reset pile state
+        self.consecutive_passes = 0 # Reset passes after a play
+
+        self.game_message = f"{player.name} cleared the pile with {played_count} {Card.get_rank_display(cards_to_play[0].rank)}(s)! New round starts with them."
+
+    def _play_threes(self, player, cards_to_play):
+        # --- Rule 2: Handle 3 plays (Initiates Interrupt) ---
+        player_id = player.player_id
         played_rank_str = cards_to_play[0].rank
         played_rank_value = cards_to_play[0].get_value()
         played_count = len(cards_to_play)
 
-        # --- Handle Active Interrupts (players must use submit_interrupt_bid to respond) ---
-        if self.interrupt_active:
-            raise ValueError("An interrupt is currently active. Please use 'submit_interrupt_bid' to respond or pass.")
-
-        skip_triggered_by_this_play = False
-
-        # --- Rule 1: Handle 2s (Clearing Card) ---
-        if played_rank_str == Rank.TWO:
-            player.play_cards(cards_to_play)
-            self.pile.extend(cards_to_play)
+        if played_count == 2:
+            # Rule: Playing exactly two 3s always clears the pile
+            self._move_cards_to_pile(player, cards_to_play)
             self.last_played_cards = cards_to_play
-            self.clear_pile()
-            self.current_player_index = self.players.index(player)
-
-            self.current_play_rank = None # Reset pile state
-            self.current_play_count = 0   # Reset pile state
-            self.consecutive_passes = 0 # Reset passes after a play
+            self.clear_pile() # Clears pile, resets all pile-related state
+            self.current_player_index = self.players.index(player) # Player who cleared goes again
+            self.consecutive_passes = 0
+            self.game_message = f"{player.name} played two {played_rank_str}s and cleared the pile! New round starts with them."
+            self.should_skip_next_player = False # No skip after a clear
+            
+            # If there was an active 3-play interrupt, it's resolved by this clear.
+            # This could happen if someone initiated a 3-play (1x3), then next player played 2x3.
+            if self.interrupt_active and self.interrupt_type == 'three_play':
+                self.resolve_interrupt(winning_player_id=player_id) 
+            return # Turn handled, exit play_cards
+
+        elif played_count == 1:
+            # Rule: Playing a single 3
+            
+            # Record the play (remove from hand, add to pile)
+            self._move_cards_to_pile(player, cards_to_play)
+            self.last_played_cards = cards_to_play
+            self.threes_played_this_round += 1
+            self.consecutive_passes = 0
 
-            self.game_message = f"{player.name} cleared the pile with {played_count} two(s)! New round starts with them."
-            return
+            # Check if this 3 is being played on an existing 3-sequence
+            is_playing_on_existing_3_sequence = (self.current_play_rank == Rank.THREE)
 
-        # --- Rule 2: Handle 3 plays (Initiates Interrupt) ---
-        if played_rank_str == Rank.THREE:
-            if played_count == 2:
-                # Rule: Playing exactly two 3s always clears the pile
-                player.play_cards(cards_to_play)
-                self.pile.extend(cards_to_play)
-                self.last_played_cards = cards_to_play
-                self.clear_pile() # Clears pile, resets all pile-related state
+            if is_playing_on_existing_3_sequence:
+                # This 3 clears the pile because it's played on an existing 3-sequence
+                self.clear_pile() # This resets pile state and self.cards_of_rank_played
                 self.current_player_index = self.players.index(player) # Player who cleared goes again
-                self.consecutive_passes = 0
-                self.game_message = f"{player.name} played two {played_rank_str}s and cleared the pile! New round starts with them."
+                self.game_message = f"{player.name} played a single {played_rank_str} which caused the pile to clear! New round starts with them."
                 self.should_skip_next_player = False # No skip after a clear
                 
-                # If there was an active 3-play interrupt, it's resolved by this clear.
-                # This could happen if someone initiated a 3-play (1x3), then next player played 2x3.
+                # If there was an active 3-play interrupt, it's now resolved by this clear.
                 if self.interrupt_active and self.interrupt_type == 'three_play':
                     self.resolve_interrupt(winning_player_id=player_id) 
                 return # Turn handled, exit play_cards
 
-            elif played_count == 1:
-                # Rule: Playing a single 3
+            else:
+                self.current_play_rank = played_rank_value 
+                self.current_play_count = played_count
                 
-                # Record the play (remove from hand, add to pile)
-                player.play_cards(cards_to_play)
-                self.pile.extend(cards_to_play)
-                self.last_played_cards = cards_to_play
-                self.threes_played_this_round += 1
-                self.consecutive_passes = 0
-
-                # Check if this 3 is being played on an existing 3-sequence
-                is_playing_on_existing_3_sequence = (self.current_play_rank == Rank.THREE)
-
-                if is_playing_on_existing_3_sequence:
-                    # This 3 clears the pile because it's played on an existing 3-sequence
-                    self.clear_pile() # This resets pile state and self.cards_of_rank_played
-                    self.current_player_index = self.players.index(player) # Player who cleared goes again
-                    self.game_message = f"{player.name} played a single {played_rank_str} which caused the pile to clear! New round starts with them."
-                    self.should_skip_next_player = False # No skip after a clear
-                    
-                    # If there was an active 3-play interrupt, it's now resolved by this clear.
-                    if self.interrupt_active and self.interrupt_type == 'three_play':
-                        self.resolve_interrupt(winning_player_id=player_id) 
-                    return # Turn handled, exit play_cards
-
-                else:
-                    self.current_play_rank = played_rank_value 
-                    self.current_play_count = played_count
-                    
-                    self.cards_of_rank_played = {rank: 0 for rank in range(2, 15)} 
-                    self.cards_of_rank_played[played_rank_value] += played_count # Add the 1 played 3
-
-                    # Initiate the 3-play interrupt
-                    self.record_interrupt_initiation(
-                        'three_play',
-                        player_id,
-                        played_rank_value, 
-                        f"{player.name} played a single {played_rank_str}! Other players can now play one 3 to clear the pile, or pass."
-                    )
-                    return
+                self.cards_of_rank_played = {rank: 0 for rank in range(2, 15)} 
+                self.cards_of_rank_played[played_rank_value] += played_count # Add the 1 played 3
+
+                # Initiate the 3-play interrupt
+                self.record_interrupt_initiation(
+                    'three_play',
+                    player_id,
+                    played_rank_value, 
+                    f"{player.name} played a single {played_rank_str}! Other players can now play one 3 to clear the pile, or pass."
+                )
+                return
+
+        else: # Played 3s, but not one or two
+            raise ValueError("For 3s, you must play exactly one (to initiate/clear sequence) or exactly two (to clear the pile directly).")
+
+    def _play_standard(self, player, cards_to_play):
+        # --- General Play Rules (every rank without a special handler) ---
+        player_id = player.player_id
+        played_rank_str = cards_to_play[0].rank
+        played_rank_value = cards_to_play[0].get_value()
+        played_count = len(cards_to_play)
 
-            else: # Played 3s, but not one or two
-                raise ValueError("For 3s, you must play exactly one (to initiate/clear sequence) or exactly two (to clear the pile directly).")
+        skip_triggered_by_this_play = False
 
-        # --- General Play Rules (for non-2s, non-3s, and when no interrupt is active) ---
         if not self.pile:
             # Player starts a new round (pile is empty)
-            player.play_cards(cards_to_play)
-            self.pile.extend(cards_to_play)
+            self._move_cards_to_pile(player, cards_to_play)
             self.current_play_rank = played_rank_value
             self.current_play_count = played_count
             self.consecutive_passes = 0
@@ -322,8 +471,7 @@ class AssholeGame(GameState):
                 raise ValueError(f"Your play ({Card.get_rank_display(played_rank_str)}) must be higher than or match the current top card ({Card.get_rank_display(self.current_play_rank)}).")
 
             # Update pile for the current play
-            player.play_cards(cards_to_play)
-            self.pile.extend(cards_to_play)
+            self._move_cards_to_pile(player, cards_to_play)
             self.last_played_cards = cards_to_play
             self.consecutive_passes = 0
 
@@ -344,7 +492,7 @@ class AssholeGame(GameState):
                 self.cards_of_rank_played[played_rank_value] += played_count
                 self.game_message = f"{player.name} played {played_count} x {Card.get_rank_display(played_rank_str)} (same rank)."
                 
-                if played_count == 2 and self.current_play_count == 2:
+                if self.rules.double_clears and played_count == 2 and self.current_play_count == 2:
                     # This is a double on a double of the same rank! This clears the pile.
                     print(f"DEBUG: {player.name} played two {Card.get_rank_display(played_rank_str)}s on two {Card.get_rank_display(played_rank_str)}s, triggering a special clear.")
                     self.clear_pile() # Clear the pile
@@ -353,37 +501,201 @@ class AssholeGame(GameState):
                     self.should_skip_next_player = False
                     return
 
-                skip_triggered_by_this_play = True
-                self.game_message += " Next player will be skipped!"
-                print(f"DEBUG: Same-rank, same-count play ({played_count}x {Card.get_rank_display(played_rank_value)}) triggered a skip.")
+                if self.rules.skips:
+                    skip_triggered_by_this_play = True
+                    self.game_message += " Next player will be skipped!"
+                    print(f"DEBUG: Same-rank, same-count play ({played_count}x {Card.get_rank_display(played_rank_value)}) triggered a skip.")
                 
-        # --- Check for 4-of-a-kind clear (Bomb by current player) ---
-        # This check applies to non-2/3 plays that might form a 4-of-a-kind.
-        current_rank_total_on_pile = self.cards_of_rank_played.get(played_rank_value, 0)
-        if current_rank_total_on_pile >= 4:
-            self.check_and_perform_four_of_a_kind_clear(player, played_rank_value, played_rank_str)
-            self.should_skip_next_player = False
-            return 
-
-        # --- Check for Bomb Opportunity for other players ---
-        # This applies if the current non-2/3 play did NOT clear a 4-of-a-kind but sets one up
-        if 1 <= current_rank_total_on_pile <= 3:
-            self.record_interrupt_initiation(
-                'bomb_opportunity',
-                player_id,
-                played_rank_value,
-                f"A {Card.get_rank_display(played_rank_str)} bomb opportunity! Other players can now play remaining {4 - current_rank_total_on_pile} {Card.get_rank_display(played_rank_str)}s.",
-                initial_pile_count_for_interrupt_rank=current_rank_total_on_pile,
-                original_skip_state=skip_triggered_by_this_play # Pass the determined skip state
-            )
-            return
+        if self.rules.bombs:
+            # --- Check for 4-of-a-kind clear (Bomb by current player) ---
+            # This check applies to non-2/3 plays that might form a 4-of-a-kind.
+            current_rank_total_on_pile = self.cards_of_rank_played.get(played_rank_value, 0)
+            if current_rank_total_on_pile >= 4:
+                self.check_and_perform_four_of_a_kind_clear(player, played_rank_value, played_rank_str)
+                self.should_skip_next_player = False
+                return 
+
+            # --- Check for Bomb Opportunity for other players ---
+            # This applies if the current non-2/3 play did NOT clear a 4-of-a-kind but sets one up
+            if 1 <= current_rank_total_on_pile <= 3:
+                self.record_interrupt_initiation(
+                    'bomb_opportunity',
+                    player_id,
+                    played_rank_value,
+                    f"A {Card.get_rank_display(played_rank_str)} bomb opportunity! Other players can now play remaining {4 - current_rank_total_on_pile} {Card.get_rank_display(played_rank_str)}s.",
+                    initial_pile_count_for_interrupt_rank=current_rank_total_on_pile,
+                    original_skip_state=skip_triggered_by_this_play # Pass the determined skip state
+                )
+                return
 
         # --- Final Turn Advancement (if no special conditions led to a return) ---
         self.should_skip_next_player = skip_triggered_by_this_play 
         self.advance_turn(skip_count=1 if self.should_skip_next_player else 0)
         self.should_skip_next_player = False 
-        self.is_game_over
 
+    # Handler for each kind of rank in a compiled RuleSet (see game_engine.rules).
+    _PLAY_HANDLERS = {CLEAR: _play_clear_card, THREES: _play_threes, STANDARD: _play_standard}
+    _dispatch_tables = {}
+
+    @classmethod
+    def _dispatch_table(cls, rules):
+        """Maps each rank string to its play handler. Built once per distinct RuleSet and shared between games."""
+        table = cls._dispatch_tables.get(rules)
+        if table is None:
+            table = {rank: cls._PLAY_HANDLERS[kind] for rank, kind in rules.rank_kinds.items()}
+            cls._dispatch_tables[rules] = table
+        return table
+
+    def validate_play(self, player_id, cards_to_play_data):
+        """
+        Checks a play against the current turn, pile and hand without changing anything.
+        Raises ValueError with the reason play_cards would reject it; otherwise returns the parsed cards.
+        """
+        player = self.get_player_by_id(player_id)
+        if not player:
+            raise ValueError("Player not found in this game.")    
+        
+        # Basic turn validation
+        if player_id != self.get_current_player_id():
+            raise ValueError("It's not this player's turn.")
+        if not player.is_active:
+            raise ValueError("This player is out of the game and cannot play.")
+
+        cards_to_play = [Card(c['suit'], c['rank'], id=c.get('id')) for c in cards_to_play_data or []]
+        
+        if not cards_to_play:
+            raise ValueError("No cards selected to play.")        
+        
+        # Check if player has the cards in their hand
+        for card_to_play in cards_to_play:
+            if card_to_play not in player.get_hand().cards:
+                raise ValueError(f"{player.name} does not have the card {card_to_play} in their hand.")
+
+        # Ensure all cards played are of the same rank
+        if len(cards_to_play) > 1 and not all(card.rank == cards_to_play[0].rank for card in cards_to_play):
+            raise ValueError("All cards played must be of the same rank.")
+
+        # --- Handle Active Interrupts (players must use submit_interrupt_bid to respond) ---
+        if self.interrupt_active:
+            raise ValueError("An interrupt is currently active. Please use 'submit_interrupt_bid' to respond or pass.")
+
+        played_rank_str = cards_to_play[0].rank
+        played_rank_value = cards_to_play[0].get_value()
+        played_count = len(cards_to_play)
+
+        rank_kind = self.rules.rank_kinds[played_rank_str]
+        if rank_kind == CLEAR:
+            return cards_to_play
+        if rank_kind == THREES:
+            if played_count > 2:
+                raise ValueError("For 3s, you must play exactly one (to initiate/clear sequence) or exactly two (to clear the pile directly).")
+            return cards_to_play
+        if self.pile:
+            if played_count != self.current_play_count:
+                raise ValueError(f"You must play {self.current_play_count} card(s) to match the pile.")
+            if played_rank_value < self.current_play_rank:
+                raise ValueError(f"Your play ({Card.get_rank_display(played_rank_str)}) must be higher than or match the current top card ({Card.get_rank_display(self.current_play_rank)}).")
+        return cards_to_play
+
+    def validate_bid(self, player_id, cards_data=None):
+        """
+        Checks an interrupt bid (or a pass, when cards_data is empty) without changing anything.
+        Raises ValueError with the reason submit_interrupt_bid would reject it; otherwise returns the parsed cards.
+        """
+        if not self.interrupt_active:
+            raise ValueError("No interrupt is currently active.")
+        if player_id in self.players_responded_to_interrupt:
+            raise ValueError("You have already responded to this interrupt.")
+        if player_id == self.interrupt_initiator_player_id:
+            raise ValueError("You initiated this interrupt opportunity and cannot bid on it.")
+
+        player = self.get_player_by_id(player_id)
+        if not player or player.is_out:
+            raise ValueError("Only active players can respond to an interrupt.")
+
+        if not cards_data:
+            return []
+
+        cards_to_bid = [Card(c['suit'], c['rank'], id=c.get('id')) for c in cards_data]
+        if self.interrupt_type == 'three_play':
+            if not (len(cards_to_bid) == 1 and cards_to_bid[0].rank == Rank.THREE):
+                raise ValueError("For a three-play interrupt, you must play exactly one 3.")
+        elif self.interrupt_type == 'bomb_opportunity':
+            if not all(c.rank == cards_to_bid[0].rank for c in cards_to_bid):
+                raise ValueError("A bomb bid must consist of cards of the same rank.")
+            bomb_rank_value = cards_to_bid[0].get_value()
+            if bomb_rank_value != self.interrupt_rank:
+                raise ValueError(f"Bomb bid must be for rank {Card.get_rank_display(self.interrupt_rank)}.")
+            required_cards_to_bomb = 4 - self.interrupt_initial_pile_count
+            if len(cards_to_bid) != required_cards_to_bomb:
+                raise ValueError(f"To bomb this streak, you must play exactly {required_cards_to_bomb} {Card.get_rank_display(bomb_rank_value)}s.")
+        else:
+            raise ValueError(f"Cannot bid on interrupt type: {self.interrupt_type}.")
+
+        for card_to_bid in cards_to_bid:
+            if card_to_bid not in player.get_hand().cards:
+                raise ValueError(f"You do not have the card {card_to_bid} in your hand for the bid.")
+        return cards_to_bid
+
+    def get_legal_plays(self, player_id):
+        """
+        Returns the plays play_cards would accept from this player right now.
+        Suits never affect legality, so there is one list of hand cards per
+        (rank, count) combination. Returns an empty list if it isn't the player's
+        turn or an interrupt window is open.
+        """
+        player = self.get_player_by_id(player_id)
+        if not player or not player.is_active or self.interrupt_active or player_id != self.get_current_player_id():
+            return []
+        return self.get_plays_for_hand(player.get_hand().cards)
+
+    def get_plays_for_hand(self, hand_cards):
+        """
+        Returns the plays from hand_cards that the current pile would accept,
+        ignoring whose turn it is. See get_legal_plays.
+        """
+        cards_by_rank = {}
+        for card in hand_cards:
+            cards_by_rank.setdefault(card.rank, []).append(card)
+
+        legal_plays = []
+        rank_kinds = self.rules.rank_kinds
+        for rank_str, cards in cards_by_rank.items():
+            rank_value = cards[0].get_value()
+            for count in range(1, len(cards) + 1):
+                if rank_kinds[rank_str] == CLEAR:
+                    is_legal = True
+                elif rank_kinds[rank_str] == THREES:
+                    is_legal = count <= 2
+                elif not self.pile:
+                    is_legal = True
+                else:
+                    is_legal = count == self.current_play_count and rank_value >= self.current_play_rank
+                if is_legal:
+                    legal_plays.append(cards[:count])
+        return legal_plays
+
+    def get_legal_bid(self, player_id):
+        """
+        Returns the hand cards that would make a valid bid on the open interrupt
+        (one 3 for a three-play, the missing cards of the rank for a bomb), or
+        None if the player cannot bid.
+        """
+        player = self.get_player_by_id(player_id)
+        if (not self.interrupt_active or not player or player.is_out
+                or player_id == self.interrupt_initiator_player_id
+                or player_id in self.players_responded_to_interrupt):
+            return None
+        if self.interrupt_type == 'three_play':
+            rank_value, count = Card._numeric_rank_map[Rank.THREE], 1
+        elif self.interrupt_type == 'bomb_opportunity':
+            rank_value, count = self.interrupt_rank, 4 - self.interrupt_initial_pile_count
+        else:
+            return None
+        matching = [card for card in player.get_hand().cards if card.get_value() == rank_value]
+        return matching[:count] if len(matching) >= count else None
+
+    @recorded_action
     def pass_turn(self, player_id):
         player = self.get_player_by_id(player_id)
         if not player:
@@ -411,11 +723,12 @@ class AssholeGame(GameState):
             self.same_rank_streak = 0
             self.should_skip_next_player = False
             self.pile_cleared_this_turn = False
-            self.cards_of_rank_played = {rank.get_value(): 0 for rank in Rank.all_ranks()}
+            self.cards_of_rank_played = {rank: 0 for rank in range(2, 15)}
             self.advance_turn(skip_count=0)
         else:
             self.advance_turn(skip_count=0)
 
+    @recorded_action
     def advance_turn(self, skip_count=0):
         """
         Advances the turn to the next active player, optionally skipping players.
@@ -423,15 +736,15 @@ class AssholeGame(GameState):
         """
         for player in self.players:
             if len(player.get_hand().cards) == 0 and player.is_active:
-                player.is_active = False
+                self._set_player_active(player, False)
                 if player.rank is None:
                     taken_ranks = {p.rank for p in self.players if p.rank is not None}
                     new_rank = 1
                     while new_rank in taken_ranks:
                         new_rank += 1
                     player.rank = new_rank
-                    self.rankings[player.player_id] = {'name': player.name, 'rank': self.get_rank_name_display(player.rank, len(self.players))}
-                    self.game_message = f"{player.name} went out! They are the {self.get_rank_name_display(player.rank, len(self.players))}."
+                    self.rankings[player.player_id] = {'name': player.name, 'rank': self.get_rank_name(player.rank, len(self.players))}
+                    self.game_message = f"{player.name} went out! They are the {self.get_rank_name(player.rank, len(self.players))}."
 
         if self.is_game_over:
             self.game_message = "Game Over!"
@@ -470,7 +783,7 @@ class AssholeGame(GameState):
         if interrupt_type == 'three_play':
             self.interrupt_active_until = None
         else:
-            self.interrupt_active_until = time.time() + self.INTERRUPT_TIMEOUT_SECONDS
+            self.interrupt_active_until = self.clock.now() + self.INTERRUPT_TIMEOUT_SECONDS
         
         if interrupt_type == 'bomb_opportunity' or interrupt_type == 'three_play':
             self.interrupt_initial_pile_count = initial_pile_count_for_interrupt_rank
@@ -553,6 +866,7 @@ class AssholeGame(GameState):
         self.game_message = f"{player.name} has submitted an interrupt bid."
         print(f"Player {player_id} bid on interrupt with: {[str(c) for c in cards_to_play]}")
 
+    @recorded_action
     def submit_interrupt_bid(self, player_id, cards_data=None):
         """
         Allows a player to submit cards for an interrupt bid or pass on the interrupt.
@@ -579,7 +893,7 @@ class AssholeGame(GameState):
             bid_entry = {
                 'player_id': player_id,
                 'cards': cards_to_bid,
-                'bid_time': time.time()
+                'bid_time': self.clock.now()
             }
             
             # --- Basic Validation for the bid ---
@@ -632,6 +946,14 @@ class AssholeGame(GameState):
         else:
             print(f"DEBUG: {len(self.players_responded_to_interrupt)}/{len(all_active_players_except_initiator) + 1} players responded.") # +1 to include initiator in total count
 
+    @recorded_action
+    def remove_player(self, player_id):
+        super().remove_player(player_id)
+        # Remaining players shift seats, so the per-seat card keys and ledger locations must be rebuilt.
+        self.state_hash = self.compute_state_hash()
+        if self.ledger is not None:
+            self.ledger.reset(self)
+
     def get_active_player_ids(self):
         """Returns a set of player IDs for players who are still in the game."""
         return {p.player_id for p in self.players if not p.is_out}
@@ -680,7 +1002,13 @@ class AssholeGame(GameState):
         # If the loop completes, it means no active players were found in the entire list
         raise Exception("No active players remaining in the game.")
 
+    def is_interrupt_expired(self):
+        """True when the active interrupt has a deadline and the game's clock has reached it."""
+        return (self.interrupt_active and self.interrupt_active_until is not None
+                and self.clock.now() >= self.interrupt_active_until)
+
 
+    @recorded_action
     def resolve_interrupt(self):
         """
         Resolves the active interrupt, determines the winner, and applies game effects.
@@ -721,11 +1049,11 @@ class AssholeGame(GameState):
                 # Remove cards from winner's hand
                 for card_to_remove in winning_bid_cards:
                     if card_to_remove in winner.hand.cards: # Ensure card is still in hand
-                        winner.hand.cards.remove(card_to_remove)
+                        winner.hand.remove_card(card_to_remove)
                     else:
                         print(f"WARNING: Card {card_to_remove} not found in {winner.name}'s hand during 3-play interrupt resolution.")
                 
-                self.pile.extend(winning_bid_cards) # Add winning 3s to the pile
+                self._add_cards_to_pile(winning_bid_cards, self.players.index(winner), event="three_play") # Add winning 3s to the pile
                 self.clear_pile() # A successful 3-play clears the pile
                 self.game_message = f"{winner.name} won the 3-play interrupt by playing {len(winning_bid_cards)} three(s)! They clear the pile and start the next round."
                 self.current_player_index = self.players.index(winner) # Winner starts next round
@@ -776,7 +1104,7 @@ class AssholeGame(GameState):
                 for card_to_remove in winning_bid_cards:
                     winner.hand.remove_card(card_to_remove)
                 
-                self.pile.extend(winning_bid_cards)
+                self._add_cards_to_pile(winning_bid_cards, self.players.index(winner), event="bomb")
                 self.clear_pile()
                 
                 bomb_type_str = f"{winning_bomb_bid_entry['cards_played_in_bomb']}-of-a-kind bomb"
@@ -829,7 +1157,7 @@ class AssholeGame(GameState):
     def handle_player_out(self, player):
         if len(player.hand.cards) == 0 and not player.is_out:
             player.is_out = True
-            player.is_active = False
+            self._set_player_active(player, False)
             self.player_went_out += 1
             player.rank = self.player_went_out
             rank_name = self.get_rank_name(player.rank, len(self.players))
@@ -874,7 +1202,7 @@ class AssholeGame(GameState):
         for player in unranked_players:
             player.rank = current_rank_counter
             player.is_out = True
-            player.is_active = False
+            self._set_player_active(player, False)
             current_rank_counter += 1
 
         self.rankings = {p.player_id: p.rank for p in self.players}
@@ -1,14 +1,27 @@
 class Hand:
     def __init__(self, cards=None):
+        # Bumped on every change to the hand, so callers can cache anything derived from it.
+        self.version = 0
         self.cards = cards if cards is not None else []
 
+    @property
+    def cards(self):
+        return self._cards
+
+    @cards.setter
+    def cards(self, cards):
+        self._cards = cards
+        self.version += 1
+
     def add_card(self, card):
-        self.cards.append(card)
+        self._cards.append(card)
+        self.version += 1
     
     def remove_card(self, card_to_remove):
         """Removes a specific card from the hand."""
-        if card_to_remove in self.cards:
-            self.cards.remove(card_to_remove)
+        if card_to_remove in self._cards:
+            self._cards.remove(card_to_remove)
+            self.version += 1
         else:
             print(f"Error: Tried to remove a card not in hand: {card_to_remove}")
 
@@ -19,17 +32,20 @@ class Hand:
         return f"Hand(cards={[repr(card) for card in self.cards]})"
     
     def sort_by_rank(self):
-        self.cards.sort(key=lambda card: card.get_value())
+        self._cards.sort(key=lambda card: card.get_value())
+        self.version += 1
 
     def play_cards(self, cards_to_play):
         played_cards = []
         indices_to_remove = sorted([self.cards.index(card) for card in cards_to_play], reverse=True)
         for index in indices_to_remove:
-            played_cards.append(self.cards.pop(index))
+            played_cards.append(self._cards.pop(index))
+        self.version += 1
         return played_cards
     
     def clear(self):
-        self.cards = []
+        self._cards.clear()
+        self.version += 1
 
     def get_cards_by_rank(self, rank):
         return [card for card in self.cards if card.rank == rank]
\ No newline at end of file
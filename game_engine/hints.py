@@ -0,0 +1,73 @@
+from game_engine.bots.heuristic import HeuristicPolicy
+
+
+class MoveHintEngine:
+    """
+    Ranked move hints for each player, for the frontend's "what can I play?".
+
+    Plays are the ones the current pile accepts from the player's hand, best
+    first by HeuristicPolicy.score_play. They are cached per player and only
+    recomputed when the pile or that player's hand changes (tracked by
+    game.pile_version and hand.version). Whose turn it is gets read fresh on
+    every call, so other players' moves never invalidate the cache.
+    """
+
+    def __init__(self, policy=None):
+        self.policy = policy if policy is not None else HeuristicPolicy()
+        self._cache = {}  # (room_code, player_id) -> (cache key, hints)
+        self.hits = 0
+        self.misses = 0
+
+    def get_hints(self, game, player_id):
+        """Returns the player's hints, or None outside a running game."""
+        player = game.get_player_by_id(player_id)
+        if player is None or not game.is_game_started or game.is_game_over:
+            return None
+
+        hand = player.get_hand()
+        key = (id(hand), hand.version, game.pile_version, game.interrupt_active, game.interrupt_type, game.interrupt_rank)
+        entry = self._cache.get((game.room_code, player_id))
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            hints = entry[1]
+        else:
+            self.misses += 1
+            hints = self._compute_hints(game, player)
+            self._cache[(game.room_code, player_id)] = (key, hints)
+
+        your_turn = (not game.interrupt_active and player.is_active
+                     and game.get_current_player_id() == player_id)
+        must_respond = (game.interrupt_active and player_id != game.interrupt_initiator_player_id
+                        and player_id not in game.players_responded_to_interrupt)
+        return dict(
+            hints,
+            your_turn=your_turn,
+            can_pass=your_turn and bool(game.pile),
+            must_respond_to_interrupt=must_respond,
+            bid=hints['bid'] if must_respond else None,
+        )
+
+    def _compute_hints(self, game, player):
+        scored = [(self.policy.score_play(game, player, cards), cards)
+                  for cards in game.get_plays_for_hand(player.get_hand().cards)]
+        scored.sort(key=lambda item: (item[0], item[1][0].get_value(), len(item[1])))
+        suggest_pass = bool(game.pile) and (not scored or scored[0][0] > self.policy.weights['pass_threshold'])
+
+        bid = game.get_legal_bid(player.player_id) if game.interrupt_active else None
+        return {
+            'plays': [
+                {
+                    'cards': [card.to_dict() for card in cards],
+                    'rank_value': cards[0].get_value(),
+                    'count': len(cards),
+                    'goes_out': len(cards) == len(player.get_hand().cards),
+                }
+                for _, cards in scored
+            ],
+            'suggest_pass': suggest_pass,
+            'bid': [card.to_dict() for card in bid] if bid else None,
+        }
+
+    def forget_room(self, room_code):
+        for key in [key for key in self._cache if key[0] == room_code]:
+            del self._cache[key]
@@ -0,0 +1,127 @@
+import contextlib
+import copy
+import functools
+import io
+import pickle
+import zlib
+from collections import deque
+
+# Actions that deal cards, so replaying them would not reproduce the game; a checkpoint always follows them.
+RANDOM_ACTIONS = ('start_game', 'start_next_round')
+
+
+def recorded_action(method):
+    """
+    Decorator for AssholeGame methods that change the game. When the game has a
+    GameHistory attached, each outermost call is logged after it returns, so
+    nested engine calls (e.g. advance_turn inside play_cards) are not logged twice.
+    submit_interrupt_bid is logged even when it raises, because a rejected bid
+    still marks the player as having responded.
+    """
+    name = method.__name__
+    logs_rejections = name == 'submit_interrupt_bid'
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        history = getattr(self, 'history', None)
+        if history is None or history.in_action:
+            return method(self, *args, **kwargs)
+        arguments = copy.deepcopy((args, kwargs))
+        history.in_action = True
+        try:
+            result = method(self, *args, **kwargs)
+        except ValueError:
+            if logs_rejections:
+                history.record(self, name, *arguments)
+            raise
+        finally:
+            history.in_action = False
+        history.record(self, name, *arguments)
+        return result
+
+    return wrapper
+
+
+class GameHistory:
+    """
+    Bounded time-travel record of one game.
+
+    Every `checkpoint_interval` actions (and after every deal, which is random)
+    the game is pickled and compressed into a ring of at most `max_checkpoints`
+    snapshots. The actions since the oldest kept snapshot are logged too, so any
+    move still covered by the ring can be rebuilt by restoring the nearest
+    snapshot and re-applying fewer than `checkpoint_interval` actions. Memory is
+    bounded by max_checkpoints snapshots plus max_checkpoints * checkpoint_interval actions.
+    """
+
+    def __init__(self, checkpoint_interval=20, max_checkpoints=10):
+        if checkpoint_interval < 1 or max_checkpoints < 1:
+            raise ValueError("checkpoint_interval and max_checkpoints must be at least 1.")
+        self.checkpoint_interval = checkpoint_interval
+        self.max_checkpoints = max_checkpoints
+        self.checkpoints = deque(maxlen=max_checkpoints)  # (action index, compressed pickle)
+        self.actions = deque()  # (name, args, kwargs), starting at action index first_action_index
+        self.first_action_index = 0
+        self.action_count = 0
+        self.in_action = False
+
+    def attach(self, game):
+        """Starts recording `game` from its current state, which becomes move 0."""
+        game.history = self
+        self.checkpoint(game)
+
+    def record(self, game, name, args, kwargs):
+        self.actions.append((name, args, kwargs))
+        self.action_count += 1
+        if name in RANDOM_ACTIONS or self.action_count - self.checkpoints[-1][0] >= self.checkpoint_interval:
+            self.checkpoint(game)
+
+    def checkpoint(self, game):
+        blob = zlib.compress(pickle.dumps(game, pickle.HIGHEST_PROTOCOL))
+        if self.checkpoints and self.checkpoints[-1][0] == self.action_count:
+            self.checkpoints.pop()
+        self.checkpoints.append((self.action_count, blob))
+        # Drop the actions that the oldest remaining checkpoint already covers.
+        oldest = self.checkpoints[0][0]
+        while self.first_action_index < oldest:
+            self.actions.popleft()
+            self.first_action_index += 1
+
+    @property
+    def oldest_move(self):
+        return self.checkpoints[0][0] if self.checkpoints else None
+
+    def state_at(self, move):
+        """
+        Rebuilds the game as it was after `move` actions. The result is a detached
+        copy: it has no history and changing it does not affect the live game.
+        """
+        if not self.checkpoints or not self.oldest_move <= move <= self.action_count:
+            raise ValueError(f"Move {move} is not kept; available moves are {self.oldest_move} to {self.action_count}.")
+        checkpoint_move, blob = next(c for c in reversed(self.checkpoints) if c[0] <= move)
+        game = pickle.loads(zlib.decompress(blob))
+        with contextlib.redirect_stdout(io.StringIO()):
+            for index in range(checkpoint_move, move):
+                name, args, kwargs = self.actions[index - self.first_action_index]
+                args, kwargs = copy.deepcopy((args, kwargs))
+                try:
+                    getattr(game, name)(*args, **kwargs)
+                except ValueError:
+                    pass  # Logged rejections replay their side effects and fail again
+        return game
+
+    def action_log(self, start=None, end=None):
+        """The kept actions from `start` (default: the oldest kept) up to `end`, as (move, name, args, kwargs)."""
+        start = self.first_action_index if start is None else max(start, self.first_action_index)
+        end = self.action_count if end is None else min(end, self.action_count)
+        return [(index, *self.actions[index - self.first_action_index]) for index in range(start, end)]
+
+    def summary(self):
+        return {
+            'moves': self.action_count,
+            'oldest_move': self.oldest_move,
+            'checkpoint_moves': [move for move, _ in self.checkpoints],
+            'checkpoint_bytes': sum(len(blob) for _, blob in self.checkpoints),
+            'checkpoint_interval': self.checkpoint_interval,
+            'max_checkpoints': self.max_checkpoints,
+        }
@@ -0,0 +1,91 @@
+from game_engine.zobrist import PILE, DISCARD
+
+
+class CardConservationError(RuntimeError):
+    """Raised by a strict CardLedger when a card move breaks conservation."""
+
+
+class CardLedger:
+    """
+    Incremental record of where every card is: a seat index, PILE or DISCARD.
+
+    AssholeGame reports each card move to the ledger, which checks in O(1) that
+    the card really was where the move says it came from and that the seat's
+    hand shrank by as many cards as the ledger moved. A violation is recorded
+    with the event that caused it; a strict ledger (for debugging and tests)
+    raises CardConservationError instead. Games without a ledger pay nothing,
+    so production can attach one to a sample of rooms.
+    """
+
+    def __init__(self, strict=False, name=None, max_violations=100):
+        self.strict = strict
+        self.name = name
+        self.max_violations = max_violations
+        self.locations = {}  # (suit, rank) -> location
+        self.counts = {}  # location -> number of cards the ledger puts there
+        self.violations = []
+        self.moves_checked = 0
+
+    @staticmethod
+    def _key(card):
+        # The engine treats cards with the same suit and rank as the same card, whatever their ID.
+        return card.suit, card.rank
+
+    def reset(self, game):
+        """Seeds the ledger from a full scan of the game, e.g. right after the deal."""
+        self.locations = {}
+        self.counts = {PILE: 0, DISCARD: 0}
+        for seat, player in enumerate(game.players):
+            self._place_all(player.get_hand().cards, seat)
+        self._place_all(game.pile, PILE)
+        self._place_all(game.discard_pile, DISCARD)
+
+    def _place_all(self, cards, location):
+        self.counts.setdefault(location, 0)
+        for card in cards:
+            self.locations[self._key(card)] = location
+            self.counts[location] += 1
+
+    def move(self, card, from_location, to_location, event):
+        """Moves one card, flagging the move if the ledger has the card somewhere else."""
+        self.moves_checked += 1
+        key = self._key(card)
+        actual = self.locations.get(key)
+        if actual != from_location:
+            self._violation(event, f"{card} moved from {from_location!r} but the ledger has it at {actual!r}")
+            if actual is None:
+                self.counts.setdefault(to_location, 0)
+                self.counts[to_location] += 1
+                self.locations[key] = to_location
+                return
+            from_location = actual
+        self.locations[key] = to_location
+        self.counts[from_location] -= 1
+        self.counts[to_location] = self.counts.get(to_location, 0) + 1
+
+    def check_count(self, location, actual_count, event):
+        """Flags a location whose real size no longer matches the ledger, e.g. a card that never left a hand."""
+        expected = self.counts.get(location, 0)
+        if expected != actual_count:
+            self._violation(event, f"{location!r} holds {actual_count} cards but the ledger expects {expected}")
+            self.counts[location] = actual_count
+
+    def audit(self, game):
+        """Full scan comparing the game with the ledger. Returns the mismatched cards; for tests and spot checks."""
+        actual = {}
+        for seat, player in enumerate(game.players):
+            for card in player.get_hand().cards:
+                actual[self._key(card)] = seat
+        for card in game.pile:
+            actual[self._key(card)] = PILE
+        for card in game.discard_pile:
+            actual[self._key(card)] = DISCARD
+        return sorted(key for key in set(actual) | set(self.locations) if actual.get(key) != self.locations.get(key))
+
+    def _violation(self, event, detail):
+        violation = {'event': event, 'detail': detail, 'move': self.moves_checked}
+        if self.strict:
+            raise CardConservationError(f"{event}: {detail}")
+        if len(self.violations) < self.max_violations:
+            self.violations.append(violation)
+        print(f"WARNING: Card ledger violation{f' in room {self.name}' if self.name else ''} during {event}: {detail}")
@@ -3,12 +3,13 @@ from .hand import Hand
 
 
 class Player:
-    def __init__(self, name, hand=None, player_id=None):
+    def __init__(self, name, hand=None, player_id=None, is_bot=False):
         self.name = name
         self.hand = Hand()
         self.rank = None
         self.is_active = True
         self.is_out = False
+        self.is_bot = is_bot
         self.player_id = player_id if player_id is not None else str(uuid.uuid4())
 
     def add_card(self, card):
@@ -0,0 +1,196 @@
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from game_engine.bots.heuristic import HeuristicPolicy
+from game_engine.simulation import create_simulated_game, run_headless_game, finishing_reward
+from game_engine.rl.encoding import (
+    OBSERVATION_SIZE, ACTION_SIZE, PASS_ACTION, encode_action, encode_observation, legal_action_mask,
+)
+
+INDEX_FILE = "index.json"
+DATASET_VERSION = 1
+
+# Column name -> (per-row shape, dtype). Each column is one .npy file per chunk.
+COLUMNS = {
+    'observations': ((OBSERVATION_SIZE,), np.float32),
+    'action_masks': ((ACTION_SIZE,), np.bool_),
+    'actions': ((), np.int16),
+    'rewards': ((), np.float32),
+    'game_ids': ((), np.int64),
+}
+
+
+class TrajectoryWriter:
+    """
+    Streams decision points of headless games into one shard of .npy memmaps.
+
+    Each chunk preallocates `chunk_rows` rows per column. When a chunk fills up
+    the writer rolls over to the next one, so a shard can grow without ever
+    copying earlier data. The shard's index.json records how many rows of each
+    chunk are valid; it is rewritten whenever a game ends, so a reader never
+    sees rows of an unfinished game. Reopening an existing shard appends new
+    chunks after the ones in its index; a shard directory holding files but no
+    index is refused rather than overwritten.
+
+    Pass the writer as `recorder` to run_headless_game / play_step.
+    """
+
+    def __init__(self, directory, shard_id=0, chunk_rows=65536):
+        self.shard_dir = os.path.join(directory, f"shard-{shard_id:03d}")
+        os.makedirs(self.shard_dir, exist_ok=True)
+        self.chunk_rows = chunk_rows
+        self._chunks = []  # [{'name': str, 'rows': committed rows}]
+        self._arrays = None
+        self._row = 0
+        self._pending = []  # (rewards array, row, player_id) of the game in progress
+        self._filled_chunks = []  # Chunks that filled up during the game in progress
+        self._game_id = 0
+        self._resume()
+        self._open_chunk()
+
+    @property
+    def rows_written(self):
+        return sum(chunk['rows'] for chunk in self._chunks)
+
+    def record(self, game, player, is_interrupt_response, cards):
+        """Stores the player's view, legal mask and chosen action. The reward is filled in by end_game."""
+        if self._row == self.chunk_rows:
+            self._open_chunk()
+        row = self._row
+        arrays = self._arrays
+        encode_observation(game, player, out=arrays['observations'][row])
+        legal_action_mask(game, player, is_interrupt_response, out=arrays['action_masks'][row])
+        arrays['actions'][row] = encode_action(cards[0].get_value(), len(cards)) if cards else PASS_ACTION
+        arrays['game_ids'][row] = self._game_id
+        self._pending.append((arrays['rewards'], row, player.player_id))
+        self._row += 1
+
+    def end_game(self, game):
+        """Writes the final reward into every row of the finished game and commits them to the index."""
+        rewards = {player.player_id: finishing_reward(game, player.player_id) for player in game.players}
+        for reward_column, row, player_id in self._pending:
+            reward_column[row] = rewards[player_id]
+        self._pending = []
+        self._game_id += 1
+        for chunk in self._filled_chunks:
+            chunk['rows'] = self.chunk_rows
+        self._filled_chunks = []
+        self._chunks[-1]['rows'] = self._row
+        self._write_index()
+
+    def close(self):
+        """Flushes the memmaps. Rows of an unfinished game are dropped."""
+        if self._arrays is not None:
+            for array in self._arrays.values():
+                array.flush()
+            self._arrays = None
+        self._write_index()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _resume(self):
+        """Picks up the chunks and game IDs already committed to this shard's index."""
+        index_path = os.path.join(self.shard_dir, INDEX_FILE)
+        if not os.path.exists(index_path):
+            if os.listdir(self.shard_dir):
+                raise ValueError(f"{self.shard_dir} is not empty and has no {INDEX_FILE}; refusing to overwrite it.")
+            return
+        with open(index_path) as f:
+            index = json.load(f)
+        if index['version'] != DATASET_VERSION:
+            raise ValueError(f"Unsupported dataset version {index['version']} in {index_path}.")
+        self._chunks = index['chunks']
+        for chunk in reversed(self._chunks):
+            if chunk['rows']:
+                game_ids = np.load(os.path.join(self.shard_dir, f"{chunk['name']}.game_ids.npy"), mmap_mode='r')
+                self._game_id = int(game_ids[chunk['rows'] - 1]) + 1
+                break
+
+    def _open_chunk(self):
+        if self._arrays is not None:
+            # Earlier rows of an unfinished game still hold references to the old reward column.
+            for array in self._arrays.values():
+                array.flush()
+            self._filled_chunks.append(self._chunks[-1])
+        name = f"chunk-{len(self._chunks):05d}"
+        self._arrays = {
+            column: np.lib.format.open_memmap(
+                os.path.join(self.shard_dir, f"{name}.{column}.npy"), mode='w+',
+                dtype=dtype, shape=(self.chunk_rows,) + shape,
+            )
+            for column, (shape, dtype) in COLUMNS.items()
+        }
+        self._chunks.append({'name': name, 'rows': 0})
+        self._row = 0
+
+    def _write_index(self):
+        index = {
+            'version': DATASET_VERSION,
+            'observation_size': OBSERVATION_SIZE,
+            'action_size': ACTION_SIZE,
+            'columns': list(COLUMNS),
+            'chunks': self._chunks,
+        }
+        path = os.path.join(self.shard_dir, INDEX_FILE)
+        with open(path + ".tmp", 'w') as f:
+            json.dump(index, f)
+        os.replace(path + ".tmp", path)
+
+
+def open_dataset(directory):
+    """
+    Opens every shard under `directory` read-only.
+    Returns a list of {column: memmap} dicts, one per chunk, each sliced to its valid rows.
+    """
+    chunks = []
+    for shard_name in sorted(os.listdir(directory)):
+        index_path = os.path.join(directory, shard_name, INDEX_FILE)
+        if not os.path.exists(index_path):
+            continue
+        with open(index_path) as f:
+            index = json.load(f)
+        if index['version'] != DATASET_VERSION:
+            raise ValueError(f"Unsupported dataset version {index['version']} in {index_path}.")
+        for chunk in index['chunks']:
+            if chunk['rows'] == 0:
+                continue
+            chunks.append({
+                column: np.load(os.path.join(directory, shard_name, f"{chunk['name']}.{column}.npy"),
+                                mmap_mode='r')[:chunk['rows']]
+                for column in index['columns']
+            })
+    return chunks
+
+
+def _write_shard(directory, shard_id, num_games, seed, num_players, chunk_rows, weights):
+    rng = random.Random(seed)
+    policy = HeuristicPolicy(weights=weights, rng=rng)
+    with TrajectoryWriter(directory, shard_id=shard_id, chunk_rows=chunk_rows) as writer:
+        for _ in range(num_games):
+            game = create_simulated_game(num_players, seed=rng.getrandbits(32))
+            run_headless_game(game, policy, recorder=writer)
+        return writer.rows_written
+
+
+def generate_self_play_dataset(directory, num_games, num_workers=1, seed=0, num_players=4,
+                               chunk_rows=65536, weights=None):
+    """
+    Plays num_games heuristic self-play games and records them under `directory`,
+    one shard per worker process. Returns the number of rows written.
+    """
+    shard_games = [num_games // num_workers + (1 if i < num_games % num_workers else 0) for i in range(num_workers)]
+    seeds = random.Random(seed)
+    jobs = [(directory, shard_id, games, seeds.getrandbits(32), num_players, chunk_rows, weights)
+            for shard_id, games in enumerate(shard_games)]
+    if num_workers == 1:
+        return _write_shard(*jobs[0])
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        return sum(executor.map(_write_shard, *zip(*jobs)))
@@ -0,0 +1,126 @@
+import numpy as np
+
+from game_engine.card import Card, Rank
+
+NUM_RANKS = 13
+MAX_SEATS = 10
+MAX_CARDS_PER_PLAY = 4
+
+# Action space: 0 passes (or declines an interrupt); every other index is
+# "play/bid `count` cards of `rank`", whichever suits the hand holds.
+PASS_ACTION = 0
+ACTION_SIZE = 1 + NUM_RANKS * MAX_CARDS_PER_PLAY
+
+# Observation layout: offsets into one float32 row.
+HAND_OFFSET = 0                                         # Own cards held per rank
+PILE_RANK_OFFSET = HAND_OFFSET + NUM_RANKS              # One-hot rank currently on the pile
+PILE_COUNT_OFFSET = PILE_RANK_OFFSET + NUM_RANKS        # Cards per play on the pile
+DISCARD_OFFSET = PILE_COUNT_OFFSET + 1                  # Cleared cards per rank (public card counting)
+OPPONENT_OFFSET = DISCARD_OFFSET + NUM_RANKS            # Opponents' hand sizes in turn order after us
+INTERRUPT_OFFSET = OPPONENT_OFFSET + MAX_SEATS - 1      # [must respond, three-play, bomb, cards needed]
+TURN_OFFSET = INTERRUPT_OFFSET + 4                      # [our turn, consecutive passes]
+OBSERVATION_SIZE = TURN_OFFSET + 2
+
+
+def rank_index(rank_value):
+    return rank_value - 2
+
+
+def encode_action(rank_value, count):
+    """Action index for playing `count` cards of a numeric rank."""
+    return 1 + rank_index(rank_value) * MAX_CARDS_PER_PLAY + (count - 1)
+
+
+def decode_action(action):
+    """Returns (rank_value, count) for an action index, or None for PASS_ACTION."""
+    if action == PASS_ACTION:
+        return None
+    index, count_offset = divmod(int(action) - 1, MAX_CARDS_PER_PLAY)
+    return index + 2, count_offset + 1
+
+
+def encode_observation(game, player, out=None):
+    """
+    Writes the player's view of the game into a fixed-size float32 row.
+    Pass `out` (a row of a preallocated batch) to avoid allocating per step.
+    """
+    if out is None:
+        out = np.zeros(OBSERVATION_SIZE, dtype=np.float32)
+    else:
+        out.fill(0.0)
+
+    for card in player.get_hand().cards:
+        out[HAND_OFFSET + rank_index(card.get_value())] += 1.0
+    if game.pile and game.current_play_rank is not None:
+        out[PILE_RANK_OFFSET + rank_index(game.current_play_rank)] = 1.0
+        out[PILE_COUNT_OFFSET] = game.current_play_count
+    for card in game.discard_pile:
+        out[DISCARD_OFFSET + rank_index(card.get_value())] += 1.0
+
+    players = game.players
+    seat = players.index(player)
+    num_players = len(players)
+    for offset in range(1, num_players):
+        out[OPPONENT_OFFSET + offset - 1] = len(players[(seat + offset) % num_players].get_hand().cards)
+
+    if game.interrupt_active:
+        must_respond = (player.player_id != game.interrupt_initiator_player_id
+                        and player.player_id not in game.players_responded_to_interrupt)
+        out[INTERRUPT_OFFSET] = 1.0 if must_respond else 0.0
+        out[INTERRUPT_OFFSET + 1] = 1.0 if game.interrupt_type == 'three_play' else 0.0
+        out[INTERRUPT_OFFSET + 2] = 1.0 if game.interrupt_type == 'bomb_opportunity' else 0.0
+        out[INTERRUPT_OFFSET + 3] = _interrupt_cards_needed(game)
+    elif game.current_player_index == seat:
+        out[TURN_OFFSET] = 1.0
+    out[TURN_OFFSET + 1] = game.consecutive_passes
+    return out
+
+
+def legal_action_mask(game, player, is_interrupt_response, out=None):
+    """Writes a boolean mask of the actions the player may take at this decision point."""
+    if out is None:
+        out = np.zeros(ACTION_SIZE, dtype=bool)
+    else:
+        out.fill(False)
+
+    if is_interrupt_response:
+        out[PASS_ACTION] = True
+        bid = _interrupt_bid_shape(game)
+        if bid is not None:
+            rank_value, count = bid
+            held = sum(1 for card in player.get_hand().cards if card.get_value() == rank_value)
+            if held >= count:
+                out[encode_action(rank_value, count)] = True
+        return out
+
+    out[PASS_ACTION] = bool(game.pile)
+    for cards in game.get_legal_plays(player.player_id):
+        out[encode_action(cards[0].get_value(), len(cards))] = True
+    return out
+
+
+def cards_for_action(player, action):
+    """Returns the hand cards an action refers to, or None for a pass."""
+    decoded = decode_action(action)
+    if decoded is None:
+        return None
+    rank_value, count = decoded
+    cards = [card for card in player.get_hand().cards if card.get_value() == rank_value][:count]
+    if len(cards) < count:
+        raise ValueError(f"Action {action} needs {count} card(s) of rank {rank_value}, which {player.name} does not hold.")
+    return cards
+
+
+def _interrupt_bid_shape(game):
+    """(rank_value, count) a bid on the open interrupt must have, or None if no bid is possible."""
+    if game.interrupt_type == 'three_play':
+        return Card._numeric_rank_map[Rank.THREE], 1
+    if game.interrupt_type == 'bomb_opportunity':
+        return game.interrupt_rank, 4 - game.interrupt_initial_pile_count
+    return None
+
+
+def _interrupt_cards_needed(game):
+    bid = _interrupt_bid_shape(game)
+    return bid[1] if bid else 0
+
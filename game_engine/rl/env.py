@@ -0,0 +1,269 @@
+import ctypes
+import multiprocessing
+import random
+import time
+
+import numpy as np
+
+from game_engine.bots.heuristic import HeuristicPolicy
+from game_engine.simulation import (
+    DEFAULT_MAX_STEPS, create_simulated_game, pending_decision, advance_without_decision,
+    apply_decision, play_step, finishing_reward, quiet_engine,
+)
+from game_engine.rl.encoding import (
+    OBSERVATION_SIZE, ACTION_SIZE, encode_observation, legal_action_mask, cards_for_action,
+)
+
+AGENT_ID = "bot-1"
+
+
+class AssholeEnv:
+    """
+    Gym-style environment where the agent plays one seat of an AssholeGame.
+
+    The other seats are played by HeuristicPolicy. The agent is asked to act on
+    its own turns and whenever it owes a response to an interrupt window. The
+    episode ends when the agent's finishing position is known.
+
+    reset(seed) returns (observation, action_mask) and step(action) returns
+    (observation, reward, done, action_mask). The reward is 0 until the final
+    step. Pass `obs_out` / `mask_out` rows to write into preallocated arrays.
+    """
+
+    observation_size = OBSERVATION_SIZE
+    action_size = ACTION_SIZE
+
+    def __init__(self, num_players=4, opponent_weights=None, max_steps=DEFAULT_MAX_STEPS, seed=None):
+        self.num_players = num_players
+        self.opponent_weights = opponent_weights
+        self.max_steps = max_steps
+        self._seed_rng = random.Random(seed)
+        self.game = None
+        self.agent = None
+        self.done = True
+        self._steps = 0
+        self._is_interrupt_response = False
+        self._mask = np.zeros(ACTION_SIZE, dtype=bool)
+
+    def reset(self, seed=None, obs_out=None, mask_out=None):
+        if seed is None:
+            seed = self._seed_rng.getrandbits(32)
+        else:
+            # An explicit seed also fixes the seeds of later unseeded resets.
+            self._seed_rng = random.Random(seed)
+        self.game = create_simulated_game(self.num_players, seed=seed)
+        self.agent = self.game.get_player_by_id(AGENT_ID)
+        self.opponent_policy = HeuristicPolicy(weights=self.opponent_weights, rng=random.Random(seed))
+        self.done = False
+        self._steps = 0
+        with quiet_engine():
+            self._advance_to_agent()
+        observation, mask = self._observe(obs_out, mask_out)
+        return observation, mask
+
+    def step(self, action, obs_out=None, mask_out=None):
+        if self.done:
+            raise ValueError("The episode is over. Call reset() first.")
+        if not self._mask[action]:
+            raise ValueError(f"Action {action} is not legal at this decision point.")
+
+        cards = cards_for_action(self.agent, action)
+        with quiet_engine():
+            apply_decision(self.game, self.agent, self._is_interrupt_response, cards)
+            self._steps += 1
+            self._advance_to_agent()
+
+        reward = finishing_reward(self.game, AGENT_ID) if self.done else 0.0
+        observation, mask = self._observe(obs_out, mask_out)
+        return observation, reward, self.done, mask
+
+    def _advance_to_agent(self):
+        """Plays the other seats until the agent has a real decision or its episode ends."""
+        game = self.game
+        while True:
+            if game.is_game_over or self.agent.rank is not None or self._steps >= self.max_steps:
+                self.done = True
+                return
+            player, is_interrupt_response = pending_decision(game)
+            if player is None:
+                advance_without_decision(game)
+            elif player is self.agent:
+                if player.get_hand().cards:
+                    self._is_interrupt_response = is_interrupt_response
+                    return
+                apply_decision(game, player, is_interrupt_response, None)
+            else:
+                play_step(game, self.opponent_policy)
+            self._steps += 1
+
+    def _observe(self, obs_out, mask_out):
+        observation = encode_observation(self.game, self.agent, out=obs_out)
+        if self.done:
+            mask = mask_out if mask_out is not None else np.zeros(ACTION_SIZE, dtype=bool)
+            mask.fill(False)
+        else:
+            mask = legal_action_mask(self.game, self.agent, self._is_interrupt_response, out=mask_out)
+        self._mask = mask
+        return observation, mask
+
+
+class VectorAssholeEnv:
+    """
+    Steps N AssholeEnv instances with one call, writing into fixed (N, ...) arrays.
+
+    Finished sub-environments are reset automatically. The returned row for a
+    finished env holds the first observation of its next episode, and its reward
+    and done flag refer to the episode that just ended. The returned arrays are
+    reused on every call; copy them if they must outlive the next step.
+
+    With num_workers > 0 the sub-environments are split across worker processes
+    that write straight into shared-memory arrays, so only actions and a one-word
+    reply cross the pipes.
+    """
+
+    def __init__(self, num_envs, num_players=4, seed=None, num_workers=0, opponent_weights=None,
+                 max_steps=DEFAULT_MAX_STEPS):
+        self.num_envs = num_envs
+        self.num_workers = min(num_workers, num_envs)
+        self._seed_rng = random.Random(seed)
+        env_kwargs = {'num_players': num_players, 'opponent_weights': opponent_weights, 'max_steps': max_steps}
+
+        if self.num_workers:
+            ctx = multiprocessing.get_context()
+            self._shared = {
+                'observations': ctx.RawArray(ctypes.c_float, num_envs * OBSERVATION_SIZE),
+                'action_masks': ctx.RawArray(ctypes.c_bool, num_envs * ACTION_SIZE),
+                'rewards': ctx.RawArray(ctypes.c_float, num_envs),
+                'dones': ctx.RawArray(ctypes.c_bool, num_envs),
+            }
+            self.observations, self.action_masks, self.rewards, self.dones = _shared_views(self._shared, num_envs)
+            bounds = np.linspace(0, num_envs, self.num_workers + 1).astype(int)
+            self._slices = [(int(start), int(stop)) for start, stop in zip(bounds[:-1], bounds[1:])]
+            self._pipes = []
+            self._processes = []
+            for start, stop in self._slices:
+                parent_conn, child_conn = ctx.Pipe()
+                process = ctx.Process(target=_worker_loop, args=(child_conn, self._shared, num_envs, start, stop, env_kwargs),
+                                      daemon=True)
+                process.start()
+                child_conn.close()
+                self._pipes.append(parent_conn)
+                self._processes.append(process)
+        else:
+            self.observations = np.zeros((num_envs, OBSERVATION_SIZE), dtype=np.float32)
+            self.action_masks = np.zeros((num_envs, ACTION_SIZE), dtype=bool)
+            self.rewards = np.zeros(num_envs, dtype=np.float32)
+            self.dones = np.zeros(num_envs, dtype=bool)
+            self.envs = [AssholeEnv(**env_kwargs) for _ in range(num_envs)]
+
+    def reset(self, seed=None):
+        """Resets every sub-environment. Returns (observations, action_masks)."""
+        if seed is not None:
+            self._seed_rng = random.Random(seed)
+        seeds = [self._seed_rng.getrandbits(32) for _ in range(self.num_envs)]
+        if self.num_workers:
+            self._call_workers('reset', [seeds[start:stop] for start, stop in self._slices])
+        else:
+            _reset_envs(self.envs, seeds, self.observations, self.action_masks)
+        self.rewards.fill(0.0)
+        self.dones.fill(False)
+        return self.observations, self.action_masks
+
+    def step(self, actions):
+        """Applies one action per sub-environment. Returns (observations, rewards, dones, action_masks)."""
+        actions = np.asarray(actions)
+        if self.num_workers:
+            self._call_workers('step', [actions[start:stop] for start, stop in self._slices])
+        else:
+            _step_envs(self.envs, actions, self.observations, self.rewards, self.dones, self.action_masks)
+        return self.observations, self.rewards, self.dones, self.action_masks
+
+    def close(self):
+        if self.num_workers:
+            for pipe in self._pipes:
+                try:
+                    pipe.send(('close', None))
+                except (BrokenPipeError, OSError):
+                    pass
+            for process in self._processes:
+                process.join(timeout=5)
+            self._pipes = []
+            self._processes = []
+            self.num_workers = 0
+
+    def _call_workers(self, command, payloads):
+        # Send to every worker before waiting on any, so the slices run in parallel.
+        for pipe, payload in zip(self._pipes, payloads):
+            pipe.send((command, payload))
+        errors = [reply for reply in (pipe.recv() for pipe in self._pipes) if reply != 'ok']
+        if errors:
+            raise ValueError(f"Worker failed during {command}: {errors[0]}")
+
+
+def _shared_views(shared, num_envs):
+    return (
+        np.frombuffer(shared['observations'], dtype=np.float32).reshape(num_envs, OBSERVATION_SIZE),
+        np.frombuffer(shared['action_masks'], dtype=bool).reshape(num_envs, ACTION_SIZE),
+        np.frombuffer(shared['rewards'], dtype=np.float32),
+        np.frombuffer(shared['dones'], dtype=bool),
+    )
+
+
+def _reset_envs(envs, seeds, observations, action_masks):
+    for i, env in enumerate(envs):
+        env.reset(seed=seeds[i], obs_out=observations[i], mask_out=action_masks[i])
+
+
+def _step_envs(envs, actions, observations, rewards, dones, action_masks):
+    for i, env in enumerate(envs):
+        _, reward, done, _ = env.step(actions[i], obs_out=observations[i], mask_out=action_masks[i])
+        rewards[i] = reward
+        dones[i] = done
+        if done:
+            env.reset(obs_out=observations[i], mask_out=action_masks[i])
+
+
+def _worker_loop(conn, shared, num_envs, start, stop, env_kwargs):
+    """Owns the sub-environments [start, stop) of a VectorAssholeEnv."""
+    observations, action_masks, rewards, dones = _shared_views(shared, num_envs)
+    observations, action_masks = observations[start:stop], action_masks[start:stop]
+    rewards, dones = rewards[start:stop], dones[start:stop]
+    envs = [AssholeEnv(**env_kwargs) for _ in range(stop - start)]
+    while True:
+        command, payload = conn.recv()
+        if command == 'close':
+            break
+        try:
+            if command == 'reset':
+                _reset_envs(envs, payload, observations, action_masks)
+            elif command == 'step':
+                _step_envs(envs, payload, observations, rewards, dones, action_masks)
+            conn.send('ok')
+        except Exception as e:
+            conn.send(f"{type(e).__name__}: {e}")
+    conn.close()
+
+
+def sample_legal_actions(action_masks, rng):
+    """Picks a uniformly random legal action for every row of a mask batch."""
+    return np.argmax(rng.random(action_masks.shape) * action_masks, axis=1)
+
+
+def measure_throughput(vector_env, num_steps=200, seed=0):
+    """Steps the vector env with random legal actions and returns env-steps per second."""
+    rng = np.random.default_rng(seed)
+    _, masks = vector_env.reset(seed=seed)
+    started_at = time.perf_counter()
+    for _ in range(num_steps):
+        _, _, _, masks = vector_env.step(sample_legal_actions(masks, rng))
+    elapsed = time.perf_counter() - started_at
+    return num_steps * vector_env.num_envs / elapsed
+
+
+if __name__ == "__main__":
+    for workers in (0, max(1, multiprocessing.cpu_count() // 2), multiprocessing.cpu_count()):
+        env = VectorAssholeEnv(num_envs=64, num_workers=workers, seed=0)
+        try:
+            print(f"workers={workers}: {measure_throughput(env):.0f} env-steps/s")
+        finally:
+            env.close()
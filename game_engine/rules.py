@@ -0,0 +1,83 @@
+from game_engine.card import Card, Rank
+
+# How play_cards treats a rank; AssholeGame maps each kind to a handler.
+CLEAR = 'clear'
+THREES = 'threes'
+STANDARD = 'standard'
+
+
+class RuleSet:
+    """
+    House rules for one AssholeGame room.
+
+    clear_rank:       Rank that clears the pile whenever it is played (None for no clear card).
+    three_interrupts: A single 3 opens a three-play window and two 3s clear the pile.
+    bombs:            Completing four of a kind clears the pile, and other players may bomb.
+    skips:            Matching the rank on the pile skips the next player.
+    double_clears:    Two of a rank on two of the same rank clears the pile.
+    card_exchange:    Between rounds of a match, the Asshole and President trade cards.
+
+    The rules are compiled once, in the constructor, into `rank_kinds`: the kind of
+    handler each rank dispatches to. A RuleSet is never changed after it is built.
+    """
+
+    FIELDS = ('clear_rank', 'three_interrupts', 'bombs', 'skips', 'double_clears', 'card_exchange')
+
+    def __init__(self, clear_rank=Rank.TWO, three_interrupts=True, bombs=True, skips=True, double_clears=True,
+                 card_exchange=True):
+        if clear_rank is not None and clear_rank not in Rank.all_ranks():
+            raise ValueError(f"Invalid clear rank: {clear_rank}. Must be one of {Rank.all_ranks()} or None.")
+        if clear_rank == Rank.THREE and three_interrupts:
+            raise ValueError("3s cannot be the clear card while 3-interrupts are enabled.")
+        self.clear_rank = clear_rank
+        self.three_interrupts = bool(three_interrupts)
+        self.bombs = bool(bombs)
+        self.skips = bool(skips)
+        self.double_clears = bool(double_clears)
+        self.card_exchange = bool(card_exchange)
+        self.rank_kinds = self._compile()
+
+    def _compile(self):
+        rank_kinds = {rank: STANDARD for rank in Rank.all_ranks()}
+        if self.three_interrupts:
+            rank_kinds[Rank.THREE] = THREES
+        if self.clear_rank is not None:
+            rank_kinds[self.clear_rank] = CLEAR
+        return rank_kinds
+
+    @property
+    def clear_rank_value(self):
+        return Card._numeric_rank_map[self.clear_rank] if self.clear_rank is not None else None
+
+    @property
+    def has_special_cards(self):
+        return self.clear_rank is not None or self.three_interrupts
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Builds a RuleSet from a JSON-style dict, e.g. a create_room request. Missing fields keep their defaults."""
+        if data is None:
+            return cls()
+        if not isinstance(data, dict):
+            raise ValueError("Rules must be an object.")
+        unknown = set(data) - set(cls.FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown rules: {', '.join(sorted(unknown))}.")
+        return cls(**data)
+
+    def __eq__(self, other):
+        if not isinstance(other, RuleSet):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __hash__(self):
+        return hash(tuple(self.to_dict().values()))
+
+    def __repr__(self):
+        return f"RuleSet({', '.join(f'{name}={value!r}' for name, value in self.to_dict().items())})"
+
+
+DEFAULT_RULES = RuleSet()
@@ -0,0 +1,182 @@
+import contextlib
+import random
+
+from game_engine.clock import ManualClock
+from game_engine.games.asshole import AssholeGame
+from game_engine.player import Player
+
+# Hard stop for a single simulated game; real games finish in a few hundred decisions.
+DEFAULT_MAX_STEPS = 2000
+
+
+def create_simulated_game(num_players=4, seed=None, clock=None, rules=None, ledger=None):
+    """
+    Creates and starts a headless AssholeGame with placeholder players.
+    Simulated games run on a ManualClock unless given a clock, so timed
+    interrupt windows never depend on how fast the simulation runs.
+    `rules` is an optional RuleSet of house rules and `ledger` an optional CardLedger.
+    """
+    # A seed gets the game its own generator, so the process-wide one is left alone.
+    rng = random.Random(seed) if seed is not None else None
+    game = AssholeGame(room_code="SIM", clock=clock if clock is not None else ManualClock(), rules=rules, ledger=ledger,
+                       rng=rng)
+    with quiet_engine():
+        for seat in range(num_players):
+            game.add_player(Player(f"Bot {seat + 1}", player_id=f"bot-{seat + 1}"))
+        game.start_game()
+    return game
+
+
+class _NullWriter:
+    def write(self, text):
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+_null_writer = _NullWriter()
+
+
+def quiet_engine():
+    """Silences the engine's debug prints, which dominate the cost of a simulated turn."""
+    return contextlib.redirect_stdout(_null_writer)
+
+
+def next_interrupt_responder(game):
+    """Returns the next player who still owes a response to the open interrupt, or None."""
+    for player in game.players:
+        if player.player_id == game.interrupt_initiator_player_id or player.is_out:
+            continue
+        if player.player_id not in game.players_responded_to_interrupt:
+            return player
+    return None
+
+
+def pending_decision(game):
+    """
+    Returns (player, is_interrupt_response) for whoever must decide next.
+    player is None when the engine only needs housekeeping (see advance_without_decision).
+    """
+    if game.interrupt_active:
+        return next_interrupt_responder(game), True
+    player = game.get_current_player()
+    if not player.get_hand().cards:
+        return None, False
+    return player, False
+
+
+def advance_without_decision(game):
+    """Moves the game on when nobody has a decision to make."""
+    if game.interrupt_active:
+        # Everyone has responded but the engine did not resolve the window itself.
+        game.resolve_interrupt()
+    else:
+        # A player who clears the pile with their last card keeps the lead; hand it on.
+        game.advance_turn()
+
+
+def apply_decision(game, player, is_interrupt_response, cards):
+    """
+    Applies a player's decision: cards to play or bid, or None to pass.
+    A rejected interrupt bid counts as a pass, because the engine has already
+    marked the responder as having responded.
+    """
+    cards_data = [card.to_dict() for card in cards] if cards else None
+    if is_interrupt_response:
+        try:
+            game.submit_interrupt_bid(player.player_id, cards_data)
+        except ValueError:
+            return None
+    elif cards_data:
+        game.play_cards(player.player_id, cards_data)
+    else:
+        game.pass_turn(player.player_id)
+    return cards
+
+
+def play_step(game, policy, recorder=None):
+    """
+    Applies one decision to the game: an interrupt response, a play or a pass.
+    `policy` is either a single policy for every seat or a dict keyed by player ID.
+    If a recorder is given (see rl.dataset.TrajectoryWriter), the decision is
+    recorded before it is applied.
+    Returns (player, action), where action is the list of cards played/bid or None for a pass.
+    """
+    player, is_interrupt_response = pending_decision(game)
+    if player is None:
+        advance_without_decision(game)
+        return None, None
+
+    seat_policy = _policy_for(policy, player)
+    if is_interrupt_response:
+        cards = seat_policy.choose_interrupt_bid(game, player)
+    else:
+        cards = seat_policy.choose_play(game, player)
+    if recorder is not None:
+        recorder.record(game, player, is_interrupt_response, cards)
+    return player, apply_decision(game, player, is_interrupt_response, cards)
+
+
+def run_headless_game(game, policy, max_steps=DEFAULT_MAX_STEPS, recorder=None):
+    """
+    Drives a started game to the end with bot decisions. Returns the number of steps taken.
+    An optional recorder receives every decision point and is told when the game ends.
+    """
+    steps = 0
+    with quiet_engine():
+        while not game.is_game_over and steps < max_steps:
+            play_step(game, policy, recorder)
+            steps += 1
+    if recorder is not None:
+        recorder.end_game(game)
+    return steps
+
+
+def get_final_standings(game):
+    """
+    Returns player IDs from President to Asshole.
+    Players who never went out are ordered by cards left, fewest first.
+    """
+    return game.get_finishing_order()
+
+
+def finishing_reward(game, player_id):
+    """+1 for President, -1 for Asshole, linear in between."""
+    player = game.get_player_by_id(player_id)
+    if player.rank is not None:
+        position = player.rank - 1
+    else:
+        position = get_final_standings(game).index(player_id)
+    return 1.0 - 2.0 * position / (len(game.players) - 1)
+
+
+def sweep_rule_variants(variants, policy_factory, num_games=100, num_players=4, seed=0):
+    """
+    Plays the same `num_games` deals under each RuleSet in `variants`.
+    `policy_factory(seed)` returns a fresh policy for one game.
+    Returns one summary per variant, in order: mean decisions per game and how
+    often the player dealt the first turn finished as President.
+    """
+    summaries = []
+    for rules in variants:
+        total_steps = 0
+        leader_wins = 0
+        for game_seed in range(seed, seed + num_games):
+            game = create_simulated_game(num_players, seed=game_seed, rules=rules)
+            leader_id = game.get_current_player().player_id
+            total_steps += run_headless_game(game, policy_factory(game_seed))
+            leader_wins += get_final_standings(game)[0] == leader_id
+        summaries.append({
+            'rules': rules.to_dict(),
+            'games': num_games,
+            'mean_steps': total_steps / num_games,
+            'leader_win_rate': leader_wins / num_games,
+        })
+    return summaries
+
+
+def _policy_for(policy, player):
+    if isinstance(policy, dict):
+        return policy[player.player_id]
+    return policy
@@ -0,0 +1,207 @@
+import copy
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from game_engine.bots.heuristic import HeuristicPolicy
+from game_engine.simulation import run_headless_game, get_final_standings
+
+
+def determinize(game, rng, viewer_id=None):
+    """
+    Returns a copy of the game whose hidden cards are re-dealt at random.
+
+    Everything public is kept: the pile, the discard pile, every hand size and
+    any cards already shown in interrupt bids. If viewer_id is given, that
+    player's own hand is kept as well.
+    """
+    sample = copy.deepcopy(game)
+    shown_in_bids = {}
+    for bid in sample.interrupt_bids:
+        shown_in_bids.setdefault(bid['player_id'], []).extend(bid['cards'])
+
+    hidden_cards = []
+    hidden_slots = []
+    for player in sample.players:
+        if player.player_id == viewer_id:
+            continue
+        shown = list(shown_in_bids.get(player.player_id, []))
+        kept = []
+        for card in player.get_hand().cards:
+            if card in shown:
+                shown.remove(card)
+                kept.append(card)
+            else:
+                hidden_cards.append(card)
+        hidden_slots.append((player, kept, len(player.get_hand().cards) - len(kept)))
+
+    rng.shuffle(hidden_cards)
+    for player, kept, hidden_count in hidden_slots:
+        player.get_hand().cards = kept + hidden_cards[:hidden_count]
+        hidden_cards = hidden_cards[hidden_count:]
+
+    sample.state_hash = sample.compute_state_hash()
+    return sample
+
+
+def run_rollouts(game, num_samples, seed, viewer_id=None, weights=None):
+    """
+    Plays num_samples determinizations of the game to the end.
+    Returns {player_id: [president_count, asshole_count]}. Runs inside pool workers.
+    """
+    rng = random.Random(seed)
+    policy = HeuristicPolicy(weights=weights, rng=rng)
+    counts = {p.player_id: [0, 0] for p in game.players}
+    for _ in range(num_samples):
+        sample = determinize(game, rng, viewer_id=viewer_id)
+        run_headless_game(sample, policy)
+        standings = get_final_standings(sample)
+        counts[standings[0]][0] += 1
+        counts[standings[-1]][1] += 1
+    return counts
+
+
+class WinProbabilityService:
+    """
+    Estimates each seat's chance of finishing President or Asshole by Monte Carlo rollouts.
+
+    Rollouts run in a bounded process pool. Estimates are cached by state hash
+    and topped up with another batch each time the same state is requested, so
+    they get sharper while a player is thinking. Results are handed to `publish`
+    at most once per `min_publish_interval` seconds per room. Requests are
+    dropped, never queued, while every worker is busy, so the turn-processing
+    path never waits on this service.
+    """
+
+    def __init__(self, max_workers=2, samples_per_batch=32, target_samples=256, cache_size=512,
+                 min_publish_interval=1.0, publish=None, executor=None):
+        self.max_workers = max_workers
+        self.samples_per_batch = samples_per_batch
+        self.target_samples = target_samples
+        self.cache_size = cache_size
+        self.min_publish_interval = min_publish_interval
+        self.publish = publish
+        self._executor = executor
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()  # state_hash -> {'samples': int, 'counts': {player_id: [president, asshole]}}
+        self._in_flight = 0
+        self._last_published_at = {}
+        self._pending_publish = {}
+        self._seed = random.Random()
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def get_estimate(self, state_hash):
+        """Returns the cached estimate for a state, or None."""
+        with self._lock:
+            entry = self._cache.get(state_hash)
+            if entry is None:
+                return None
+            self._cache.move_to_end(state_hash)
+            return self._format_estimate(state_hash, entry)
+
+    def estimate(self, game, num_samples=None):
+        """Runs rollouts in-process and returns the merged estimate. Meant for post-game review and tests."""
+        counts = run_rollouts(game, num_samples or self.samples_per_batch, self._seed.getrandbits(32))
+        return self._merge(game.room_code, game.state_hash, counts, num_samples or self.samples_per_batch)
+
+    def request_update(self, game):
+        """
+        Schedules another batch of rollouts for the game's current state if it still needs samples.
+        Returns the current cached estimate (possibly None) without waiting.
+        """
+        if game.is_game_over or not game.is_game_started:
+            return None
+        state_hash = game.state_hash
+        with self._lock:
+            entry = self._cache.get(state_hash)
+            needs_samples = entry is None or entry['samples'] < self.target_samples
+            if not needs_samples or self._in_flight >= self.max_workers:
+                needs_samples = False
+            else:
+                self._in_flight += 1
+        if needs_samples:
+            room_code = game.room_code
+            try:
+                # Snapshot now: the live game keeps changing while the batch waits to be pickled.
+                future = self._get_executor().submit(
+                    run_rollouts, copy.deepcopy(game), self.samples_per_batch, self._seed.getrandbits(32)
+                )
+            except Exception as e:
+                with self._lock:
+                    self._in_flight -= 1
+                print(f"WARNING: Could not schedule win probability rollouts for room {room_code}: {e}")
+            else:
+                future.add_done_callback(lambda f: self._on_batch_done(room_code, state_hash, f))
+        self.flush_pending()
+        return self.get_estimate(state_hash)
+
+    def _on_batch_done(self, room_code, state_hash, future):
+        with self._lock:
+            self._in_flight -= 1
+        if future.cancelled() or future.exception() is not None:
+            print(f"WARNING: Win probability rollout failed for room {room_code}: {future.exception() if not future.cancelled() else 'cancelled'}")
+            return
+        self._merge(room_code, state_hash, future.result(), self.samples_per_batch)
+
+    def _merge(self, room_code, state_hash, counts, num_samples):
+        with self._lock:
+            entry = self._cache.get(state_hash)
+            if entry is None:
+                entry = {'samples': 0, 'counts': {player_id: [0, 0] for player_id in counts}}
+                self._cache[state_hash] = entry
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+            self._cache.move_to_end(state_hash)
+            entry['samples'] += num_samples
+            for player_id, (president, asshole) in counts.items():
+                entry['counts'][player_id][0] += president
+                entry['counts'][player_id][1] += asshole
+            estimate = self._format_estimate(state_hash, entry)
+            if self.publish is not None:
+                self._pending_publish[room_code] = estimate
+        self.flush_pending()
+        return estimate
+
+    def flush_pending(self):
+        """Publishes the latest estimate of each room whose throttle window has passed."""
+        if self.publish is None:
+            return
+        now = time.monotonic()
+        ready = []
+        with self._lock:
+            for room_code, estimate in list(self._pending_publish.items()):
+                if now - self._last_published_at.get(room_code, float('-inf')) >= self.min_publish_interval:
+                    self._last_published_at[room_code] = now
+                    ready.append((room_code, estimate))
+                    del self._pending_publish[room_code]
+        for room_code, estimate in ready:
+            self.publish(room_code, estimate)
+
+    def forget_room(self, room_code):
+        """Drops throttle bookkeeping for a room that no longer exists."""
+        with self._lock:
+            self._last_published_at.pop(room_code, None)
+            self._pending_publish.pop(room_code, None)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    @staticmethod
+    def _format_estimate(state_hash, entry):
+        samples = entry['samples']
+        return {
+            'state_hash': format(state_hash, '016x'),
+            'samples': samples,
+            'players': {
+                player_id: {'president': president / samples, 'asshole': asshole / samples}
+                for player_id, (president, asshole) in entry['counts'].items()
+            },
+        }
@@ -0,0 +1,76 @@
+import hashlib
+
+from .card import Card
+
+PILE = "pile"
+DISCARD = "discard"
+
+
+class ZobristKeys:
+    """
+    Deterministic 64-bit Zobrist keys for card locations and game attributes.
+
+    Keys are derived from a seeded BLAKE2b digest instead of a random generator,
+    so every process (API worker, simulator, replay tool) agrees on the same
+    hash for the same game state.
+    """
+
+    def __init__(self, seed="cards-game-engine"):
+        self.seed = seed
+        self._keys = {}
+
+    def _derive(self, *parts):
+        material = "|".join([self.seed] + [str(part) for part in parts]).encode()
+        return int.from_bytes(hashlib.blake2b(material, digest_size=8).digest(), "big")
+
+    def _key(self, *parts):
+        key = self._keys.get(parts)
+        if key is None:
+            key = self._derive(*parts)
+            self._keys[parts] = key
+        return key
+
+    def card_key(self, card: Card, location):
+        """Key for a card sitting at a location (a seat index, PILE or DISCARD)."""
+        return self._key("card", card.suit, card.rank, location)
+
+    def move_key(self, card: Card, from_location, to_location):
+        """XOR delta for moving a card between two locations."""
+        return self.card_key(card, from_location) ^ self.card_key(card, to_location)
+
+    def seat_out_key(self, seat_index):
+        """Key for a seat whose player is no longer active."""
+        return self._key("seat_out", seat_index)
+
+    def attribute_key(self, name, value):
+        """Key for a scalar game attribute. Unset (None) attributes contribute nothing."""
+        if value is None:
+            return 0
+        return self._key("attr", name, value)
+
+
+zobrist_keys = ZobristKeys()
+
+
+class HashedAttribute:
+    """
+    Data descriptor that folds every assignment into the owner's ``state_hash``.
+
+    The owner must define ``state_hash`` before the first assignment. Updating
+    the hash costs two key lookups and an XOR, whatever the size of the game.
+    """
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.storage_name = "_" + name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return obj.__dict__.get(self.storage_name)
+
+    def __set__(self, obj, value):
+        previous = obj.__dict__.get(self.storage_name)
+        if previous != value:
+            obj.state_hash ^= zobrist_keys.attribute_key(self.name, previous) ^ zobrist_keys.attribute_key(self.name, value)
+        obj.__dict__[self.storage_name] = value
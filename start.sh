@@ -1,10 +1,58 @@
 #!/bin/sh
 set -e
 
+# Sharded mode: SHARD_COUNT game processes on SHARD_HOST ports PORT+1.., each owning the rooms whose
+# code hashes to it, behind a router on PORT. Socket.IO goes through the router too, pinned by room_code.
+# Only the router listens publicly; if any process exits, the others are stopped and the script fails.
+if [ "${SHARD_COUNT:-1}" -gt 1 ]; then
+  SHARD_HOST="${SHARD_HOST:-127.0.0.1}"
+  SHARD_URLS=""
+  i=0
+  while [ "$i" -lt "$SHARD_COUNT" ]; do
+    SHARD_URLS="${SHARD_URLS:+$SHARD_URLS,}http://$SHARD_HOST:$((PORT + 1 + i))"
+    i=$((i + 1))
+  done
+  export SHARD_URLS
+  export SHARD_BUS_TOKEN="${SHARD_BUS_TOKEN:-$(head -c 16 /dev/urandom | od -An -tx1 | tr -d ' \n')}"
+
+  pids=""
+  trap 'kill $pids 2>/dev/null' EXIT
+  trap 'exit 143' INT TERM
+
+  i=0
+  while [ "$i" -lt "$SHARD_COUNT" ]; do
+    SHARD_INDEX=$i gunicorn --bind "$SHARD_HOST:$((PORT + 1 + i))" \
+      --worker-class eventlet \
+      --workers 1 \
+      --threads 8 \
+      --timeout 0 \
+      "api.api:app" &
+    pids="$pids $!"
+    i=$((i + 1))
+  done
+
+  gunicorn --bind "0.0.0.0:$PORT" \
+    --worker-class eventlet \
+    --workers 2 \
+    --timeout 0 \
+    "api.sharding:create_router_app()" &
+  pids="$pids $!"
+
+  while true; do
+    for pid in $pids; do
+      if ! kill -0 "$pid" 2>/dev/null; then
+        echo "Process $pid exited; stopping the sharded deployment." >&2
+        exit 1
+      fi
+    done
+    sleep 1
+  done
+fi
+
 # Run Gunicorn with the correct port from the environment variable
 exec gunicorn --bind "0.0.0.0:$PORT" \
   --worker-class eventlet \
   --workers 1 \
   --threads 8 \
   --timeout 0 \
-  "api.api:app"
\ No newline at end of file
+  "api.api:app"
@@ -1,17 +1,23 @@
+import time
 import pytest
 import unittest.mock as mock
 from flask import Flask
-from api.api import app, active_games, player_to_room_map, COGNITO_USER_POOL_ID, COGNITO_APP_CLIENT_ID
+from api.api import app, active_games, player_to_room_map, broadcast_coalescer, COGNITO_USER_POOL_ID, COGNITO_APP_CLIENT_ID
 from game_engine.games.asshole import AssholeGame
 from game_engine.player import Player
 from game_engine.card import Card
+from game_engine.rules import RuleSet
+from api.state_sync import GameStateSync
+from api.lobby import LobbyFeed
+from api.room_directory import RoomDirectory
 from unittest.mock import MagicMock, patch
 
 class MockGame:
-    def __init__(self, room_code, host_id, game_type):
+    def __init__(self, room_code, host_id, game_type, rules=None):
         self.room_code = room_code
         self.host_id = host_id
         self.game_type = game_type
+        self.rules = rules if rules is not None else RuleSet()
         self.players = []
         self.is_game_started = False
         self.status = "WAITING_FOR_PLAYERS"
@@ -32,6 +38,9 @@ class MockGame:
         self.interrupt_type = None
         self.interrupt_initiator_player_id = None
         self.interrupt_rank = None
+        self.state_hash = 0
+        self.round_number = 0
+        self.last_exchange = []
 
     def add_player(self, player):
         self.players.append(player)
@@ -49,6 +58,10 @@ class MockGame:
         self.is_game_started = True
         self.status = "IN_PROGRESS"
         self.current_turn_player_id = self.players[0].player_id
+        self.round_number += 1
+
+    def start_next_round(self):
+        self.start_game()
 
     def get_current_player(self):
         return self.get_player_by_id(self.current_turn_player_id)
@@ -71,6 +84,19 @@ class MockGame:
     def submit_interrupt_bid(self, player_id, cards_data):
         pass
 
+    def is_interrupt_expired(self):
+        return False
+
+    def validate_play(self, player_id, cards_to_play):
+        if player_id != self.current_turn_player_id:
+            raise ValueError("It's not this player's turn.")
+        return []
+
+    def validate_bid(self, player_id, cards_data=None):
+        if not self.interrupt_active:
+            raise ValueError("No interrupt is currently active.")
+        return []
+
 @pytest.fixture
 def client():
     # Use the test client for the Flask app
@@ -84,7 +110,11 @@ def mock_dependencies():
          patch('api.api.socketio', new=MagicMock()) as mock_socketio, \
          patch('api.api.db_client', new=MagicMock()) as mock_db_client, \
          patch('api.api.user_service', new=MagicMock()) as mock_user_service, \
-         patch('api.api.game_history_service', new=MagicMock()) as mock_game_history_service:
+         patch('api.api.game_history_service', new=MagicMock()) as mock_game_history_service, \
+         patch('api.api.state_sync', new=GameStateSync()), \
+         patch('api.api.lobby_feed', new=LobbyFeed()), \
+         patch('api.api.room_directory', new=RoomDirectory()), \
+         patch.object(broadcast_coalescer, 'running', False):
         
         active_games.clear()
         player_to_room_map.clear()
@@ -135,6 +165,21 @@ def test_create_room_success(mock_uuid, mock_gen_code, client, mock_dependencies
     assert active_games['ABCD'].players[0].player_id == 'test_player_id'
     assert active_games['ABCD'].status == "WAITING_FOR_PLAYERS"
 
+@mock.patch('api.api.generate_unique_room_code', return_value='ABCD')
+def test_create_room_with_house_rules(mock_gen_code, client, mock_dependencies):
+    mock_dependencies['user_service'].get_or_create_user.return_value = {'id': 'p', 'username': 'TestPlayer'}
+    response = client.post('/create_room', json={'player_name': 'TestPlayer', 'game_type': 'asshole',
+                                                 'rules': {'bombs': False, 'clear_rank': 'A'}})
+    assert response.status_code == 201
+    assert active_games['ABCD'].rules == RuleSet(bombs=False, clear_rank='A')
+    assert response.get_json()['game_state']['rules']['clear_rank'] == 'A'
+
+def test_create_room_invalid_rules(client, mock_dependencies):
+    response = client.post('/create_room', json={'player_name': 'TestPlayer', 'game_type': 'asshole',
+                                                 'rules': {'jokers': True}})
+    assert response.status_code == 400
+    assert 'Unknown rules: jokers' in response.get_json()['message']
+
 def test_create_room_no_player_name(client, mock_dependencies):
     response = client.post('/create_room', json={'player_name': '', 'game_type': 'asshole'})
     assert response.status_code == 400
@@ -199,4 +244,431 @@ def test_join_room_http_room_full(client, mock_dependencies):
     player_to_room_map['player1'] = 'ABD2'
     response = client.post('/join_room', json={'room_code': 'ABD2', 'player_name': 'TestPlayer'})
     assert response.status_code == 400
-    assert 'already in another game' in response.get_json()['error'] """
\ No newline at end of file
+    assert 'already in another game' in response.get_json()['error'] """
+
+def test_add_bot_success(client, mock_dependencies):
+    game = create_test_game()
+    response = client.post('/add_bot', json={'room_code': 'ABCD', 'player_id': 'player1'})
+    assert response.status_code == 200
+    assert len(game.players) == 2
+    assert game.players[1].is_bot
+    assert response.get_json()['bot_player_id'] == game.players[1].player_id
+
+def test_add_bot_requires_host(client, mock_dependencies):
+    create_test_game()
+    response = client.post('/add_bot', json={'room_code': 'ABCD', 'player_id': 'someone_else'})
+    assert response.status_code == 403
+    assert 'Only the host' in response.get_json()['error']
+
+def test_add_bot_room_full(client, mock_dependencies):
+    game = create_test_game()
+    game.MAX_PLAYERS = 1
+    response = client.post('/add_bot', json={'room_code': 'ABCD', 'player_id': 'player1'})
+    assert response.status_code == 400
+    assert 'room is full' in response.get_json()['error']
+
+def test_bot_metrics(client, mock_dependencies):
+    response = client.get('/bot_metrics')
+    assert response.status_code == 200
+    assert 'decisions_applied' in response.get_json()['broker']
+
+
+def test_validate_play_reports_illegal_play_without_broadcast(client, mock_dependencies):
+    game = create_test_game()
+    game.start_game()
+    response = client.post('/validate_play', json={'room_code': 'ABCD', 'player_id': 'someone_else', 'cards': []})
+    assert response.status_code == 200
+    assert response.get_json()['valid'] is False
+    assert "not this player's turn" in response.get_json()['error']
+    mock_dependencies['socketio'].emit.assert_not_called()
+
+def test_validate_play_accepts_legal_play(client, mock_dependencies):
+    game = create_test_game()
+    game.start_game()
+    response = client.post('/validate_play', json={'room_code': 'ABCD', 'player_id': 'player1', 'cards': []})
+    assert response.get_json() == {'success': True, 'valid': True}
+
+def test_validate_bid_room_not_found(client, mock_dependencies):
+    response = client.post('/validate_bid', json={'room_code': 'WXYZ', 'player_id': 'player1'})
+    assert response.status_code == 404
+
+def test_admin_game_history_requires_configured_token(client, mock_dependencies):
+    create_test_game()
+    with patch('api.api.ADMIN_TOKEN', None):
+        assert client.get('/admin/game_history?room_code=ABCD').status_code == 403
+    with patch('api.api.ADMIN_TOKEN', 'secret'):
+        response = client.get('/admin/game_history?room_code=ABCD', headers={'X-Admin-Token': 'wrong'})
+        assert response.status_code == 403
+
+def test_admin_game_history_rebuilds_a_past_move(client, mock_dependencies):
+    # Arrange: a real game with history, two moves in
+    from game_engine.history import GameHistory
+    from game_engine.simulation import create_simulated_game, play_step, quiet_engine
+    from game_engine.bots.heuristic import HeuristicPolicy
+    game = create_simulated_game(4, seed=3)
+    history = GameHistory(checkpoint_interval=1)
+    history.attach(game)
+    with quiet_engine():
+        play_step(game, HeuristicPolicy())
+        first_move_hash = format(game.state_hash, '016x')
+        play_step(game, HeuristicPolicy())
+    active_games['SIM'] = game
+
+    # Act
+    with patch('api.api.ADMIN_TOKEN', 'secret'):
+        response = client.get('/admin/game_history?room_code=SIM&move=1', headers={'X-Admin-Token': 'secret'})
+        too_old = client.get('/admin/game_history?room_code=SIM&move=99', headers={'X-Admin-Token': 'secret'})
+
+    # Assert
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['history']['moves'] == 2
+    assert data['state']['state_hash'] == first_move_hash
+    assert [action['move'] for action in data['actions']] == [0]
+    assert len(data['state']['players'][0]['hand']) > 0
+    assert too_old.status_code == 400
+
+def test_start_game_round_starts_a_rematch_after_game_over(client, mock_dependencies):
+    # Arrange
+    game = create_test_game()
+    game.add_player(Player(name='Guest', player_id='player2'))
+    game.start_game()
+    game.is_game_over = True
+
+    # Act
+    with patch.object(MockGame, 'start_next_round', autospec=True) as mock_next_round:
+        response = client.post('/start_game_round', json={'room_code': 'ABCD', 'player_id': 'player1'})
+
+    # Assert
+    assert response.status_code == 200
+    mock_next_round.assert_called_once_with(game)
+
+def test_broadcast_builds_public_state_once_and_adds_each_hand(client, mock_dependencies):
+    # Arrange
+    import api.api as api_module
+    game = create_test_game()
+    for i in range(2, 5):
+        game.add_player(Player(name=f'Guest {i}', player_id=f'player{i}'))
+    for i, player in enumerate(game.players):
+        player.get_hand().cards = [Card("H", str(i + 2))]
+
+    # Act
+    with patch.dict(api_module.player_id_map, {p.player_id: f'sid-{p.player_id}' for p in game.players}), \
+         patch('api.api._get_public_game_state', wraps=api_module._get_public_game_state) as public_state:
+        api_module._send_game_state_update_to_room_players(game)
+
+    # Assert
+    assert public_state.call_count == 1
+    payloads = {call.kwargs['room']: call.args[1] for call in mock_dependencies['socketio'].emit.call_args_list
+                if call.args[0] == 'game_state_update'}
+    assert len(payloads) == 4
+    assert payloads['sid-player3']['your_hand'][0]['rank'] == '4'
+    assert payloads['sid-player3']['all_players_data'] == payloads['sid-player1']['all_players_data']
+
+def test_broadcast_sends_deltas_after_client_acks(client, mock_dependencies):
+    # Arrange
+    import api.api as api_module
+    game = create_test_game()
+    game.add_player(Player(name='Guest', player_id='player2'))
+    game.players[0].get_hand().cards = [Card("H", "5"), Card("S", "9")]
+    socketio_emit = mock_dependencies['socketio'].emit
+
+    # Act
+    with patch.dict(api_module.player_id_map, {'player1': 'sid-1', 'player2': 'sid-2'}):
+        api_module._send_game_state_update_to_room_players(game)
+        first = next(c.args[1] for c in socketio_emit.call_args_list if c.kwargs['room'] == 'sid-1')
+        api_module.state_sync.ack('ABCD', 'player1', first['state_version'])
+        socketio_emit.reset_mock()
+        played = game.players[0].get_hand().cards.pop(0)
+        game.pile.append(played)
+        game.game_message = 'player1 played a 5'
+        api_module._send_game_state_update_to_room_players(game)
+
+    # Assert
+    sent = {c.kwargs['room']: c.args for c in socketio_emit.call_args_list}
+    event, delta = sent['sid-1']
+    assert event == 'game_state_delta'
+    assert delta['base_version'] == first['state_version']
+    assert delta['state_version'] == first['state_version'] + 1
+    assert delta['changes']['game_message'] == 'player1 played a 5'
+    assert 'all_players_data' in delta['changes'] and 'room_code' not in delta['changes']
+    assert [card['rank'] for card in delta['pile_appended']] == ['5']
+    assert delta['hand_removed'] == [played.id]
+    assert sent['sid-2'][0] == 'game_state_update'  # Never acked, so still gets full snapshots
+
+def test_rejoin_snapshot_is_the_base_for_the_pending_broadcast(client, mock_dependencies):
+    # Arrange: a play is queued in the coalescer but not broadcast yet
+    import api.api as api_module
+    game = create_test_game()
+    game.players[0].get_hand().cards = [Card("H", "5"), Card("S", "9")]
+    socketio_emit = mock_dependencies['socketio'].emit
+    with patch.dict(api_module.player_id_map, {'player1': 'sid-1'}):
+        api_module._send_game_state_update_to_room_players(game)
+        api_module.state_sync.ack('ABCD', 'player1', 1)
+        game.pile.append(game.players[0].get_hand().cards.pop(0))
+        with patch.object(broadcast_coalescer, 'running', True):
+            api_module._send_game_state_update_to_room_players(game)
+        socketio_emit.reset_mock()
+
+        # Act
+        api_module._send_full_game_state(game, 'player1', 'sid-1')
+        event, snapshot = socketio_emit.call_args.args
+        api_module.state_sync.ack('ABCD', 'player1', snapshot['state_version'])
+        socketio_emit.reset_mock()
+        broadcast_coalescer.flush()
+        while broadcast_coalescer.is_pending('ABCD'):  # The broadcast runs on the room's queue
+            time.sleep(0.01)
+
+    # Assert
+    assert event == 'game_state_update'
+    assert snapshot['state_version'] == 2
+    assert [card['rank'] for card in snapshot['pile']] == ['5']
+    event, delta = next(c.args for c in socketio_emit.call_args_list if c.kwargs.get('room') == 'sid-1')
+    assert event == 'game_state_delta'
+    assert delta['base_version'] == 2
+    assert 'pile_appended' not in delta
+
+def test_game_state_returns_etag_and_304_until_room_changes(client, mock_dependencies):
+    # Arrange
+    import api.api as api_module
+    game = create_test_game()
+    api_module._send_game_state_update_to_room_players(game)
+    url = '/game_state?room_code=ABCD&player_id=player1'
+
+    # Act
+    first = client.get(url)
+    unchanged = client.get(url, headers={'If-None-Match': first.headers['ETag']})
+    api_module._send_game_state_update_to_room_players(game)
+    changed = client.get(url, headers={'If-None-Match': first.headers['ETag']})
+
+    # Assert
+    assert first.status_code == 200 and first.get_json()['state_version'] == 1
+    assert unchanged.status_code == 304 and unchanged.data == b''
+    assert changed.status_code == 200 and changed.get_json()['state_version'] == 2
+    assert changed.headers['ETag'] != first.headers['ETag']
+
+def test_game_state_is_read_on_the_room_command_queue(client, mock_dependencies):
+    # Arrange
+    import api.api as api_module
+    from api.room_actor import RoomCommandQueues
+    game = create_test_game()
+    api_module._send_game_state_update_to_room_players(game)
+    rooms = []
+    original = api_module._get_game_state_for_player
+
+    def recording_state(*args, **kwargs):
+        rooms.append(RoomCommandQueues.current_room())
+        return original(*args, **kwargs)
+
+    # Act
+    with patch('api.api._get_game_state_for_player', side_effect=recording_state):
+        response = client.get('/game_state?room_code=abcd&player_id=player1')
+
+    # Assert
+    assert rooms == ['ABCD']
+    assert response.headers['ETag'] == f'"{api_module.state_sync.etag("ABCD")}"'
+    assert response.get_json()['state_version'] == 1
+
+def test_game_state_long_poll_returns_when_room_changes(client, mock_dependencies):
+    # Arrange
+    import threading
+    import api.api as api_module
+    game = create_test_game()
+    api_module._send_game_state_update_to_room_players(game)
+    etag = client.get('/game_state?room_code=ABCD&player_id=player1').headers['ETag']
+    timer = threading.Timer(0.05, api_module._send_game_state_update_to_room_players, args=(game,))
+
+    # Act
+    timed_out = client.get('/game_state?room_code=ABCD&player_id=player1&wait=0.01', headers={'If-None-Match': etag})
+    timer.start()
+    woken = client.get('/game_state?room_code=ABCD&player_id=player1&wait=5', headers={'If-None-Match': etag})
+    timer.join()
+    bad_wait = client.get('/game_state?room_code=ABCD&player_id=player1&wait=soon')
+
+    # Assert
+    assert timed_out.status_code == 304
+    assert woken.status_code == 200 and woken.get_json()['state_version'] == 2
+    assert bad_wait.status_code == 400
+
+def test_lobby_gets_room_added_updated_and_removed(client, mock_dependencies):
+    # Arrange
+    import api.api as api_module
+    mock_dependencies['user_service'].get_user_profile.return_value = None
+    create_test_game()
+    socketio_emit = mock_dependencies['socketio'].emit
+
+    def lobby_updates():
+        updates = [c.args[1] for c in socketio_emit.call_args_list
+                   if c.args[0] == 'lobby_update' and c.kwargs['room'] == 'lobby']
+        socketio_emit.reset_mock()
+        return updates
+
+    # Act
+    api_module._send_lobby_update('ABCD')
+    created = lobby_updates()
+    client.post('/join_room', json={'room_code': 'ABCD', 'player_name': 'NewPlayer'})
+    joined = lobby_updates()
+    api_module._send_lobby_update('ABCD')
+    unchanged = lobby_updates()
+    client.post('/delete_room', json={'room_code': 'ABCD', 'player_id': 'player1'})
+    deleted = lobby_updates()
+
+    # Assert
+    assert [room['room_code'] for room in created[0]['added']] == ['ABCD']
+    assert joined[0]['updated'][0]['player_count'] == 2 and joined[0]['added'] == []
+    assert unchanged == []
+    assert deleted == [{'added': [], 'updated': [], 'removed': ['ABCD']}]
+    assert not any(c.args[0] == 'room_update' for c in socketio_emit.call_args_list)
+
+def test_rooms_lists_a_filtered_page_with_cursor(client, mock_dependencies):
+    # Arrange
+    import api.api as api_module
+    mock_dependencies['user_service'].get_user_profile.return_value = None
+    for room_code, host_id in [('AAAA', 'h1'), ('BBBB', 'h2'), ('CCCC', 'h3'), ('DDDD', 'h4')]:
+        api_module._send_lobby_update(create_test_game(room_code, host_id).room_code)
+    active_games['BBBB'].status = 'IN_PROGRESS'
+    api_module._send_game_state_update_to_room_players(active_games['BBBB'])
+
+    # Act
+    first = client.get('/rooms?status=waiting_for_players&game_type=asshole&limit=2').get_json()
+    second = client.get(f"/rooms?status=WAITING_FOR_PLAYERS&limit=2&cursor={first['next_cursor']}").get_json()
+    bad = client.get('/rooms?limit=many')
+
+    # Assert
+    assert [room['room_code'] for room in first['rooms']] == ['AAAA', 'CCCC']
+    assert [room['room_code'] for room in second['rooms']] == ['DDDD']
+    assert second['next_cursor'] is None
+    assert bad.status_code == 400
+
+def test_play_cards_runs_on_the_room_command_queue(client, mock_dependencies):
+    # Arrange
+    from api.room_actor import RoomCommandQueues
+    game = create_test_game()
+    game.add_player(Player(name='Guest', player_id='player2'))
+    game.start_game()
+    rooms = []
+    original_play_cards = MockGame.play_cards
+
+    def recording_play_cards(self, *args, **kwargs):
+        rooms.append(RoomCommandQueues.current_room())
+        return original_play_cards(self, *args, **kwargs)
+
+    # Act
+    with patch.object(MockGame, 'play_cards', recording_play_cards):
+        client.post('/play_cards', json={'room_code': 'abcd', 'player_id': 'player1', 'cards': []})
+
+    # Assert
+    assert rooms == ['ABCD']
+
+def test_socket_join_connect_and_disconnect_touch_the_room_on_its_queue(client, mock_dependencies):
+    # Arrange
+    from flask import request, session
+    from api.api import handle_connect, handle_disconnect, handle_join_game_room_socket, player_id_map
+    from api.room_actor import RoomCommandQueues
+    create_test_game()
+    rooms = []
+    record_room = lambda *args, **kwargs: rooms.append(RoomCommandQueues.current_room())
+
+    # Act
+    with patch('api.api._send_full_game_state', side_effect=record_room), \
+         patch('api.api._send_game_state_update_to_room_players', side_effect=record_room), \
+         patch('api.api.emit'), patch('api.api.join_room'), patch('api.api.leave_room'):
+        with app.test_request_context():
+            request.sid = 'sid-1'
+            handle_join_game_room_socket({'room_code': 'ABCD', 'player_id': 'player1'})
+        with app.test_request_context():
+            request.sid = 'sid-2'
+            session['player_id'] = 'player1'
+            handle_connect()
+            handle_disconnect()
+
+    # Assert
+    assert rooms == ['ABCD', 'ABCD', 'ABCD']
+    assert 'player1' not in player_to_room_map and 'player1' not in player_id_map
+
+def test_socket_play_cards_acks_with_the_version_it_produced(client, mock_dependencies):
+    # Arrange
+    from api.api import on_play_cards
+    game = create_test_game()
+    game.add_player(Player(name='Guest', player_id='player2'))
+    game.start_game()
+
+    # Act
+    with patch('api.api.move_hint_engine', new=MagicMock(**{'get_hints.return_value': None})):
+        with app.test_request_context():
+            socket_ack = on_play_cards({'room_code': 'abcd', 'player_id': 'player1', 'cards': []})
+        http_response = client.post('/play_cards', json={'room_code': 'ABCD', 'player_id': 'player1', 'cards': []})
+
+    # Assert
+    assert socket_ack == {'success': True, 'message': 'Card(s) played', 'state_version': 1}
+    assert http_response.get_json()['state_version'] == 2
+
+def test_socket_pass_turn_acks_the_error(client, mock_dependencies):
+    # Arrange
+    from api.api import on_pass_turn
+    create_test_game()
+
+    # Act
+    with app.test_request_context():
+        ack = on_pass_turn({'room_code': 'ABCD', 'player_id': 'player1'})
+
+    # Assert
+    assert ack == {'success': False, 'error': 'Game is not in progress.', 'status': 400}
+    mock_dependencies['socketio'].emit.assert_not_called()
+
+def test_socket_leave_room_uses_the_session_player_and_leaves_the_channel(client, mock_dependencies):
+    # Arrange
+    from flask import session
+    from api.api import on_leave_room
+    game = create_test_game()
+    game.add_player(Player(name='Guest', player_id='player2'))
+
+    # Act
+    with app.test_request_context(), patch('api.api.leave_room') as mock_leave_room:
+        session['player_id'] = 'player2'
+        ack = on_leave_room({'room_code': 'ABCD'})
+
+    # Assert
+    assert ack['success'] is True
+    assert [p.player_id for p in game.players] == ['player1']
+    mock_leave_room.assert_called_once_with('ABCD')
+
+def test_deleting_a_room_forgets_its_win_probability_bookkeeping(client, mock_dependencies):
+    # Arrange
+    create_test_game('AAAA', 'h1')
+    create_test_game('BBBB', 'h2')
+
+    # Act
+    with patch('api.api.win_probability_service') as win_probability_service:
+        client.post('/leave_room', json={'room_code': 'AAAA', 'player_id': 'h1'})
+        client.post('/delete_room', json={'room_code': 'BBBB', 'player_id': 'h2'})
+
+    # Assert
+    assert [c.args for c in win_probability_service.forget_room.call_args_list] == [('AAAA',), ('BBBB',)]
+    assert 'AAAA' not in active_games and 'BBBB' not in active_games
+
+def test_background_tasks_include_the_bot_runner(client, mock_dependencies):
+    # Arrange
+    from api.api import _start_background_tasks, bot_broker, game_timer_monitor
+
+    # Act
+    with patch('api.api.bot_scheduler', None):
+        _start_background_tasks()
+
+    # Assert
+    started = [call.args[0] for call in mock_dependencies['socketio'].start_background_task.call_args_list]
+    assert game_timer_monitor in started
+    assert bot_broker.run_forever in started
+
+def test_unknown_room_gets_not_found_without_a_room_queue(client, mock_dependencies):
+    # Arrange
+    from api.api import room_commands
+    queues_before = len(room_commands)
+
+    # Act
+    responses = [client.post(path, json={'room_code': 'ZZ99', 'player_id': 'player1', 'cards': []})
+                 for path in ('/validate_play', '/play_cards', '/join_room')]
+
+    # Assert
+    assert all(response.status_code in (400, 404) for response in responses)
+    assert len(room_commands) == queues_before
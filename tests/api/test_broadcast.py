@@ -0,0 +1,126 @@
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from api.broadcast import BroadcastCoalescer
+
+
+def _coalescer():
+    sent = []
+    coalescer = BroadcastCoalescer(
+        flush_room=lambda game: sent.append((game.room_code, game.version)),
+        flush_lobby=lambda room_codes: sent.append(('lobby', room_codes)),
+    )
+    return coalescer, sent
+
+def test_marks_flush_immediately_until_the_coalescer_runs():
+    # Arrange
+    coalescer, sent = _coalescer()
+
+    # Act
+    coalescer.mark_room(SimpleNamespace(room_code='ABCD', version=1))
+    coalescer.mark_lobby('ABCD')
+
+    # Assert
+    assert sent == [('ABCD', 1), ('lobby', ['ABCD'])]
+
+def test_burst_of_marks_is_sent_once_per_room_with_latest_state():
+    # Arrange
+    coalescer, sent = _coalescer()
+    coalescer.running = True
+
+    # Act
+    for version in range(3):
+        coalescer.mark_room(SimpleNamespace(room_code='ABCD', version=version))
+        coalescer.mark_lobby('ABCD')
+    coalescer.mark_room(SimpleNamespace(room_code='WXYZ', version=0))
+    coalescer.mark_lobby('WXYZ')
+    before_flush = list(sent)
+    flushed = coalescer.flush()
+
+    # Assert
+    assert before_flush == []
+    assert flushed == 2
+    assert sent == [('ABCD', 2), ('WXYZ', 0), ('lobby', ['ABCD', 'WXYZ'])]
+    assert coalescer.marks == 8 and coalescer.flushes == 1
+    assert coalescer.flush() == 0 and coalescer.flushes == 1
+
+def test_failing_room_does_not_block_the_others():
+    # Arrange
+    sent = []
+
+    def flush_room(game):
+        if game.room_code == 'BAD1':
+            raise RuntimeError("socket closed")
+        sent.append(game.room_code)
+
+    coalescer = BroadcastCoalescer(flush_room=flush_room, flush_lobby=sent.append)
+    coalescer.running = True
+    coalescer.mark_room(SimpleNamespace(room_code='BAD1'))
+    coalescer.mark_room(SimpleNamespace(room_code='ABCD'))
+
+    # Act
+    coalescer.flush()
+
+    # Assert
+    assert sent == ['ABCD']
+
+def test_room_is_pending_until_its_flush_is_sent():
+    # Arrange
+    pending_during_flush = []
+    coalescer = BroadcastCoalescer(
+        flush_room=lambda game: pending_during_flush.append(coalescer.is_pending(game.room_code)),
+        flush_lobby=lambda room_codes: None,
+    )
+    coalescer.running = True
+    coalescer.mark_room(SimpleNamespace(room_code='ABCD'))
+
+    # Act
+    pending_before = coalescer.is_pending('ABCD')
+    coalescer.flush()
+
+    # Assert
+    assert pending_before is True
+    assert pending_during_flush == [True]
+    assert coalescer.is_pending('ABCD') is False
+    assert coalescer.is_pending('WXYZ') is False
+
+def test_importing_the_app_starts_coalescing_broadcasts():
+    # Arrange: the app as gunicorn loads it, without running api.py as a script
+    from api.api import BROADCAST_TICK, broadcast_coalescer
+    sent = []
+    game = SimpleNamespace(room_code='ZZZZ')
+
+    # Act
+    with patch.object(broadcast_coalescer, 'flush_room', sent.append), \
+         patch.object(broadcast_coalescer, 'flush_lobby', lambda room_codes: None):
+        for _ in range(3):
+            broadcast_coalescer.mark_room(game)
+        before_tick = list(sent)
+        deadline = time.monotonic() + 2
+        while not sent and time.monotonic() < deadline:
+            time.sleep(BROADCAST_TICK)
+
+    # Assert
+    assert broadcast_coalescer.running is True
+    assert before_tick == []
+    assert sent == [game]
+
+def test_room_handed_off_as_a_future_stays_pending_until_it_completes():
+    # Arrange
+    from concurrent.futures import Future
+    sending = Future()
+    coalescer = BroadcastCoalescer(flush_room=lambda game: sending, flush_lobby=lambda room_codes: None)
+    coalescer.running = True
+    coalescer.mark_room(SimpleNamespace(room_code='ABCD'))
+    coalescer.mark_room(SimpleNamespace(room_code='WXYZ'))
+
+    # Act
+    flushed = coalescer.flush()
+    pending_while_sending = coalescer.is_pending('ABCD')
+    sending.set_result(None)
+
+    # Assert
+    assert flushed == 2
+    assert pending_while_sending is True
+    assert coalescer.is_pending('ABCD') is False
@@ -0,0 +1,30 @@
+from api.lobby import LobbyFeed
+
+
+def test_diff_reports_added_updated_and_removed_rooms():
+    # Arrange
+    feed = LobbyFeed()
+    rooms = {'ABCD': {'room_code': 'ABCD', 'player_count': 1}, 'WXYZ': {'room_code': 'WXYZ', 'player_count': 2}}
+    first = feed.diff(['ABCD', 'WXYZ'], rooms.get)
+    rooms['ABCD'] = {'room_code': 'ABCD', 'player_count': 2}
+    del rooms['WXYZ']
+
+    # Act
+    second = feed.diff(['ABCD', 'WXYZ'], rooms.get)
+
+    # Assert
+    assert [room['room_code'] for room in first['added']] == ['ABCD', 'WXYZ']
+    assert second == {'added': [], 'updated': [{'room_code': 'ABCD', 'player_count': 2}], 'removed': ['WXYZ']}
+
+def test_diff_skips_unchanged_and_unknown_rooms():
+    # Arrange
+    feed = LobbyFeed()
+    rooms = {'ABCD': {'room_code': 'ABCD', 'player_count': 1}}
+    feed.diff(['ABCD'], rooms.get)
+
+    # Act
+    changes = feed.diff(['ABCD', 'GONE'], rooms.get)
+
+    # Assert
+    assert changes is None
+    assert feed.diffs_sent == 1
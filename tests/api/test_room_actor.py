@@ -0,0 +1,109 @@
+import threading
+import time
+
+import pytest
+
+from api.room_actor import RoomCommandQueues, UnknownRoomError
+
+
+def test_commands_for_one_room_never_interleave():
+    # Arrange
+    commands = RoomCommandQueues()
+    inside, overlaps, order = [], [], []
+
+    def command(i):
+        inside.append(i)
+        if len(inside) > 1:
+            overlaps.append(i)
+        time.sleep(0.001)
+        order.append(i)
+        inside.remove(i)
+
+    threads = [threading.Thread(target=commands.run, args=('ABCD', command, i)) for i in range(10)]
+
+    # Act
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    # Assert
+    assert overlaps == []
+    assert sorted(order) == list(range(10))
+
+def test_commands_run_in_submission_order_on_the_room_thread():
+    # Arrange
+    commands = RoomCommandQueues()
+    seen = []
+
+    # Act
+    futures = [commands.submit('ABCD', lambda i=i: seen.append((i, RoomCommandQueues.current_room()))) for i in range(5)]
+    for future in futures:
+        future.result(5)
+
+    # Assert
+    assert seen == [(i, 'ABCD') for i in range(5)]
+    assert RoomCommandQueues.current_room() is None
+
+def test_nested_command_for_same_room_runs_inline():
+    # Arrange
+    commands = RoomCommandQueues(timeout=5)
+
+    # Act
+    result = commands.run('ABCD', lambda: commands.run('ABCD', lambda: 'inner'))
+
+    # Assert
+    assert result == 'inner'
+
+def test_exceptions_reach_the_caller():
+    commands = RoomCommandQueues()
+
+    def reject():
+        raise ValueError("It's not your turn.")
+
+    with pytest.raises(ValueError, match="not your turn"):
+        commands.run('ABCD', reject)
+    assert commands.run('ABCD', lambda: 'still running') == 'still running'
+
+def test_disabled_queues_run_inline_and_forget_room_drops_actor():
+    # Arrange
+    inline = RoomCommandQueues(enabled=False)
+    commands = RoomCommandQueues()
+    commands.run('ABCD', lambda: None)
+
+    # Act
+    room = inline.run('ABCD', RoomCommandQueues.current_room)
+    commands.forget_room('ABCD')
+
+    # Assert
+    assert room is None and len(inline) == 0
+    assert len(commands) == 0
+
+def test_no_actor_is_started_for_a_room_that_does_not_exist():
+    # Arrange
+    rooms = {'ABCD'}
+    commands = RoomCommandQueues(room_exists=rooms.__contains__)
+    commands.run('ABCD', lambda: None)
+    rooms.discard('ABCD')
+    commands.forget_room('ABCD')
+
+    # Act / Assert
+    with pytest.raises(UnknownRoomError):
+        commands.run('WXYZ', lambda: None)
+    with pytest.raises(UnknownRoomError):
+        commands.submit('ABCD', lambda: None)
+    assert len(commands) == 0
+
+def test_submit_from_the_room_itself_runs_inline():
+    # Arrange
+    commands = RoomCommandQueues()
+
+    def outer():
+        inner = commands.submit('ABCD', RoomCommandQueues.current_room)
+        return inner.done(), inner.result()
+
+    # Act
+    done, room = commands.run('ABCD', outer)
+
+    # Assert
+    assert done is True and room == 'ABCD'
@@ -0,0 +1,87 @@
+from types import SimpleNamespace
+
+import pytest
+
+from api.room_directory import RoomDirectory
+
+
+def _room(status='WAITING_FOR_PLAYERS', game_type='asshole'):
+    return SimpleNamespace(status=status, game_type=game_type)
+
+def _all_pages(directory, **filters):
+    codes, cursor = directory.query(limit=2, **filters)
+    pages = [codes]
+    while cursor:
+        codes, cursor = directory.query(limit=2, cursor=cursor, **filters)
+        pages.append(codes)
+    return pages
+
+def test_query_pages_through_rooms_in_listing_order():
+    # Arrange
+    directory = RoomDirectory()
+    for code in ['AAAA', 'BBBB', 'CCCC', 'DDDD', 'EEEE']:
+        directory.update(code, _room())
+
+    # Act
+    pages = _all_pages(directory)
+
+    # Assert
+    assert pages == [['AAAA', 'BBBB'], ['CCCC', 'DDDD'], ['EEEE']]
+
+def test_query_filters_by_status_and_game_type():
+    # Arrange
+    directory = RoomDirectory()
+    directory.update('AAAA', _room())
+    directory.update('BBBB', _room(status='IN_PROGRESS'))
+    directory.update('CCCC', _room(game_type='poker'))
+    directory.update('DDDD', _room(status='READY_TO_START'))
+    directory.update('EEEE', _room())
+
+    # Act
+    waiting = directory.query(statuses=['WAITING_FOR_PLAYERS'], game_type='asshole')
+    joinable = _all_pages(directory, statuses=['WAITING_FOR_PLAYERS', 'READY_TO_START'], game_type='asshole')
+    poker = directory.query(game_type='poker')
+
+    # Assert
+    assert waiting == (['AAAA', 'EEEE'], None)
+    assert joinable == [['AAAA', 'DDDD'], ['EEEE']]
+    assert poker == (['CCCC'], None)
+
+def test_repeated_filters_list_each_room_once():
+    # Arrange
+    directory = RoomDirectory()
+    for code in ['AAAA', 'BBBB', 'CCCC']:
+        directory.update(code, _room())
+    directory.update('DDDD', _room(game_type='poker'))
+
+    # Act
+    by_status = _all_pages(directory, statuses=['WAITING_FOR_PLAYERS', 'WAITING_FOR_PLAYERS'])
+    by_type = _all_pages(directory, game_type=['asshole', 'poker', 'asshole'])
+
+    # Assert
+    assert by_status == [['AAAA', 'BBBB'], ['CCCC', 'DDDD']]
+    assert by_type == [['AAAA', 'BBBB'], ['CCCC', 'DDDD']]
+
+def test_update_refiles_changed_rooms_and_removes_deleted_ones():
+    # Arrange
+    directory = RoomDirectory()
+    directory.update('AAAA', _room())
+    directory.update('BBBB', _room())
+
+    # Act
+    directory.update('AAAA', _room(status='IN_PROGRESS'))
+    directory.update('BBBB', None)
+    directory.update('CCCC', _room())
+
+    # Assert
+    assert directory.query(statuses=['WAITING_FOR_PLAYERS']) == (['CCCC'], None)
+    assert directory.query(statuses=['IN_PROGRESS']) == (['AAAA'], None)
+    assert directory.query() == (['AAAA', 'CCCC'], None)
+    assert len(directory) == 2
+
+def test_query_rejects_bad_cursor_and_limit():
+    directory = RoomDirectory()
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        directory.query(cursor='abc')
+    with pytest.raises(ValueError, match="limit"):
+        directory.query(limit=0)
@@ -0,0 +1,266 @@
+import json
+from collections import Counter
+from unittest.mock import patch
+
+from werkzeug.test import Client
+
+from api.sharding import shard_for_room, LocalMessageBus, LobbyAggregator, ShardRouter
+
+SHARDS = ['http://shard0', 'http://shard1', 'http://shard2']
+
+
+def _room(room_code, player_count=1):
+    return {'room_code': room_code, 'player_count': player_count}
+
+def _fake_shards(rooms_by_shard=None):
+    calls = []
+
+    def transport(shard_url, method, path, query, body, headers):
+        calls.append((shard_url, method, path, query))
+        if path == '/rooms':
+            rooms = rooms_by_shard[SHARDS.index(shard_url)]
+            start = int(query.get('cursor', ['0'])[0])
+            page = rooms[start:start + 2]
+            next_cursor = str(start + 2) if start + 2 < len(rooms) else None
+            return 200, {}, json.dumps({'success': True, 'rooms': page, 'next_cursor': next_cursor})
+        return 200, {'Content-Type': 'application/json'}, json.dumps({'served_by': shard_url})
+
+    return transport, calls
+
+def test_shard_for_room_is_stable_and_spreads_rooms():
+    # Arrange
+    codes = [f"{a}{b}{c}{d}" for a in 'ABCD' for b in 'EFGH' for c in 'IJKL' for d in 'MNOP']
+
+    # Act
+    counts = Counter(shard_for_room(code, 4) for code in codes)
+
+    # Assert
+    assert shard_for_room('ABCD', 4) == shard_for_room('abcd', 4)
+    assert set(counts) == {0, 1, 2, 3}
+    assert min(counts.values()) > len(codes) / 4 * 0.7
+
+def test_router_sends_room_requests_to_the_owning_shard():
+    # Arrange
+    transport, calls = _fake_shards()
+    client = Client(ShardRouter(SHARDS, transport=transport))
+    owner = SHARDS[shard_for_room('ABCD', len(SHARDS))]
+
+    # Act
+    play = client.post('/play_cards', json={'room_code': 'ABCD', 'player_id': 'p1', 'cards': []})
+    state = client.get('/game_state?room_code=ABCD&player_id=p1')
+    creates = [client.post('/create_room', json={'player_name': 'P'}) for _ in range(3)]
+    room_socket = client.get('/socket.io/?EIO=4&transport=polling&room_code=ABCD')
+    lobby_socket = client.post('/socket.io/?EIO=4&transport=polling&sid=x', data=b'40')
+    internal = client.post('/internal/bus', json={})
+
+    # Assert
+    assert play.json == state.json == room_socket.json == {'served_by': owner}
+    assert sorted(response.json['served_by'] for response in creates) == SHARDS
+    assert lobby_socket.json == {'served_by': SHARDS[0]}
+    assert 'X-Shard-Url' not in play.headers
+    assert internal.status_code == 404
+    assert len(calls) == 7
+
+def test_router_pages_rooms_across_shards():
+    # Arrange
+    rooms_by_shard = [[_room('AAAA'), _room('BBBB'), _room('CCCC')], [], [_room('DDDD')]]
+    transport, _ = _fake_shards(rooms_by_shard)
+    client = Client(ShardRouter(SHARDS, transport=transport))
+
+    # Act
+    pages, cursor = [], None
+    while True:
+        page = client.get('/rooms' + (f'?cursor={cursor}' if cursor else '')).json
+        pages.append([room['room_code'] for room in page['rooms']])
+        cursor = page['next_cursor']
+        if not cursor:
+            break
+    bad = client.get('/rooms?cursor=9:0')
+
+    # Assert
+    assert pages == [['AAAA', 'BBBB'], ['CCCC'], [], ['DDDD']]
+    assert bad.status_code == 400
+
+def test_lobby_aggregator_merges_diffs_from_every_shard():
+    # Arrange
+    bus = LocalMessageBus()
+    emitted = []
+    shard0 = LobbyAggregator(0, bus, on_changes=emitted.append)
+    shard1 = LobbyAggregator(1, bus)
+
+    # Act
+    shard0.publish({'added': [_room('AAAA')], 'updated': [], 'removed': []})
+    shard1.publish({'added': [_room('BBBB')], 'updated': [], 'removed': []})
+    shard1.publish({'added': [], 'updated': [_room('BBBB', 2)], 'removed': []})
+    shard0.publish({'added': [], 'updated': [], 'removed': ['AAAA']})
+
+    # Assert
+    assert shard0.rooms() == shard1.rooms() == [_room('BBBB', 2)]
+    assert len(emitted) == 4
+
+def test_late_shard_resyncs_the_lobby_from_its_peers():
+    # Arrange
+    bus = LocalMessageBus()
+    LobbyAggregator(0, bus, local_rooms=lambda: [_room('AAAA')])
+    late = LobbyAggregator(2, bus, local_rooms=lambda: [])
+
+    # Act
+    late.request_resync()
+
+    # Assert
+    assert late.rooms() == [_room('AAAA')]
+
+def test_room_codes_are_only_generated_for_this_shard(client):
+    # Arrange
+    import api.api as api_module
+
+    # Act
+    with patch.object(api_module, 'SHARD_COUNT', 3), patch.object(api_module, 'SHARD_INDEX', 1):
+        codes = [api_module.generate_unique_room_code() for _ in range(20)]
+
+    # Assert
+    assert all(shard_for_room(code, 3) == 1 for code in codes)
+
+def test_internal_bus_rejects_messages_when_not_sharded(client):
+    response = client.post('/internal/bus', json={'topic': 'lobby', 'message': {}}, headers={'X-Bus-Token': 'x'})
+    assert response.status_code == 403
+
+def _serve(app):
+    import eventlet
+    import eventlet.wsgi
+    listener = eventlet.listen(('127.0.0.1', 0))
+    server = eventlet.spawn(eventlet.wsgi.server, listener, app, log_output=False)
+    return listener, server
+
+def _room_code_on_shard(shard, num_shards):
+    return next(code for code in (f"R{i:03d}" for i in range(1000)) if shard_for_room(code, num_shards) == shard)
+
+def _websocket_messages(port, target, count):
+    """Opens a WebSocket, answers the Engine.IO open packet with a Socket.IO connect and returns `count` messages."""
+    import socket
+    from wsproto import ConnectionType, WSConnection
+    from wsproto.events import CloseConnection, Request, TextMessage
+    ws = WSConnection(ConnectionType.CLIENT)
+    messages = []
+    with socket.create_connection(('127.0.0.1', port), timeout=5) as sock:
+        sock.sendall(ws.send(Request(host='127.0.0.1', target=target)))
+        while len(messages) < count:
+            data = sock.recv(4096)
+            if not data:
+                break
+            ws.receive_data(data)
+            for event in ws.events():
+                if isinstance(event, TextMessage):
+                    messages.append(event.data)
+                    if len(messages) == 1:
+                        sock.sendall(ws.send(TextMessage(data='40')))
+                elif isinstance(event, CloseConnection):
+                    return messages
+        sock.sendall(ws.send(CloseConnection(code=1000)))
+    return messages
+
+def test_router_carries_socket_connections_to_the_room_shard_end_to_end():
+    # Arrange: the real app as shard 1 of 2 behind a real router; shard 0 is unreachable
+    import socketio
+    from api.api import app
+    shard_listener, shard_server = _serve(app)
+    router = ShardRouter(['http://127.0.0.1:9', f'http://127.0.0.1:{shard_listener.getsockname()[1]}'])
+    router_listener, router_server = _serve(router)
+    router_port = router_listener.getsockname()[1]
+    room_code = _room_code_on_shard(1, 2)
+    sio = socketio.Client()
+
+    # Act
+    try:
+        sio.connect(f'http://127.0.0.1:{router_port}?room_code={room_code}', transports=['polling'], wait_timeout=5)
+        polling_connected, polling_sid = sio.connected, sio.get_sid()
+        sio.disconnect()
+        # The open packet, then the connect handler's status event and the connect ack
+        opened, *received = _websocket_messages(
+            router_port, f'/socket.io/?EIO=4&transport=websocket&room_code={room_code}', 3
+        )
+    finally:
+        sio.shutdown()
+        for listener, server in ((router_listener, router_server), (shard_listener, shard_server)):
+            server.kill()
+            listener.close()
+
+    # Assert
+    assert polling_connected and polling_sid
+    assert 'sid' in json.loads(opened[1:])
+    assert any(message.startswith('40') for message in received)
+    assert router.requests_routed[0] == 0 and router.requests_routed[1] >= 3
+
+def _start_shard_processes(count):
+    """Runs `count` shards of the real app in their own processes, with the database out of reach."""
+    import os
+    import socket
+    import subprocess
+    import sys
+    import time
+    import requests
+    ports = []
+    for _ in range(count):
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            ports.append(sock.getsockname()[1])
+    urls = [f'http://127.0.0.1:{port}' for port in ports]
+    processes = []
+    for index, port in enumerate(ports):
+        env = dict(os.environ, SHARD_COUNT=str(count), SHARD_INDEX=str(index), SHARD_URLS=','.join(urls),
+                   SHARD_BUS_TOKEN='test-token', ENVIRONMENT='local', DYNAMODB_ENDPOINT='http://127.0.0.1:9',
+                   AWS_MAX_ATTEMPTS='1')
+        code = ("import eventlet, eventlet.wsgi; from api.api import app; "
+                f"eventlet.wsgi.server(eventlet.listen(('127.0.0.1', {port})), app, log_output=False)")
+        processes.append(subprocess.Popen([sys.executable, '-c', code], env=env,
+                                          stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL))
+    deadline = time.time() + 30
+    for url in urls:
+        while True:
+            try:
+                requests.get(f'{url}/rooms', timeout=1)
+                break
+            except requests.ConnectionError:
+                if time.time() > deadline:
+                    raise
+                time.sleep(0.1)
+    return urls, processes
+
+def test_lobby_socket_joins_and_plays_in_a_room_on_another_shard():
+    # Arrange: two shard processes behind a real router; the socket opens in the lobby, so on shard 0
+    import requests
+    import socketio
+    urls, processes = _start_shard_processes(2)
+    router = ShardRouter(urls)
+    router_listener, router_server = _serve(router)
+    router_url = f'http://127.0.0.1:{router_listener.getsockname()[1]}'
+    sio = socketio.Client()
+    events = []
+    sio.on('*', lambda event, data=None: events.append(event))
+
+    # Act
+    try:
+        created = [requests.post(f'{router_url}/create_room', json={'player_name': 'Host', 'game_type': 'asshole'}).json()
+                   for _ in range(2)]  # Round-robin: one room on each shard
+        room = next(room for room in created if shard_for_room(room['room_code'], 2) == 1)
+        command = {'room_code': room['room_code'], 'player_id': room['player_id']}
+        sio.connect(router_url, transports=['polling'], wait_timeout=5)
+        sio.emit('join_game_room_socket', command)
+        ack = sio.call('pass_turn', command, timeout=5)
+        for _ in range(50):
+            if 'game_state_update' in events:
+                break
+            sio.sleep(0.1)
+        sio.disconnect()
+    finally:
+        sio.shutdown()
+        router_server.kill()
+        router_listener.close()
+        for process in processes:
+            process.kill()
+            process.wait()
+
+    # Assert: shard 1 ran the events (shard 0 would not know the room) and its replies reached the socket
+    assert ack == {'success': False, 'error': 'Game is not in progress.', 'status': 400}
+    assert 'status' in events and 'game_state_update' in events
+    assert router.requests_routed[0] >= 2
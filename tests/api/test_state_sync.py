@@ -0,0 +1,153 @@
+import threading
+
+from api.state_sync import GameStateSync, encode_delta
+
+
+def _card(card_id, rank='5', suit='H'):
+    return {'id': card_id, 'rank': rank, 'suit': suit}
+
+def _payload(message, pile, hand):
+    return {'room_code': 'ABCD', 'game_message': message, 'pile': pile, 'your_hand': hand}
+
+def test_encode_delta_sends_changed_fields_pile_appends_and_hand_changes():
+    # Arrange
+    old = dict(_payload('start', [_card('a')], [_card('b'), _card('c')]), state_version=3)
+    new = dict(_payload('played', [_card('a'), _card('b')], [_card('c'), _card('d')]), state_version=4)
+
+    # Act
+    delta = encode_delta(old, new)
+
+    # Assert
+    assert delta['base_version'] == 3 and delta['state_version'] == 4
+    assert delta['changes'] == {'game_message': 'played'}
+    assert delta['pile_appended'] == [_card('b')]
+    assert delta['hand_removed'] == ['b']
+    assert delta['hand_added'] == [_card('d')]
+
+def test_encode_delta_resends_pile_when_it_was_cleared():
+    # Arrange
+    old = dict(_payload('x', [_card('a'), _card('b')], []), state_version=1)
+    new = dict(_payload('x', [_card('c')], []), state_version=2)
+
+    # Act
+    delta = encode_delta(old, new)
+
+    # Assert
+    assert delta['changes'] == {'pile': [_card('c')]}
+    assert 'pile_appended' not in delta
+
+def test_client_gets_snapshot_until_it_acks_then_deltas():
+    # Arrange
+    sync = GameStateSync()
+    first = sync.publish('ABCD', {'p1': _payload('one', [], [_card('a')])})
+
+    # Act
+    snapshot = sync.message_for('ABCD', 'p1')
+    repeat = sync.message_for('ABCD', 'p1')
+    assert sync.ack('ABCD', 'p1', first)
+    sync.publish('ABCD', {'p1': _payload('two', [], [_card('a')])})
+    delta = sync.message_for('ABCD', 'p1')
+
+    # Assert
+    assert snapshot[0] == GameStateSync.SNAPSHOT_EVENT and snapshot[1]['state_version'] == 1
+    assert repeat is None
+    assert delta[0] == GameStateSync.DELTA_EVENT
+    assert delta[1]['changes'] == {'game_message': 'two'}
+
+def test_deltas_chain_from_last_sent_version_without_waiting_for_acks():
+    # Arrange
+    sync = GameStateSync()
+    sync.publish('ABCD', {'p1': _payload('one', [_card('a')], [])})
+    sync.message_for('ABCD', 'p1')
+    sync.ack('ABCD', 'p1', 1)
+
+    # Act
+    sync.publish('ABCD', {'p1': _payload('two', [_card('a'), _card('b')], [])})
+    second = sync.message_for('ABCD', 'p1')
+    sync.publish('ABCD', {'p1': _payload('three', [_card('a'), _card('b'), _card('c')], [])})
+    third = sync.message_for('ABCD', 'p1')
+
+    # Assert
+    assert second[1]['pile_appended'] == [_card('b')]
+    assert third[1]['base_version'] == 2
+    assert third[1]['pile_appended'] == [_card('c')]
+
+def test_client_too_far_behind_gets_full_snapshot():
+    # Arrange
+    sync = GameStateSync(max_versions=4, max_lag=2)
+    sync.publish('ABCD', {'p1': _payload('v1', [], [])})
+    sync.message_for('ABCD', 'p1')
+    sync.ack('ABCD', 'p1', 1)
+    sync.publish('ABCD', {'p1': _payload('v2', [], [])})
+    sync.message_for('ABCD', 'p1')
+    sync.publish('ABCD', {'p1': _payload('v3', [], [])})
+    sync.message_for('ABCD', 'p1')
+
+    # Act
+    sync.publish('ABCD', {'p1': _payload('v4', [], [])})
+    event, data = sync.message_for('ABCD', 'p1')
+
+    # Assert
+    assert event == GameStateSync.SNAPSHOT_EVENT
+    assert data['game_message'] == 'v4'
+    assert sync.snapshots_sent == 2 and sync.deltas_sent == 2
+
+def test_ack_rejects_versions_never_sent_and_rejoin_resets_player():
+    # Arrange
+    sync = GameStateSync()
+    sync.publish('ABCD', {'p1': _payload('one', [], [])})
+    sync.message_for('ABCD', 'p1')
+
+    # Act
+    bad_acks = [sync.ack('ABCD', 'p1', 2), sync.ack('ABCD', 'p1', '1'), sync.ack('WXYZ', 'p1', 1)]
+    sync.ack('ABCD', 'p1', 1)
+    sync.reset_player('ABCD', 'p1')
+    sync.publish('ABCD', {'p1': _payload('two', [], [])})
+
+    # Assert
+    assert bad_acks == [False, False, False]
+    assert sync.message_for('ABCD', 'p1')[0] == GameStateSync.SNAPSHOT_EVENT
+
+def test_long_poll_is_woken_only_by_its_own_room():
+    # Arrange
+    sync = GameStateSync()
+    sync.publish('ABCD', {'p1': _payload('one', [], [])})
+    sync.publish('WXYZ', {'p1': _payload('one', [], [])})
+    etag = sync.etag('ABCD')
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(sync.wait_for_change('ABCD', etag, 5)))
+    waiter.start()
+    wakeups = []
+    room_condition = sync._rooms['ABCD'].changed
+    original_notify_all = room_condition.notify_all
+    room_condition.notify_all = lambda: wakeups.append('ABCD') or original_notify_all()
+
+    # Act
+    sync.publish('WXYZ', {'p1': _payload('two', [], [])})
+    waiter.join(0.05)
+    still_waiting = waiter.is_alive()
+    sync.publish('ABCD', {'p1': _payload('two', [], [])})
+    waiter.join(5)
+
+    # Assert
+    assert still_waiting
+    assert wakeups == ['ABCD']
+    assert results == [True]
+
+def test_forgetting_a_room_releases_its_long_polls():
+    # Arrange
+    sync = GameStateSync()
+    sync.publish('ABCD', {'p1': _payload('one', [], [])})
+    etag = sync.etag('ABCD')
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(sync.wait_for_change('ABCD', etag, 5)))
+    waiter.start()
+    waiter.join(0.05)
+
+    # Act
+    sync.forget_room('ABCD')
+    waiter.join(5)
+
+    # Assert
+    assert results == [True]
+    assert sync.wait_for_change('ABCD', etag, 5) is True
@@ -0,0 +1,119 @@
+import threading
+
+import pytest
+
+from database.profile_cache import ProfileCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_hit_until_ttl_expires():
+    # Arrange
+    clock = FakeClock()
+    cache = ProfileCache(ttl=60, clock=clock)
+    loads = []
+    loader = lambda user_id: loads.append(user_id) or {'user_id': user_id}
+
+    # Act
+    cache.get('u1', loader)
+    cache.get('u1', loader)
+    clock.now = 61
+    cache.get('u1', loader)
+
+    # Assert
+    assert loads == ['u1', 'u1']
+    assert cache.hits == 1 and cache.misses == 2
+
+def test_unknown_users_are_cached_for_the_negative_ttl():
+    # Arrange
+    clock = FakeClock()
+    cache = ProfileCache(ttl=60, negative_ttl=5, clock=clock)
+    loads = []
+    loader = lambda user_id: loads.append(user_id)
+
+    # Act
+    first = cache.get('bot_1', loader)
+    cache.get('bot_1', loader)
+    clock.now = 6
+    cache.get('bot_1', loader)
+
+    # Assert
+    assert first is None
+    assert len(loads) == 2
+
+def test_least_recently_used_entry_is_evicted():
+    # Arrange
+    cache = ProfileCache(max_entries=2)
+    loader = lambda user_id: {'user_id': user_id}
+    cache.get('u1', loader)
+    cache.get('u2', loader)
+    cache.get('u1', loader)
+
+    # Act
+    cache.get('u3', loader)
+
+    # Assert
+    assert len(cache) == 2
+    assert cache.get('u1', lambda user_id: pytest.fail("u1 should still be cached"))['user_id'] == 'u1'
+    assert cache.get('u2', lambda user_id: {'reloaded': True}) == {'reloaded': True}
+
+def test_concurrent_misses_share_one_load():
+    # Arrange
+    cache = ProfileCache()
+    release = threading.Event()
+    loads = []
+
+    def slow_loader(user_id):
+        loads.append(user_id)
+        release.wait(5)
+        return {'user_id': user_id}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get('u1', slow_loader))) for _ in range(5)]
+
+    # Act
+    for thread in threads:
+        thread.start()
+    while not loads:
+        pass
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    # Assert
+    assert loads == ['u1']
+    assert results == [{'user_id': 'u1'}] * 5
+
+def test_errors_are_not_cached():
+    # Arrange
+    cache = ProfileCache()
+
+    def failing_loader(user_id):
+        raise RuntimeError("throttled")
+
+    # Act
+    with pytest.raises(RuntimeError):
+        cache.get('u1', failing_loader)
+    profile = cache.get('u1', lambda user_id: {'user_id': user_id})
+
+    # Assert
+    assert profile == {'user_id': 'u1'}
+
+def test_put_wins_over_a_load_already_in_flight():
+    # Arrange
+    cache = ProfileCache()
+
+    def stale_loader(user_id):
+        cache.put(user_id, {'games_won': 2})  # A write lands while the read is in flight
+        return {'games_won': 1}
+
+    # Act
+    cache.get('u1', stale_loader)
+
+    # Assert
+    assert cache.get('u1', lambda user_id: pytest.fail("should be cached")) == {'games_won': 2}
@@ -0,0 +1,60 @@
+from unittest.mock import patch
+
+import pytest
+
+from database.user_service import UserService
+
+
+@pytest.fixture
+def service():
+    with patch('database.amplify_client.AmplifyDynamoDBClient'), \
+         patch('database.local_dynamodb_client.LocalDynamoDBClient'):
+        service = UserService()
+    yield service
+
+def test_get_user_profile_reads_the_table_once(service):
+    # Arrange
+    service.users_table.get_item.return_value = {'Item': {'user_id': 'u1', 'username': 'Greg', 'games_won': 3}}
+
+    # Act
+    first = service.get_user_profile('u1')
+    first['profile']['username'] = 'changed by caller'
+    second = service.get_user_profile('u1')
+
+    # Assert
+    assert second == {'success': True, 'profile': {'user_id': 'u1', 'username': 'Greg', 'games_won': 3}}
+    service.users_table.get_item.assert_called_once()
+
+def test_unknown_user_is_negatively_cached(service):
+    # Arrange
+    service.users_table.get_item.return_value = {}
+
+    # Act
+    results = [service.get_user_profile('bot_1') for _ in range(3)]
+
+    # Assert
+    assert all(result == {'success': False, 'error': 'User not found'} for result in results)
+    service.users_table.get_item.assert_called_once()
+
+def test_update_user_stats_writes_through_to_the_cache(service):
+    # Arrange
+    service.users_table.get_item.return_value = {'Item': {'user_id': 'u1', 'games_played': 1, 'games_won': 0}}
+    service.get_user_profile('u1')
+    service.users_table.update_item.return_value = {'Attributes': {'user_id': 'u1', 'games_played': 2, 'games_won': 1}}
+
+    # Act
+    service.update_user_stats('u1', games_played_delta=1, games_won_delta=1)
+    profile = service.get_user_profile('u1')['profile']
+
+    # Assert
+    assert profile['games_won'] == 1 and profile['win_rate'] == 0.5
+    service.users_table.get_item.assert_called_once()
+
+def test_create_user_profile_writes_through_to_the_cache(service):
+    # Act
+    service.create_user_profile('u2', 'NewUser')
+    result = service.get_user_profile('u2')
+
+    # Assert
+    assert result['profile']['username'] == 'NewUser'
+    service.users_table.get_item.assert_not_called()
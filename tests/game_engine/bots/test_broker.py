@@ -0,0 +1,130 @@
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from game_engine.bots.broker import BotDecisionBroker, pending_bot_decisions
+from game_engine.simulation import create_simulated_game, advance_without_decision, pending_decision, quiet_engine
+
+
+def create_bot_game(seed, room_code):
+    game = create_simulated_game(4, seed=seed)
+    game.room_code = room_code
+    for player in game.players:
+        player.is_bot = True
+    return game
+
+
+class TestBotDecisionBroker(unittest.TestCase):
+    """
+    Unit tests for batching bot decisions across rooms.
+    """
+
+    def test_human_seats_are_never_collected(self):
+        # Arrange
+        game = create_simulated_game(4, seed=1)
+        broker = BotDecisionBroker()
+
+        # Act
+        broker.collect([game])
+
+        # Assert
+        self.assertEqual(list(pending_bot_decisions(game)), [])
+        self.assertEqual(broker.pending_count, 0)
+
+    def test_one_policy_call_covers_every_room(self):
+        # Arrange
+        games = [create_bot_game(seed, f"R{seed:03d}") for seed in range(8)]
+        broker = BotDecisionBroker()
+
+        # Act
+        broker.collect(games)
+        broker.collect(games)
+        with quiet_engine():
+            applied = broker.flush()
+
+        # Assert
+        self.assertEqual(applied, 8)
+        self.assertEqual(broker.batches_evaluated, 1)
+        self.assertEqual(broker.pending_count, 0)
+
+    def test_moves_are_applied_through_run_in_room(self):
+        # Arrange
+        games = [create_bot_game(seed, f"R{seed:03d}") for seed in range(3)]
+        rooms_run = []
+
+        def run_in_room(room_code, fn, *args):
+            rooms_run.append(room_code)
+            return fn(*args)
+
+        broker = BotDecisionBroker(run_in_room=run_in_room)
+        broker.collect(games)
+
+        # Act
+        with quiet_engine():
+            applied = broker.flush()
+
+        # Assert
+        self.assertEqual(applied, 3)
+        self.assertEqual(sorted(rooms_run), ["R000", "R001", "R002"])
+
+    def test_only_rooms_with_a_due_bot_seat_are_filed(self):
+        # Arrange
+        human_game = create_simulated_game(4, seed=1)
+        bot_game = create_bot_game(2, "R002")
+        broker = BotDecisionBroker(window=0)
+
+        # Act
+        broker.notify(human_game)
+        idle = broker.run_once(timeout=0)
+        broker.notify(bot_game)
+        with quiet_engine():
+            applied = broker.run_once(timeout=0)
+
+        # Assert
+        self.assertEqual(idle, 0)
+        self.assertEqual(applied, 1)
+        self.assertEqual(broker.batches_evaluated, 1)
+
+    def test_applied_move_files_the_room_again_for_the_next_bot(self):
+        # Arrange
+        game = create_bot_game(3, "R003")
+        broker = BotDecisionBroker(window=0)
+        broker.notify(game)
+
+        # Act
+        with quiet_engine():
+            broker.run_once(timeout=0)
+
+        # Assert
+        self.assertEqual(broker.decisions_applied, 1)
+        self.assertEqual(broker.due_room_count, 1 if next(pending_bot_decisions(game), None) else 0)
+
+    def test_broker_plays_bot_rooms_to_completion(self):
+        # Arrange
+        games = [create_bot_game(seed, f"R{seed:03d}") for seed in range(6)]
+        updated_rooms = set()
+        broker = BotDecisionBroker(on_decision=lambda game: updated_rooms.add(game.room_code))
+
+        # Act
+        with quiet_engine():
+            for _ in range(3000):
+                live = [game for game in games if not game.is_game_over]
+                if not live:
+                    break
+                for game in live:
+                    # Housekeeping the broker does not own: handing on the lead after going out.
+                    if pending_decision(game)[0] is None:
+                        advance_without_decision(game)
+                broker.collect(live)
+                broker.flush()
+
+        # Assert
+        self.assertTrue(all(game.is_game_over for game in games))
+        self.assertEqual(updated_rooms, {game.room_code for game in games})
+        self.assertLess(broker.batches_evaluated, broker.decisions_applied)
+
+
+if __name__ == '__main__':
+    unittest.main()
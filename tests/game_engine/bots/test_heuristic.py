@@ -0,0 +1,77 @@
+import unittest
+import random
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from game_engine.bots.heuristic import HeuristicPolicy
+from game_engine.card import Card
+from game_engine.simulation import create_simulated_game
+
+
+class TestHeuristicPolicy(unittest.TestCase):
+    """
+    Unit tests for the HeuristicPolicy rollout bot.
+    """
+
+    def setUp(self):
+        self.game = create_simulated_game(4, seed=3)
+        self.player = self.game.get_current_player()
+        self.policy = HeuristicPolicy(rng=random.Random(0))
+
+    def test_leads_lowest_full_set_on_empty_pile(self):
+        # Arrange
+        self.player.get_hand().cards = [Card("H", "9"), Card("S", "5"), Card("D", "5"), Card("C", "2"), Card("S", "A")]
+
+        # Act
+        play = self.policy.choose_play(self.game, self.player)
+
+        # Assert
+        self.assertEqual(sorted(c.to_string() for c in play), ["5D", "5S"])
+
+    def test_passes_rather_than_spending_a_two(self):
+        # Arrange
+        self.game.pile = [Card("H", "A")]
+        self.game.current_play_rank = 14
+        self.game.current_play_count = 1
+        self.player.get_hand().cards = [Card("C", "2"), Card("S", "4"), Card("D", "6"), Card("H", "7"), Card("S", "8")]
+
+        # Act & Assert
+        self.assertIsNone(self.policy.choose_play(self.game, self.player))
+
+    def test_goes_out_when_possible(self):
+        # Arrange
+        self.game.pile = [Card("H", "A")]
+        self.game.current_play_rank = 14
+        self.game.current_play_count = 1
+        self.player.get_hand().cards = [Card("C", "2")]
+
+        # Act
+        play = self.policy.choose_play(self.game, self.player)
+
+        # Assert
+        self.assertEqual([c.to_string() for c in play], ["2C"])
+
+    def test_bombs_when_holding_missing_cards(self):
+        # Arrange
+        self.game.interrupt_active = True
+        self.game.interrupt_type = 'bomb_opportunity'
+        self.game.interrupt_rank = 9
+        self.game.interrupt_initial_pile_count = 2
+        self.player.get_hand().cards = [Card("H", "9"), Card("S", "9"), Card("D", "4")]
+
+        # Act
+        bid = self.policy.choose_interrupt_bid(self.game, self.player)
+
+        # Assert
+        self.assertEqual(sorted(c.to_string() for c in bid), ["9H", "9S"])
+
+    def test_custom_weights_override_defaults(self):
+        policy = HeuristicPolicy(weights={'two_cost': 1.0})
+        self.assertEqual(policy.weights['two_cost'], 1.0)
+        self.assertEqual(policy.weights['three_cost'], 15.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import random
+import sys
+import os
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from game_engine.bots.heuristic import HeuristicPolicy
+from game_engine.bots.linear import LinearPolicy
+from game_engine.card import Card
+from game_engine.simulation import create_simulated_game
+from game_engine.rl.encoding import PASS_ACTION, encode_action, encode_observation, legal_action_mask
+
+
+class TestLinearPolicy(unittest.TestCase):
+    """
+    Unit tests for the batched linear policy.
+    """
+
+    def setUp(self):
+        self.game = create_simulated_game(4, seed=3)
+        self.player = self.game.get_current_player()
+        self.policy = LinearPolicy.from_heuristic()
+
+    def _select(self, is_interrupt_response=False):
+        observation = encode_observation(self.game, self.player)[None, :]
+        mask = legal_action_mask(self.game, self.player, is_interrupt_response)[None, :]
+        return int(self.policy.select_actions(observation, mask)[0])
+
+    def test_leads_lowest_full_set_like_heuristic(self):
+        # Arrange
+        self.player.get_hand().cards = [Card("H", "9"), Card("S", "5"), Card("D", "5"), Card("C", "2"), Card("S", "A")]
+
+        # Act & Assert
+        self.assertEqual(self._select(), encode_action(5, 2))
+
+    def test_passes_rather_than_spending_a_two(self):
+        # Arrange
+        self.game.pile = [Card("H", "A")]
+        self.game.current_play_rank = 14
+        self.game.current_play_count = 1
+        self.player.get_hand().cards = [Card("C", "2"), Card("S", "4"), Card("D", "6"), Card("H", "7"), Card("S", "8")]
+
+        # Act & Assert
+        self.assertEqual(self._select(), PASS_ACTION)
+
+    def test_matches_heuristic_scores_on_random_states(self):
+        heuristic = HeuristicPolicy(rng=random.Random(0))
+        for seed in range(20):
+            # Arrange
+            game = create_simulated_game(4, seed=seed)
+            player = game.get_current_player()
+
+            # Act
+            observation = encode_observation(game, player)[None, :]
+            mask = legal_action_mask(game, player, False)[None, :]
+            action = int(self.policy.select_actions(observation, mask)[0])
+            expected = heuristic.choose_play(game, player)
+
+            # Assert
+            self.assertEqual(action, encode_action(expected[0].get_value(), len(expected)))
+
+    def test_select_actions_never_picks_masked_actions(self):
+        rng = np.random.default_rng(0)
+        observations = rng.random((32, self.policy.weights.shape[0]), dtype=np.float32)
+        masks = rng.random((32, self.policy.bias.shape[0])) < 0.2
+        masks[:, PASS_ACTION] = True
+        actions = self.policy.select_actions(observations, masks)
+        self.assertTrue(masks[np.arange(32), actions].all())
+
+    def test_rejects_wrong_shapes(self):
+        with self.assertRaises(ValueError):
+            LinearPolicy(np.zeros((2, 2)), np.zeros(2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,229 @@
+import unittest
+import sys
+import os
+from concurrent.futures import Future
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from game_engine.bots.broker import pending_bot_decisions
+from game_engine.bots.scheduler import BotComputeScheduler
+from game_engine.bots.search import search_decision
+from game_engine.card import Card
+from game_engine.simulation import create_simulated_game, quiet_engine
+
+
+class ManualClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class RecordingExecutor:
+    """Runs submitted searches synchronously, or leaves them running to simulate an overrun."""
+
+    def __init__(self, hang=False):
+        self.hang = hang
+        self.rooms = []
+        self.futures = []
+
+    def submit(self, fn, game, *args):
+        self.rooms.append(game.room_code)
+        future = Future()
+        if self.hang:
+            future.set_running_or_notify_cancel()  # A worker picked it up, so it can no longer be cancelled
+        else:
+            future.set_result(fn(game, *args))
+        self.futures.append(future)
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+def create_bot_room(seed, room_code):
+    game = create_simulated_game(4, seed=seed)
+    game.room_code = room_code
+    for player in game.players:
+        player.is_bot = True
+    return game
+
+
+class TestSearchDecision(unittest.TestCase):
+
+    def test_returns_a_legal_play_from_the_hand(self):
+        # Arrange
+        game = create_simulated_game(4, seed=2)
+        player = game.get_current_player()
+
+        # Act
+        cards_data, rollouts, cpu_seconds = search_decision(game, player.player_id, False, 0.05, seed=1)
+
+        # Assert
+        legal_ids = [sorted(card.id for card in play) for play in game.get_legal_plays(player.player_id)]
+        self.assertIn(sorted(card['id'] for card in cards_data), legal_ids)
+        self.assertGreater(rollouts, 0)
+        self.assertGreaterEqual(cpu_seconds, 0.0)
+
+    def test_single_candidate_skips_search(self):
+        # Arrange
+        game = create_simulated_game(4, seed=2)
+        player = game.get_current_player()
+        player.get_hand().cards = [Card("H", "9")]
+
+        # Act
+        cards_data, rollouts, _ = search_decision(game, player.player_id, False, 1.0, seed=1)
+
+        # Assert
+        self.assertEqual([card['rank'] for card in cards_data], ["9"])
+        self.assertEqual(rollouts, 0)
+
+
+class TestBotComputeScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = ManualClock()
+        self.updated = []
+
+    def _scheduler(self, executor, **kwargs):
+        return BotComputeScheduler(max_workers=1, time_slice=0.01, executor=executor, clock=self.clock,
+                                   on_decision=self.updated.append, **kwargs)
+
+    def test_rooms_are_served_round_robin(self):
+        # Arrange
+        executor = RecordingExecutor()
+        scheduler = self._scheduler(executor, max_wait=1.0)
+        games = [create_bot_room(seed, code) for seed, code in ((1, "AAAA"), (2, "BBBB"), (3, "CCCC"))]
+
+        # Act
+        with quiet_engine():
+            scheduler.collect(games)
+            for _ in range(3):
+                scheduler.pump()
+                self.clock.now += 0.01
+
+        # Assert
+        self.assertEqual(executor.rooms, ["AAAA", "BBBB", "CCCC"])
+        self.assertEqual(scheduler.searched, 2)
+
+    def test_degrades_to_fallback_when_budget_is_spent(self):
+        # Arrange
+        executor = RecordingExecutor()
+        scheduler = self._scheduler(executor, cpu_budget=0.0, max_wait=0.05)
+        games = [create_bot_room(1, "AAAA"), create_bot_room(2, "BBBB")]
+        scheduler.collect(games)
+
+        # Act
+        with quiet_engine():
+            scheduler.pump()
+            self.clock.now += 0.1
+            scheduler.pump()
+
+        # Assert
+        self.assertEqual(executor.rooms, ["AAAA"])
+        self.assertEqual(scheduler.degraded, 1)
+        self.assertEqual(scheduler.searched, 1)
+        self.assertEqual({game.room_code for game in self.updated}, {"AAAA", "BBBB"})
+
+    def test_overrunning_search_is_answered_by_fallback(self):
+        # Arrange
+        scheduler = self._scheduler(RecordingExecutor(hang=True))
+        game = create_bot_room(1, "AAAA")
+        scheduler.collect([game])
+
+        # Act
+        with quiet_engine():
+            scheduler.pump()
+            self.clock.now += 0.05
+            scheduler.pump()
+
+        # Assert
+        self.assertEqual(scheduler.metrics()['in_flight'], 0)
+        self.assertEqual(scheduler.degraded, 1)
+        self.assertEqual(self.updated, [game])
+
+    def test_overrun_search_keeps_its_worker_until_it_finishes(self):
+        # Arrange
+        executor = RecordingExecutor(hang=True)
+        scheduler = self._scheduler(executor, max_wait=1.0)
+        games = [create_bot_room(1, "AAAA"), create_bot_room(2, "BBBB")]
+        scheduler.collect(games)
+
+        # Act
+        with quiet_engine():
+            scheduler.pump()
+            self.clock.now += 0.05
+            scheduler.pump()  # AAAA overruns and is answered by the fallback; its worker is still busy
+            self.clock.now += 0.05
+            scheduler.pump()
+            rooms_while_busy = list(executor.rooms)
+            executor.futures[0].set_result(None)
+            scheduler.pump()
+
+        # Assert
+        self.assertEqual(rooms_while_busy, ["AAAA"])
+        self.assertEqual(executor.rooms, ["AAAA", "BBBB"])
+        self.assertEqual(scheduler.metrics()['abandoned'], 0)
+
+    def test_stale_request_is_dropped(self):
+        # Arrange
+        executor = RecordingExecutor()
+        scheduler = self._scheduler(executor)
+        game = create_bot_room(1, "AAAA")
+        scheduler.collect([game])
+        game.state_hash ^= 1
+
+        # Act
+        scheduler.pump()
+
+        # Assert
+        self.assertEqual(executor.rooms, [])
+        self.assertEqual(scheduler.stale, 1)
+
+    def test_seat_stays_reserved_until_its_queued_move_lands(self):
+        # Arrange
+        deferred = []
+        scheduler = self._scheduler(RecordingExecutor(), run_in_room=lambda room_code, fn, *args: deferred.append((fn, args)))
+        game = create_bot_room(1, "AAAA")
+        scheduler.collect([game])
+        with quiet_engine():
+            scheduler.pump()  # Dispatches the search
+            scheduler.pump()  # Queues the move on the room
+
+        # Act
+        scheduler.collect([game])
+        depth_while_queued = scheduler.queue_depth
+        with quiet_engine():
+            for fn, args in deferred:
+                fn(*args)
+
+        # Assert
+        self.assertEqual(len(deferred), 1)
+        self.assertEqual(depth_while_queued, 0)
+        self.assertEqual(self.updated, [game])
+        scheduler.collect([game])
+        self.assertEqual(scheduler.queue_depth, len(list(pending_bot_decisions(game))))
+
+    def test_metrics_report_queue_and_latency(self):
+        # Arrange
+        scheduler = self._scheduler(RecordingExecutor(), cpu_budget=0.0, max_wait=0.05)
+        scheduler.collect([create_bot_room(1, "AAAA"), create_bot_room(2, "BBBB")])
+
+        # Act
+        before = scheduler.metrics()
+        with quiet_engine():
+            scheduler.pump()
+            self.clock.now += 0.1
+            scheduler.pump()
+        after = scheduler.metrics()
+
+        # Assert
+        self.assertEqual(before['queue_depth'], 2)
+        self.assertIsNone(before['latency_ms']['p50'])
+        self.assertEqual(after['queue_depth'], 0)
+        self.assertEqual(after['latency_ms']['max'], 100.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+import random
+import shutil
+import sys
+import os
+import tempfile
+from concurrent.futures import Future
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from game_engine.bots.heuristic import DEFAULT_WEIGHTS
+from game_engine.bots.tuning import (
+    PARAMETER_BOUNDS, TournamentTuner, play_evaluation_games, summarize, mutate, format_report,
+)
+
+
+class ImmediateExecutor:
+    """Runs submitted work synchronously so the tuner can be tested without a process pool."""
+
+    def __init__(self):
+        self.submitted = 0
+
+    def submit(self, fn, *args):
+        self.submitted += 1
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+class TestTuningHelpers(unittest.TestCase):
+
+    def test_evaluation_games_are_reproducible(self):
+        first = play_evaluation_games(DEFAULT_WEIGHTS, [1, 2, 3])
+        second = play_evaluation_games(DEFAULT_WEIGHTS, [1, 2, 3])
+        self.assertEqual(first, second)
+        self.assertEqual(len(first), 3)
+
+    def test_summarize_pairs_with_baseline(self):
+        # Act
+        summary = summarize([1.0, -1.0, 1.0, -1.0], [1.0, -1.0, 1.0, -1.0])
+
+        # Assert
+        self.assertEqual(summary['games'], 4)
+        self.assertEqual(summary['advantage'], 0.0)
+        self.assertEqual(summary['advantage_ci'], 0.0)
+        self.assertGreater(summary['mean_reward_ci'], 0.0)
+
+    def test_mutate_stays_within_bounds(self):
+        rng = random.Random(0)
+        for _ in range(100):
+            child = mutate(DEFAULT_WEIGHTS, rng, 1.0)
+            for name, (low, high, is_integer) in PARAMETER_BOUNDS.items():
+                self.assertTrue(low <= child[name] <= high)
+                if is_integer:
+                    self.assertIsInstance(child[name], int)
+
+
+class TestTournamentTuner(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.checkpoint_path = os.path.join(self.directory, "tuning.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _tuner(self, executor, checkpoint_path=None):
+        return TournamentTuner(population_size=3, elite_count=1, games_per_candidate=6, games_per_task=2,
+                               checkpoint_path=checkpoint_path, seed=4, executor=executor)
+
+    def test_run_reports_every_candidate_and_splits_work_into_tasks(self):
+        # Arrange
+        executor = ImmediateExecutor()
+        tuner = self._tuner(executor)
+
+        # Act
+        results = tuner.run(generations=1)
+
+        # Assert
+        self.assertEqual(len(results), 3)
+        self.assertEqual(executor.submitted, 4 * 3)  # Baseline plus 3 candidates, 3 tasks each
+        self.assertEqual([r['advantage'] for r in results], sorted((r['advantage'] for r in results), reverse=True))
+        self.assertIn("advantage", format_report(results))
+
+    def test_resumes_from_checkpoint(self):
+        # Arrange
+        uninterrupted = self._tuner(ImmediateExecutor())
+        uninterrupted.run(generations=2)
+        self._tuner(ImmediateExecutor(), self.checkpoint_path).run(generations=1)
+
+        # Act
+        resumed = self._tuner(ImmediateExecutor(), self.checkpoint_path)
+        resumed.run(generations=2)
+
+        # Assert
+        self.assertEqual(resumed.generation, 2)
+        self.assertEqual(len(resumed.history), 2)
+        self.assertEqual(resumed.population, uninterrupted.population)
+
+if __name__ == '__main__':
+    unittest.main()
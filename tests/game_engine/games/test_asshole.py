@@ -1,4 +1,5 @@
 import unittest
+import random
 import sys
 import os
 from unittest.mock import patch, MagicMock
@@ -10,6 +11,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..',
 from game_engine.games.asshole import AssholeGame
 from game_engine.deck import Deck
 from game_engine.player import Player
+from game_engine.card import Card
 
 class TestAssholeGameInit(unittest.TestCase):
     """
@@ -68,5 +70,265 @@ class TestAssholeGameInit(unittest.TestCase):
         self.assertEqual(game_without_room.status, "CLI_MODE")
         # self.assertIsInstance(game_without_room.deck, MagicMock)
 
+
+
+class TestAssholeGameStateHash(unittest.TestCase):
+    """
+    Tests that the incrementally maintained state_hash always matches a full recomputation.
+    """
+
+    def _new_started_game(self, seed):
+        random.seed(seed)
+        game = AssholeGame(room_code="ABCD")
+        for i in range(4):
+            game.add_player(Player(f"Player {i}", player_id=f"p{i}"))
+        with patch('builtins.print'):
+            game.start_game()
+        return game
+
+    def test_state_hash_matches_recomputation_through_full_game(self):
+        for seed in range(5):
+            game = self._new_started_game(seed)
+            rng = random.Random(seed)
+            seen_hashes = {game.state_hash}
+            steps = 0
+            with patch('builtins.print'):
+                while not game.is_game_over and steps < 1000:
+                    steps += 1
+                    if game.interrupt_active:
+                        pending = [pid for pid in game.get_active_player_ids()
+                                   if pid not in game.players_responded_to_interrupt and pid != game.interrupt_initiator_player_id]
+                        if pending:
+                            game.submit_interrupt_bid(pending[0], None)
+                        else:
+                            game.resolve_interrupt()
+                    else:
+                        player = game.get_current_player()
+                        plays = game.get_legal_plays(player.player_id)
+                        if not player.get_hand().cards:
+                            # A player who cleared with their last card keeps the lead; move on.
+                            game.advance_turn()
+                        elif game.pile and (not plays or rng.random() < 0.3):
+                            game.pass_turn(player.player_id)
+                        else:
+                            game.play_cards(player.player_id, [c.to_dict() for c in rng.choice(plays)])
+                    self.assertEqual(game.state_hash, game.compute_state_hash())
+                    seen_hashes.add(game.state_hash)
+
+            self.assertTrue(game.is_game_over)
+            self.assertGreater(len(seen_hashes), 10)
+
+    def test_state_hash_changes_on_turn_change_and_is_reproducible(self):
+        game_a = self._new_started_game(42)
+        game_b = self._new_started_game(42)
+        self.assertEqual(game_a.state_hash, game_b.state_hash)
+
+        before = game_a.state_hash
+        game_a.current_player_index = (game_a.current_player_index + 1) % 4
+        self.assertNotEqual(game_a.state_hash, before)
+        self.assertEqual(game_a.state_hash, game_a.compute_state_hash())
+
+
+class TestAssholeGameLegalPlays(unittest.TestCase):
+    """
+    Tests for get_legal_plays, which must agree with what play_cards accepts.
+    """
+
+    def setUp(self):
+        self.game = AssholeGame(room_code="ABCD")
+        for i in range(4):
+            self.game.add_player(Player(f"Player {i}", player_id=f"p{i}"))
+        with patch('builtins.print'):
+            self.game.start_game()
+        self.player = self.game.get_current_player()
+
+    def _play_strings(self):
+        return sorted("".join(sorted(c.to_string() for c in play)) for play in self.game.get_legal_plays(self.player.player_id))
+
+    def test_any_set_can_lead_an_empty_pile(self):
+        self.player.get_hand().cards = [Card("H", "5"), Card("S", "5"), Card("D", "9")]
+        self.assertEqual(self._play_strings(), ["5H", "5H5S", "9D"])
+
+    def test_must_match_count_and_beat_rank_on_pile(self):
+        # Arrange
+        self.game.pile = [Card("C", "8"), Card("D", "8")]
+        self.game.current_play_rank = 8
+        self.game.current_play_count = 2
+        self.player.get_hand().cards = [Card("H", "5"), Card("S", "5"), Card("D", "9"), Card("H", "9"),
+                                        Card("S", "3"), Card("C", "2")]
+
+        # Act & Assert - 2s and up to two 3s are always playable
+        self.assertEqual(self._play_strings(), ["2C", "3S", "9D9H"])
+
+    def test_no_plays_when_not_players_turn_or_interrupt_open(self):
+        other = next(p for p in self.game.players if p is not self.player)
+        self.assertEqual(self.game.get_legal_plays(other.player_id), [])
+        self.game.interrupt_active = True
+        self.assertEqual(self.game.get_legal_plays(self.player.player_id), [])
+
+    def test_plays_for_hand_ignore_whose_turn_it_is(self):
+        other = next(p for p in self.game.players if p is not self.player)
+        other.get_hand().cards = [Card("H", "5"), Card("D", "9")]
+        plays = self.game.get_plays_for_hand(other.get_hand().cards)
+        self.assertEqual(sorted(play[0].to_string() for play in plays), ["5H", "9D"])
+
+    def test_legal_bid_completes_the_bomb(self):
+        # Arrange
+        bidder = next(p for p in self.game.players if p is not self.player)
+        bidder.get_hand().cards = [Card("H", "7"), Card("S", "7"), Card("D", "9")]
+        self.game.interrupt_active = True
+        self.game.interrupt_type = 'bomb_opportunity'
+        self.game.interrupt_initiator_player_id = self.player.player_id
+        self.game.interrupt_rank = 7
+        self.game.interrupt_initial_pile_count = 2
+        self.game.players_responded_to_interrupt = {self.player.player_id}
+
+        # Act & Assert
+        self.assertEqual(sorted(c.to_string() for c in self.game.get_legal_bid(bidder.player_id)), ["7H", "7S"])
+        self.assertIsNone(self.game.get_legal_bid(self.player.player_id))
+        self.game.interrupt_initial_pile_count = 1
+        self.assertIsNone(self.game.get_legal_bid(bidder.player_id))
+
+class TestAssholeGameValidation(unittest.TestCase):
+    """
+    Tests for validate_play / validate_bid, which must reject exactly what play_cards /
+    submit_interrupt_bid reject, without changing the game.
+    """
+
+    def setUp(self):
+        self.game = AssholeGame(room_code="ABCD")
+        for i in range(4):
+            self.game.add_player(Player(f"Player {i}", player_id=f"p{i}"))
+        with patch('builtins.print'):
+            self.game.start_game()
+        self.player = self.game.get_current_player()
+        self.other = next(p for p in self.game.players if p is not self.player)
+
+    def test_validation_agrees_with_play_cards_and_changes_nothing(self):
+        # Arrange
+        self.game.pile = [Card("C", "8"), Card("D", "8")]
+        self.game.current_play_rank = 8
+        self.game.current_play_count = 2
+        self.player.get_hand().cards = [Card("H", "5"), Card("S", "5"), Card("D", "9"), Card("H", "9"), Card("S", "3")]
+        attempts = [[Card("H", "5"), Card("S", "5")], [Card("D", "9")], [Card("D", "9"), Card("H", "9")],
+                    [Card("S", "3")], [Card("C", "K")], [Card("H", "5"), Card("D", "9")]]
+
+        for cards in attempts:
+            cards_data = [card.to_dict() for card in cards]
+            state_hash = self.game.state_hash
+            hand_version = self.player.get_hand().version
+
+            # Act
+            try:
+                self.game.validate_play(self.player.player_id, cards_data)
+                valid = True
+            except ValueError:
+                valid = False
+
+            # Assert
+            self.assertEqual(self.game.state_hash, state_hash)
+            self.assertEqual(self.player.get_hand().version, hand_version)
+            expected = any(sorted(c.to_string() for c in play) == sorted(c.to_string() for c in cards)
+                           for play in self.game.get_legal_plays(self.player.player_id))
+            self.assertEqual(valid, expected, [c.to_string() for c in cards])
+
+    def test_play_out_of_turn_is_rejected(self):
+        card = self.other.get_hand().cards[0]
+        with self.assertRaisesRegex(ValueError, "not this player's turn"):
+            self.game.validate_play(self.other.player_id, [card.to_dict()])
+
+    def test_bid_validation_does_not_mark_the_player_as_responded(self):
+        # Arrange
+        self.other.get_hand().cards = [Card("H", "7"), Card("S", "7"), Card("D", "3")]
+        self.game.record_interrupt_initiation('bomb_opportunity', self.player.player_id, 7, "bomb!",
+                                              initial_pile_count_for_interrupt_rank=2)
+
+        # Act & Assert
+        with self.assertRaisesRegex(ValueError, "exactly 2"):
+            self.game.validate_bid(self.other.player_id, [Card("H", "7").to_dict()])
+        self.assertEqual(len(self.game.validate_bid(self.other.player_id, [Card("H", "7").to_dict(), Card("S", "7").to_dict()])), 2)
+        self.assertEqual(self.game.validate_bid(self.other.player_id, None), [])
+        self.assertNotIn(self.other.player_id, self.game.players_responded_to_interrupt)
+        with self.assertRaisesRegex(ValueError, "already responded"):
+            self.game.validate_bid(self.player.player_id, None)
+
+class TestAssholeGameMatchRounds(unittest.TestCase):
+    """
+    Tests for playing several rounds of a match in one room.
+    """
+
+    def play_round(self, game, seed):
+        from game_engine.bots.heuristic import HeuristicPolicy
+        from game_engine.simulation import run_headless_game
+        run_headless_game(game, HeuristicPolicy(rng=random.Random(seed)))
+        self.assertTrue(game.is_game_over)
+
+    def setUp(self):
+        random.seed(4)
+        self.game = AssholeGame(room_code="ABCD")
+        for i in range(5):
+            self.game.add_player(Player(f"Player {i}", player_id=f"p{i}"))
+        with patch('builtins.print'):
+            self.game.start_game()
+
+    def test_next_round_reuses_seats_cards_and_hands(self):
+        # Arrange
+        seats = list(self.game.players)
+        hands = [player.hand for player in seats]
+        cards = {id(card) for player in seats for card in player.hand.cards}
+        self.play_round(self.game, seed=1)
+
+        # Act
+        with patch('builtins.print'):
+            self.game.start_next_round()
+
+        # Assert
+        self.assertEqual(self.game.round_number, 2)
+        self.assertEqual(self.game.players, seats)
+        self.assertTrue(all(player.hand is hand for player, hand in zip(seats, hands)))
+        self.assertEqual({id(card) for player in seats for card in player.hand.cards}, cards)
+        self.assertTrue(all(p.rank is None and p.is_active for p in seats))
+        self.assertEqual((self.game.pile, self.game.discard_pile), ([], []))
+        self.assertEqual(self.game.state_hash, self.game.compute_state_hash())
+
+    def test_a_match_builds_the_deck_only_once(self):
+        with patch('game_engine.game_state.Deck', wraps=Deck) as deck_class, patch('builtins.print'):
+            game = AssholeGame(room_code="ABCD")
+            for i in range(4):
+                game.add_player(Player(f"Player {i}", player_id=f"p{i}"))
+            game.start_game()
+            for round_seed in range(3):
+                self.play_round(game, round_seed)
+                game.start_next_round()
+        self.assertEqual(deck_class.call_count, 1)
+        self.assertEqual(len(game._all_cards), 52)
+
+    def test_asshole_and_president_exchange_cards(self):
+        # Arrange
+        self.play_round(self.game, seed=2)
+        standings = self.game.get_finishing_order()
+
+        # Act
+        with patch('builtins.print'):
+            self.game.start_next_round()
+
+        # Assert
+        president, asshole = self.game.get_player_by_id(standings[0]), self.game.get_player_by_id(standings[-1])
+        tribute = self.game.last_exchange[0]
+        self.assertEqual((tribute['from_player_id'], tribute['to_player_id']), (asshole.player_id, president.player_id))
+        self.assertEqual(len(tribute['cards']), 2)
+        self.assertTrue(all(card in president.hand.cards for card in tribute['cards']))
+        best_left = max(asshole.hand.cards, key=self.game._exchange_strength)
+        self.assertTrue(all(self.game._exchange_strength(card) >= self.game._exchange_strength(best_left)
+                            for card in tribute['cards']))
+        self.assertEqual(len(self.game.last_exchange), 4)  # Vice Asshole and Vice President trade too
+        self.assertEqual(sum(len(p.hand.cards) for p in self.game.players), 52)
+
+    def test_next_round_needs_a_finished_round(self):
+        with self.assertRaisesRegex(ValueError, "still being played"):
+            self.game.start_next_round()
+        with self.assertRaisesRegex(ValueError, "start_game"):
+            AssholeGame(room_code="EFGH").start_next_round()
+
 if __name__ == '__main__':
-    unittest.main(argv=['first-arg-is-ignored'], exit=False)
\ No newline at end of file
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
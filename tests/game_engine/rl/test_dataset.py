@@ -0,0 +1,110 @@
+import unittest
+import random
+import shutil
+import sys
+import os
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from game_engine.bots.heuristic import HeuristicPolicy
+from game_engine.simulation import create_simulated_game, run_headless_game
+from game_engine.rl.encoding import OBSERVATION_SIZE, ACTION_SIZE
+from game_engine.rl.dataset import TrajectoryWriter, open_dataset, generate_self_play_dataset
+
+
+class TestTrajectoryDataset(unittest.TestCase):
+    """
+    Unit tests for the memory-mapped self-play dataset.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_records_every_decision_with_final_reward(self):
+        # Arrange
+        game = create_simulated_game(4, seed=3)
+        policy = HeuristicPolicy(rng=random.Random(3))
+
+        # Act
+        with TrajectoryWriter(self.directory, chunk_rows=16) as writer:
+            run_headless_game(game, policy, recorder=writer)
+            rows = writer.rows_written
+        chunks = open_dataset(self.directory)
+
+        # Assert
+        self.assertGreater(rows, 16)
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(sum(len(chunk['actions']) for chunk in chunks), rows)
+        for chunk in chunks:
+            self.assertEqual(chunk['observations'].shape[1], OBSERVATION_SIZE)
+            self.assertEqual(chunk['action_masks'].shape[1], ACTION_SIZE)
+            self.assertTrue(np.isclose(chunk['rewards'][:, None], [1.0, 1.0 / 3.0, -1.0 / 3.0, -1.0]).any(axis=1).all())
+            self.assertTrue(chunk['action_masks'][np.arange(len(chunk['actions'])), chunk['actions']].all())
+
+    def test_unfinished_game_is_not_indexed(self):
+        # Arrange
+        game = create_simulated_game(4, seed=4)
+        policy = HeuristicPolicy(rng=random.Random(4))
+
+        # Act
+        with TrajectoryWriter(self.directory, chunk_rows=8) as writer:
+            run_headless_game(game, policy, recorder=writer)
+            committed = writer.rows_written
+            writer.record(game, game.players[0], False, None)
+
+        # Assert
+        self.assertEqual(sum(len(chunk['actions']) for chunk in open_dataset(self.directory)), committed)
+
+    def test_reopened_shard_keeps_earlier_games_and_appends(self):
+        # Arrange
+        policy = HeuristicPolicy(rng=random.Random(5))
+        with TrajectoryWriter(self.directory, chunk_rows=64) as writer:
+            run_headless_game(create_simulated_game(4, seed=5), policy, recorder=writer)
+            first_rows = writer.rows_written
+        first_actions = np.concatenate([chunk['actions'] for chunk in open_dataset(self.directory)]).copy()
+
+        # Act
+        with TrajectoryWriter(self.directory, chunk_rows=64) as writer:
+            run_headless_game(create_simulated_game(4, seed=6), policy, recorder=writer)
+            total_rows = writer.rows_written
+        chunks = open_dataset(self.directory)
+
+        # Assert
+        self.assertGreater(total_rows, first_rows)
+        self.assertEqual(sum(len(chunk['actions']) for chunk in chunks), total_rows)
+        actions = np.concatenate([chunk['actions'] for chunk in chunks])
+        np.testing.assert_array_equal(actions[:first_rows], first_actions)
+        game_ids = np.concatenate([chunk['game_ids'] for chunk in chunks])
+        self.assertEqual(set(game_ids[:first_rows]), {0})
+        self.assertEqual(set(game_ids[first_rows:]), {1})
+
+    def test_refuses_a_non_empty_directory_without_index(self):
+        # Arrange
+        shard_dir = os.path.join(self.directory, 'shard-000')
+        os.makedirs(shard_dir)
+        open(os.path.join(shard_dir, 'chunk-00000.actions.npy'), 'wb').close()
+
+        # Act / Assert
+        with self.assertRaises(ValueError):
+            TrajectoryWriter(self.directory)
+
+    def test_generate_self_play_dataset_writes_one_shard_per_worker(self):
+        # Act
+        rows = generate_self_play_dataset(self.directory, num_games=4, num_workers=2, seed=1, chunk_rows=256)
+
+        # Assert
+        self.assertEqual(sorted(os.listdir(self.directory)), ['shard-000', 'shard-001'])
+        chunks = open_dataset(self.directory)
+        self.assertEqual(sum(len(chunk['actions']) for chunk in chunks), rows)
+        game_ids = np.concatenate([chunk['game_ids'] for chunk in chunks])
+        self.assertEqual(set(np.unique(game_ids)), {0, 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+import sys
+import os
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from game_engine.card import Card
+from game_engine.simulation import create_simulated_game
+from game_engine.rl.encoding import (
+    ACTION_SIZE, OBSERVATION_SIZE, PASS_ACTION, HAND_OFFSET, PILE_RANK_OFFSET, PILE_COUNT_OFFSET,
+    TURN_OFFSET, encode_action, decode_action, encode_observation, legal_action_mask, cards_for_action,
+)
+
+
+class TestRLEncoding(unittest.TestCase):
+    """
+    Unit tests for the fixed-size observation and action encoding.
+    """
+
+    def setUp(self):
+        self.game = create_simulated_game(4, seed=7)
+        self.player = self.game.get_current_player()
+
+    def test_action_round_trip(self):
+        for rank_value in range(2, 15):
+            for count in range(1, 5):
+                action = encode_action(rank_value, count)
+                self.assertTrue(0 < action < ACTION_SIZE)
+                self.assertEqual(decode_action(action), (rank_value, count))
+        self.assertIsNone(decode_action(PASS_ACTION))
+
+    def test_observation_counts_own_hand(self):
+        # Act
+        observation = encode_observation(self.game, self.player)
+
+        # Assert
+        self.assertEqual(observation.shape, (OBSERVATION_SIZE,))
+        self.assertEqual(observation.dtype, np.float32)
+        self.assertEqual(observation[HAND_OFFSET:HAND_OFFSET + 13].sum(), len(self.player.get_hand().cards))
+        self.assertEqual(observation[TURN_OFFSET], 1.0)
+
+    def test_observation_writes_into_preallocated_row(self):
+        # Arrange
+        batch = np.full((2, OBSERVATION_SIZE), 9.0, dtype=np.float32)
+
+        # Act
+        result = encode_observation(self.game, self.player, out=batch[1])
+
+        # Assert
+        self.assertTrue(np.shares_memory(result, batch))
+        self.assertTrue((batch[0] == 9.0).all())
+        self.assertEqual(batch[1, HAND_OFFSET:HAND_OFFSET + 13].sum(), len(self.player.get_hand().cards))
+
+    def test_observation_encodes_pile(self):
+        # Arrange
+        self.game.pile = [Card("H", "8"), Card("S", "8")]
+        self.game.current_play_rank = 8
+        self.game.current_play_count = 2
+
+        # Act
+        observation = encode_observation(self.game, self.player)
+
+        # Assert
+        self.assertEqual(observation[PILE_RANK_OFFSET + 6], 1.0)
+        self.assertEqual(observation[PILE_COUNT_OFFSET], 2.0)
+
+    def test_mask_matches_legal_plays_on_empty_pile(self):
+        # Act
+        mask = legal_action_mask(self.game, self.player, False)
+
+        # Assert
+        self.assertFalse(mask[PASS_ACTION])
+        self.assertEqual(mask.sum(), len(self.game.get_legal_plays(self.player.player_id)))
+
+    def test_cards_for_action_rejects_unheld_cards(self):
+        # Arrange
+        held = {card.get_value() for card in self.player.get_hand().cards}
+        missing = next(value for value in range(2, 15) if value not in held)
+
+        # Act / Assert
+        with self.assertRaises(ValueError):
+            cards_for_action(self.player, encode_action(missing, 1))
+        self.assertIsNone(cards_for_action(self.player, PASS_ACTION))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+import sys
+import os
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from game_engine.rl.encoding import ACTION_SIZE, OBSERVATION_SIZE
+from game_engine.rl.env import AssholeEnv, VectorAssholeEnv, sample_legal_actions, measure_throughput
+
+
+class TestAssholeEnv(unittest.TestCase):
+    """
+    Unit tests for the single-game RL environment.
+    """
+
+    def _play_episode(self, env, seed):
+        rng = np.random.default_rng(seed)
+        observation, mask = env.reset(seed=seed)
+        trajectory = [observation.copy()]
+        done = False
+        while not done:
+            action = int(sample_legal_actions(mask[None, :], rng)[0])
+            observation, reward, done, mask = env.step(action)
+            trajectory.append(observation.copy())
+        return trajectory, reward
+
+    def test_episode_ends_with_finishing_reward(self):
+        for seed in range(5):
+            # Act
+            _, reward = self._play_episode(AssholeEnv(), seed)
+
+            # Assert
+            self.assertTrue(any(abs(reward - expected) < 1e-9 for expected in (1.0, 1.0 / 3.0, -1.0 / 3.0, -1.0)))
+
+    def test_reset_with_seed_is_reproducible(self):
+        first, first_reward = self._play_episode(AssholeEnv(), 11)
+        second, second_reward = self._play_episode(AssholeEnv(), 11)
+        self.assertEqual(first_reward, second_reward)
+        self.assertEqual(len(first), len(second))
+        for a, b in zip(first, second):
+            np.testing.assert_array_equal(a, b)
+
+    def test_illegal_action_is_rejected(self):
+        # Arrange
+        env = AssholeEnv()
+        _, mask = env.reset(seed=2)
+        illegal = int(np.flatnonzero(~mask)[0])
+
+        # Act / Assert
+        with self.assertRaises(ValueError):
+            env.step(illegal)
+
+    def test_step_after_done_is_rejected(self):
+        env = AssholeEnv()
+        self._play_episode(env, 4)
+        with self.assertRaises(ValueError):
+            env.step(0)
+
+
+class TestVectorAssholeEnv(unittest.TestCase):
+    """
+    Unit tests for the batched environment.
+    """
+
+    def test_in_process_shapes_and_auto_reset(self):
+        # Arrange
+        env = VectorAssholeEnv(num_envs=6, seed=3)
+        rng = np.random.default_rng(3)
+
+        # Act
+        observations, masks = env.reset()
+        finished = 0
+        for _ in range(300):
+            observations, rewards, dones, masks = env.step(sample_legal_actions(masks, rng))
+            finished += int(dones.sum())
+
+        # Assert
+        self.assertEqual(observations.shape, (6, OBSERVATION_SIZE))
+        self.assertEqual(masks.shape, (6, ACTION_SIZE))
+        self.assertGreater(finished, 0)
+        self.assertTrue(masks.any(axis=1).all())
+
+    def test_worker_processes_match_in_process_results(self):
+        # Arrange
+        local = VectorAssholeEnv(num_envs=4, seed=5)
+        remote = VectorAssholeEnv(num_envs=4, seed=5, num_workers=2)
+        try:
+            local_obs, local_masks = local.reset()
+            remote_obs, remote_masks = remote.reset()
+            np.testing.assert_array_equal(local_obs, remote_obs)
+
+            # Act / Assert
+            rng = np.random.default_rng(5)
+            for _ in range(40):
+                actions = sample_legal_actions(local_masks, rng)
+                local_obs, local_rewards, local_dones, local_masks = local.step(actions)
+                remote_obs, remote_rewards, remote_dones, remote_masks = remote.step(actions)
+                np.testing.assert_array_equal(local_rewards, remote_rewards)
+                np.testing.assert_array_equal(local_dones, remote_dones)
+                np.testing.assert_array_equal(local_masks, remote_masks)
+        finally:
+            remote.close()
+
+    def test_measure_throughput_reports_steps_per_second(self):
+        env = VectorAssholeEnv(num_envs=2, seed=0)
+        self.assertGreater(measure_throughput(env, num_steps=10), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import asyncio
+import random
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from game_engine.async_loop import AsyncGameLoop, BotAgent, QueueAgent, ScriptedAgent, run_bot_tables, run_game_loops
+from game_engine.bots.heuristic import HeuristicPolicy
+from game_engine.simulation import create_simulated_game, get_final_standings, play_step, quiet_engine
+
+
+def bot_agents(game, seed):
+    return {p.player_id: BotAgent(HeuristicPolicy(rng=random.Random(seed))) for p in game.players}
+
+
+class TestAsyncGameLoop(unittest.TestCase):
+    """
+    Tests for AsyncGameLoop and its agents.
+    """
+
+    def test_many_bot_tables_finish_concurrently(self):
+        # Act
+        steps, _ = run_bot_tables(20, seed=3)
+
+        # Assert
+        self.assertEqual(len(steps), 20)
+        self.assertTrue(all(0 < s < 2000 for s in steps))
+
+    def test_scripted_replay_reproduces_a_recorded_game(self):
+        # Arrange: record a bot game seat by seat
+        game = create_simulated_game(4, seed=11)
+        policies = {p.player_id: HeuristicPolicy(rng=random.Random(5)) for p in game.players}
+        moves = {p.player_id: [] for p in game.players}
+        with quiet_engine():
+            while not game.is_game_over:
+                player, cards = play_step(game, policies)
+                if player is not None:
+                    moves[player.player_id].append(" ".join(f"{c.suit}{c.rank}" for c in cards) if cards else "pass")
+        recorded = get_final_standings(game)
+
+        replay = create_simulated_game(4, seed=11)
+        agents = {player_id: ScriptedAgent(script) for player_id, script in moves.items()}
+
+        # Act
+        with quiet_engine():
+            asyncio.run(AsyncGameLoop(replay, agents).run())
+
+        # Assert
+        self.assertTrue(replay.is_game_over)
+        self.assertEqual(get_final_standings(replay), recorded)
+        self.assertTrue(all(not agent.errors for agent in agents.values()))
+
+    def test_human_seat_waits_on_its_queue_and_sees_rejections(self):
+        # Arrange
+        game = create_simulated_game(4, seed=2)
+        agents = bot_agents(game, seed=2)
+        human_id = game.get_current_player().player_id
+        human = agents[human_id] = QueueAgent()
+        loop = AsyncGameLoop(game, agents)
+
+        async def play():
+            task = asyncio.ensure_future(run_game_loops([loop]))
+            await asyncio.sleep(0)
+            self.assertEqual(loop.steps, 0)  # Blocked on the human, not on stdin
+
+            human.submit("pass")  # Not allowed on an empty pile
+            human.submit("S99")   # Not a card
+            lowest = min(game.get_legal_plays(human_id), key=lambda cards: cards[0].get_value())
+            human.submit(lowest)
+            while not human.actions.empty() or loop.steps < 2:
+                await asyncio.sleep(0)
+            task.cancel()
+            return lowest
+
+        # Act
+        with quiet_engine():
+            lowest = asyncio.run(play())
+
+        # Assert
+        self.assertEqual(len(human.errors), 2)
+        self.assertTrue(all(card not in game.get_player_by_id(human_id).get_hand().cards for card in lowest))
+
+    def test_slow_decisions_fall_back_to_the_policy(self):
+        # Arrange: the human never answers
+        game = create_simulated_game(4, seed=4)
+        agents = bot_agents(game, seed=4)
+        agents[game.players[0].player_id] = QueueAgent()
+        loop = AsyncGameLoop(game, agents, decision_timeout=0.001)
+
+        # Act
+        with quiet_engine():
+            asyncio.run(loop.run())
+
+        # Assert
+        self.assertTrue(game.is_game_over)
+        self.assertGreater(loop.timeouts, 0)
+
+    def test_every_seat_needs_an_agent(self):
+        game = create_simulated_game(4, seed=1)
+        with self.assertRaisesRegex(ValueError, "No agent"):
+            AsyncGameLoop(game, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+import sys
+import os
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from game_engine.card import Card
+from game_engine.clock import ManualClock, WallClock
+from game_engine.games.asshole import AssholeGame
+from game_engine.player import Player
+
+
+class TestClocks(unittest.TestCase):
+    """
+    Unit tests for the clocks games use to time interrupt windows.
+    """
+
+    def test_manual_clock_only_moves_when_advanced(self):
+        clock = ManualClock(start=100)
+        self.assertEqual(clock.now(), 100)
+        self.assertEqual(clock.advance(2.5), 102.5)
+        clock.set(200)
+        self.assertEqual(clock.now(), 200)
+        with self.assertRaises(ValueError):
+            clock.advance(-1)
+        with self.assertRaises(ValueError):
+            clock.set(199)
+
+    def test_games_default_to_wall_clock(self):
+        with patch('game_engine.clock.time.time', return_value=1234.0):
+            self.assertEqual(AssholeGame(room_code="ABCD").clock.now(), 1234.0)
+        self.assertIsInstance(AssholeGame(room_code="ABCD").clock, WallClock)
+
+
+class TestInterruptWindowWithManualClock(unittest.TestCase):
+    """
+    The bomb window is timed by the game's clock, so it can be expired without waiting.
+    """
+
+    def setUp(self):
+        self.clock = ManualClock(start=1000)
+        self.game = AssholeGame(room_code="ABCD", clock=self.clock)
+        for i in range(4):
+            self.game.add_player(Player(f"Player {i}", player_id=f"p{i}"))
+        with patch('builtins.print'):
+            self.game.start_game()
+            self.game.record_interrupt_initiation('bomb_opportunity', 'p0', 7, "bomb!",
+                                                  initial_pile_count_for_interrupt_rank=2)
+
+    def test_window_expires_when_the_clock_reaches_the_deadline(self):
+        self.assertEqual(self.game.interrupt_active_until, 1000 + self.game.INTERRUPT_TIMEOUT_SECONDS)
+        self.clock.advance(self.game.INTERRUPT_TIMEOUT_SECONDS - 0.001)
+        self.assertFalse(self.game.is_interrupt_expired())
+        self.clock.advance(0.001)
+        self.assertTrue(self.game.is_interrupt_expired())
+
+    def test_bids_are_stamped_with_the_game_clock(self):
+        # Arrange
+        player = self.game.get_player_by_id('p1')
+        player.get_hand().cards = [Card("H", "7"), Card("S", "7")]
+        self.clock.advance(3)
+
+        # Act
+        with patch('builtins.print'):
+            self.game.submit_interrupt_bid('p1', [card.to_dict() for card in player.get_hand().cards])
+
+        # Assert
+        self.assertEqual(self.game.interrupt_bids[0]['bid_time'], 1003)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+import sys
+import os
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from game_engine.card import Card
+from game_engine.game_loop import GameLoop, parse_cards
+from game_engine.game_state import GameState
+from game_engine.player import Player
+
+
+class TestParseCards(unittest.TestCase):
+    """
+    Unit tests for turning typed cards ("S3 H3") into cards from a hand.
+    """
+
+    def setUp(self):
+        self.hand = [Card("S", "3"), Card("H", "3"), Card("D", "A"), Card("C", "10")]
+
+    def test_returns_the_hand_cards_themselves(self):
+        # Act
+        cards = parse_cards(self.hand, "s3 H3")
+
+        # Assert
+        self.assertEqual(len(cards), 2)
+        self.assertIs(cards[0], self.hand[0])
+        self.assertIs(cards[1], self.hand[1])
+
+    def test_accepts_numeric_face_ranks(self):
+        self.assertIs(parse_cards(self.hand, "D14")[0], self.hand[2])
+        self.assertIs(parse_cards(self.hand, "C10")[0], self.hand[3])
+
+    def test_rejects_bad_input(self):
+        for card_input, message in [("X3", "Invalid suit"), ("S1Z", "Invalid rank"), ("S", "Invalid card format"),
+                                    ("S4", "don't have"), ("S3 S3", "don't have"), ("S3 DA", "same rank")]:
+            with self.assertRaisesRegex(ValueError, message):
+                parse_cards(self.hand, card_input)
+
+    def test_game_loop_parse_card_input_uses_engine_suits_and_ranks(self):
+        # Arrange
+        player = Player("Alice")
+        player.hand.cards = [Card("S", "A")]
+        loop = GameLoop(GameState())
+
+        # Act
+        with patch('builtins.print'):
+            cards = loop.parse_card_input(player, "SA")
+
+        # Assert
+        self.assertEqual(cards, [Card("S", "A")])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -106,4 +106,36 @@ class TestHand(unittest.TestCase):
         
         # Assert
         self.assertEqual(threes, [card3_h, card3_d])
-        self.assertEqual(len(threes), 2)
\ No newline at end of file
+        self.assertEqual(len(threes), 2)
+
+    def test_version_changes_on_every_mutation(self):
+        """Tests that version is bumped by every way of changing the hand."""
+        card2_s = Card(Suit.SPADES, Rank.TWO)
+        card3_h = Card(Suit.HEARTS, Rank.THREE)
+        hand = Hand()
+        versions = [hand.version]
+
+        hand.add_card(card3_h)
+        versions.append(hand.version)
+        hand.add_card(card2_s)
+        versions.append(hand.version)
+        hand.sort_by_rank()
+        versions.append(hand.version)
+        hand.play_cards([card2_s])
+        versions.append(hand.version)
+        hand.remove_card(card3_h)
+        versions.append(hand.version)
+        hand.cards = [card2_s]
+        versions.append(hand.version)
+        hand.clear()
+        versions.append(hand.version)
+
+        self.assertEqual(len(set(versions)), len(versions))
+
+    def test_version_unchanged_when_removing_missing_card(self):
+        """Tests that a failed remove leaves the version alone."""
+        hand = Hand(cards=[Card(Suit.SPADES, Rank.TWO)])
+        version = hand.version
+        with patch('builtins.print'):
+            hand.remove_card(Card(Suit.HEARTS, Rank.ACE))
+        self.assertEqual(hand.version, version)
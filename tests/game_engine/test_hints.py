@@ -0,0 +1,75 @@
+import unittest
+import sys
+import os
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from game_engine.card import Card
+from game_engine.hints import MoveHintEngine
+from game_engine.simulation import create_simulated_game
+
+
+class TestMoveHintEngine(unittest.TestCase):
+    """
+    Unit tests for cached per-player move hints.
+    """
+
+    def setUp(self):
+        self.game = create_simulated_game(4, seed=5)
+        self.player = self.game.get_current_player()
+        self.other = self.game.players[(self.game.players.index(self.player) + 1) % 4]
+        self.engine = MoveHintEngine()
+
+    def test_plays_are_ranked_best_first(self):
+        # Arrange
+        self.player.get_hand().cards = [Card("H", "9"), Card("S", "5"), Card("D", "5"), Card("C", "2"), Card("S", "A")]
+
+        # Act
+        hints = self.engine.get_hints(self.game, self.player.player_id)
+
+        # Assert
+        self.assertTrue(hints['your_turn'])
+        self.assertFalse(hints['can_pass'])
+        self.assertEqual((hints['plays'][0]['rank_value'], hints['plays'][0]['count']), (5, 2))
+        self.assertEqual(len(hints['plays']), len(self.game.get_legal_plays(self.player.player_id)))
+
+    def test_cached_until_pile_or_own_hand_changes(self):
+        # Act
+        self.engine.get_hints(self.game, self.other.player_id)
+        self.engine.get_hints(self.game, self.other.player_id)
+        misses_before_play = self.engine.misses
+        with patch('builtins.print'):
+            self.game.play_cards(self.player.player_id, [self.game.get_legal_plays(self.player.player_id)[0][0].to_dict()])
+        self.engine.get_hints(self.game, self.other.player_id)
+
+        # Assert
+        self.assertEqual(misses_before_play, 1)
+        self.assertEqual(self.engine.hits, 1)
+        self.assertEqual(self.engine.misses, 2)
+
+    def test_turn_flags_are_fresh_on_cache_hits(self):
+        # Arrange
+        self.engine.get_hints(self.game, self.other.player_id)
+
+        # Act
+        self.game.current_player_index = self.game.players.index(self.other)
+        hints = self.engine.get_hints(self.game, self.other.player_id)
+
+        # Assert
+        self.assertEqual(self.engine.hits, 1)
+        self.assertTrue(hints['your_turn'])
+
+    def test_no_hints_once_the_game_is_over(self):
+        self.game.status = "FINISHED"
+        self.assertIsNone(self.engine.get_hints(self.game, self.player.player_id))
+
+    def test_forget_room_drops_cached_hints(self):
+        self.engine.get_hints(self.game, self.player.player_id)
+        self.engine.forget_room(self.game.room_code)
+        self.engine.get_hints(self.game, self.player.player_id)
+        self.assertEqual(self.engine.misses, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import random
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from game_engine.bots.heuristic import HeuristicPolicy
+from game_engine.clock import ManualClock
+from game_engine.games.asshole import AssholeGame
+from game_engine.history import GameHistory
+from game_engine.player import Player
+from game_engine.simulation import play_step, quiet_engine
+
+
+class TestGameHistory(unittest.TestCase):
+    """
+    Tests for checkpointed game history and rebuilding past states.
+    """
+
+    def play_recorded_game(self, history, seed=7):
+        random.seed(seed)
+        game = AssholeGame(room_code="ABCD", clock=ManualClock())
+        history.attach(game)
+        hashes = {}
+        with quiet_engine():
+            for i in range(4):
+                game.add_player(Player(f"Bot {i}", player_id=f"bot-{i}"))
+            game.start_game()
+            hashes[history.action_count] = game.state_hash
+            policy = HeuristicPolicy(rng=random.Random(seed))
+            while not game.is_game_over:
+                play_step(game, policy)
+                hashes[history.action_count] = game.state_hash
+        return game, hashes
+
+    def test_every_kept_move_rebuilds_exactly(self):
+        # Arrange
+        history = GameHistory(checkpoint_interval=5, max_checkpoints=1000)
+        game, hashes = self.play_recorded_game(history)
+
+        # Act & Assert
+        for move in range(history.oldest_move, history.action_count + 1):
+            rebuilt = history.state_at(move)
+            if move in hashes:
+                self.assertEqual(rebuilt.state_hash, hashes[move], f"move {move}")
+            self.assertEqual(rebuilt.state_hash, rebuilt.compute_state_hash())
+        self.assertEqual(history.state_at(history.action_count).state_hash, game.state_hash)
+
+    def test_rebuilt_state_is_detached_from_the_live_game(self):
+        # Arrange
+        history = GameHistory(checkpoint_interval=5)
+        game, _ = self.play_recorded_game(history)
+
+        # Act
+        rebuilt = history.state_at(history.action_count - 3)
+
+        # Assert
+        self.assertIsNone(rebuilt.history)
+        self.assertIsNot(rebuilt.players[0], game.players[0])
+
+    def test_memory_is_bounded_by_the_ring(self):
+        # Arrange
+        history = GameHistory(checkpoint_interval=4, max_checkpoints=3)
+
+        # Act
+        self.play_recorded_game(history)
+
+        # Assert
+        self.assertEqual(len(history.checkpoints), 3)
+        self.assertLessEqual(len(history.actions), 3 * 4)
+        with self.assertRaisesRegex(ValueError, "not kept"):
+            history.state_at(0)
+        with self.assertRaisesRegex(ValueError, "not kept"):
+            history.state_at(history.action_count + 1)
+
+    def test_nested_engine_calls_are_logged_once(self):
+        # Arrange
+        history = GameHistory()
+        game, _ = self.play_recorded_game(history)
+
+        # Act
+        names = {name for _, name, _, _ in history.action_log(history.oldest_move)}
+
+        # Assert
+        self.assertNotIn('record_interrupt_initiation', names)
+        self.assertFalse(history.in_action)
+        self.assertTrue(names <= {'play_cards', 'pass_turn', 'submit_interrupt_bid', 'resolve_interrupt', 'advance_turn', 'start_game', 'add_player'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import random
+import unittest
+import sys
+import os
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from game_engine.bots.heuristic import HeuristicPolicy
+from game_engine.card import Card
+from game_engine.ledger import CardLedger, CardConservationError
+from game_engine.rules import RuleSet
+from game_engine.simulation import create_simulated_game, run_headless_game
+from game_engine.zobrist import PILE, DISCARD
+
+
+class TestCardLedger(unittest.TestCase):
+    """
+    Unit tests for the incremental card-conservation ledger.
+    """
+
+    def test_strict_ledger_follows_whole_games(self):
+        for seed, rules in [(1, None), (2, None), (3, RuleSet(bombs=False)), (4, RuleSet(clear_rank='K'))]:
+            # Arrange
+            ledger = CardLedger(strict=True)
+            game = create_simulated_game(4, seed=seed, rules=rules, ledger=ledger)
+
+            # Act
+            run_headless_game(game, HeuristicPolicy(rng=random.Random(seed)))
+
+            # Assert
+            self.assertGreater(ledger.moves_checked, 0)
+            self.assertEqual(ledger.violations, [])
+            self.assertEqual(ledger.audit(game), [])
+            self.assertEqual(sum(ledger.counts.values()), 52)
+
+    def test_card_that_never_leaves_the_hand_is_flagged_with_its_event(self):
+        # Arrange
+        ledger = CardLedger()
+        game = create_simulated_game(4, seed=5, ledger=ledger)
+        player = game.get_current_player()
+        card = game.get_legal_plays(player.player_id)[0][:1]
+        player.get_hand().remove_card = lambda card: None  # Simulate a lost removal
+
+        # Act
+        with patch('builtins.print'):
+            game.play_cards(player.player_id, [c.to_dict() for c in card])
+
+        # Assert
+        self.assertEqual(len(ledger.violations), 1)
+        self.assertEqual(ledger.violations[0]['event'], "play")
+        self.assertIn("holds", ledger.violations[0]['detail'])
+
+    def test_move_from_the_wrong_place_is_flagged(self):
+        # Arrange
+        ledger = CardLedger(name="ABCD")
+        game = create_simulated_game(4, seed=6)
+        ledger.reset(game)
+        card = game.players[0].get_hand().cards[0]
+
+        # Act
+        with patch('builtins.print') as mock_print:
+            ledger.move(card, PILE, DISCARD, "clear_pile")
+
+        # Assert
+        self.assertEqual(ledger.violations[0]['event'], "clear_pile")
+        self.assertIn("room ABCD", mock_print.call_args[0][0])
+        self.assertEqual(ledger.locations[(card.suit, card.rank)], DISCARD)
+
+    def test_removing_a_player_reseats_the_ledger(self):
+        # Arrange
+        ledger = CardLedger(strict=True)
+        game = create_simulated_game(5, seed=7, ledger=ledger)
+        leaving = next(p for p in game.players if p is not game.get_current_player())
+
+        # Act
+        with patch('builtins.print'):
+            game.remove_player(leaving.player_id)
+            player = game.get_current_player()
+            game.play_cards(player.player_id, [c.to_dict() for c in game.get_legal_plays(player.player_id)[0]])
+
+        # Assert
+        self.assertEqual(ledger.violations, [])
+        self.assertEqual(ledger.audit(game), [])
+
+    def test_strict_ledger_raises(self):
+        ledger = CardLedger(strict=True)
+        with self.assertRaisesRegex(CardConservationError, "bomb"):
+            ledger.move(Card("H", "7"), 0, PILE, "bomb")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+import sys
+import os
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from game_engine.card import Card
+from game_engine.games.asshole import AssholeGame
+from game_engine.player import Player
+from game_engine.rules import RuleSet, CLEAR, THREES, STANDARD
+
+
+class TestRuleSet(unittest.TestCase):
+    """
+    Unit tests for RuleSet configuration and compilation.
+    """
+
+    def test_defaults_compile_to_the_standard_rules(self):
+        rules = RuleSet()
+        self.assertEqual(rules.rank_kinds['2'], CLEAR)
+        self.assertEqual(rules.rank_kinds['3'], THREES)
+        self.assertEqual(rules.rank_kinds['K'], STANDARD)
+        self.assertEqual(rules.clear_rank_value, 2)
+
+    def test_changing_the_clear_card(self):
+        rules = RuleSet(clear_rank='A', three_interrupts=False)
+        self.assertEqual(rules.rank_kinds['A'], CLEAR)
+        self.assertEqual(rules.rank_kinds['2'], STANDARD)
+        self.assertEqual(rules.rank_kinds['3'], STANDARD)
+
+    def test_from_dict_round_trip_and_validation(self):
+        rules = RuleSet(bombs=False, clear_rank=None)
+        self.assertEqual(RuleSet.from_dict(rules.to_dict()), rules)
+        self.assertEqual(RuleSet.from_dict(None), RuleSet())
+        for bad in [{'jokers': True}, {'clear_rank': '1'}, {'clear_rank': '3'}, ['bombs']]:
+            with self.assertRaises(ValueError):
+                RuleSet.from_dict(bad)
+
+    def test_games_with_equal_rules_share_a_dispatch_table(self):
+        first = AssholeGame(room_code="ABCD", rules=RuleSet(skips=False))
+        second = AssholeGame(room_code="EFGH", rules=RuleSet(skips=False))
+        self.assertIs(first._play_handlers, second._play_handlers)
+        self.assertIsNot(first._play_handlers, AssholeGame(room_code="IJKL")._play_handlers)
+
+
+class TestAssholeGameHouseRules(unittest.TestCase):
+    """
+    Plays under non-default RuleSets.
+    """
+
+    def make_game(self, rules):
+        game = AssholeGame(room_code="ABCD", rules=rules)
+        for i in range(4):
+            game.add_player(Player(f"Player {i}", player_id=f"p{i}"))
+        with patch('builtins.print'):
+            game.start_game()
+        self.player = game.get_current_player()
+        self.next_player = game.players[(game.current_player_index + 1) % 4]
+        return game
+
+    def play(self, game, player, cards):
+        player.get_hand().cards = list(cards) + [Card("C", "4"), Card("D", "4")]
+        with patch('builtins.print'):
+            game.play_cards(player.player_id, [card.to_dict() for card in cards])
+
+    def test_custom_clear_card_clears_and_twos_are_low(self):
+        # Arrange
+        game = self.make_game(RuleSet(clear_rank='A'))
+
+        # Act
+        self.play(game, self.player, [Card("H", "A")])
+
+        # Assert
+        self.assertEqual(game.pile, [])
+        self.assertIs(game.get_current_player(), self.player)
+        self.assertEqual(game.get_plays_for_hand([Card("H", "2")]), [[Card("H", "2")]])
+        game.pile, game.current_play_rank, game.current_play_count = [Card("S", "5")], 5, 1
+        self.assertEqual(game.get_plays_for_hand([Card("H", "2")]), [])
+
+    def test_disabled_bombs_never_open_a_bomb_window(self):
+        # Arrange
+        game = self.make_game(RuleSet(bombs=False))
+
+        # Act
+        self.play(game, self.player, [Card("H", "9")])
+
+        # Assert
+        self.assertFalse(game.interrupt_active)
+        self.assertIs(game.get_current_player(), self.next_player)
+
+    def test_disabled_three_interrupts_make_threes_ordinary(self):
+        # Arrange
+        game = self.make_game(RuleSet(three_interrupts=False, bombs=False))
+
+        # Act
+        self.play(game, self.player, [Card("H", "3"), Card("S", "3"), Card("D", "3")])
+
+        # Assert
+        self.assertFalse(game.interrupt_active)
+        self.assertEqual(game.current_play_rank, 3)
+        self.assertEqual(game.current_play_count, 3)
+
+    def test_disabled_skips_and_double_clears(self):
+        # Arrange
+        game = self.make_game(RuleSet(bombs=False, skips=False, double_clears=False))
+        self.play(game, self.player, [Card("H", "9"), Card("S", "9")])
+
+        # Act
+        self.play(game, self.next_player, [Card("D", "9"), Card("C", "9")])
+
+        # Assert
+        self.assertEqual(len(game.pile), 4)
+        self.assertIs(game.get_current_player(), game.players[(game.players.index(self.next_player) + 1) % 4])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import random
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from game_engine.bots.heuristic import HeuristicPolicy
+from game_engine.rules import RuleSet
+from game_engine.simulation import create_simulated_game, run_headless_game, get_final_standings, sweep_rule_variants
+
+
+class TestSimulation(unittest.TestCase):
+    """
+    Unit tests for the headless game runner.
+    """
+
+    def test_create_simulated_game_is_started_and_dealt(self):
+        game = create_simulated_game(5, seed=1)
+        self.assertTrue(game.is_game_started)
+        self.assertEqual(sum(len(p.get_hand().cards) for p in game.players), 52)
+
+    def test_run_headless_game_reaches_game_over(self):
+        for seed in range(10):
+            # Arrange
+            game = create_simulated_game(4, seed=seed)
+            policy = HeuristicPolicy(rng=random.Random(seed))
+
+            # Act
+            steps = run_headless_game(game, policy)
+
+            # Assert
+            self.assertTrue(game.is_game_over, f"seed {seed} did not finish in {steps} steps")
+            self.assertEqual(game.state_hash, game.compute_state_hash())
+
+    def test_same_seed_replays_identically(self):
+        finals = []
+        for _ in range(2):
+            game = create_simulated_game(4, seed=11)
+            run_headless_game(game, HeuristicPolicy(rng=random.Random(11)))
+            finals.append((game.state_hash, get_final_standings(game)))
+        self.assertEqual(finals[0], finals[1])
+
+    def test_seeding_leaves_the_process_random_state_alone(self):
+        # Arrange
+        random.seed(5)
+        expected = random.random()
+        random.seed(5)
+
+        # Act
+        first = create_simulated_game(4, seed=3)
+        second = create_simulated_game(4, seed=3)
+
+        # Assert
+        self.assertEqual(random.random(), expected)
+        self.assertEqual(first.state_hash, second.state_hash)
+
+    def test_final_standings_order(self):
+        game = create_simulated_game(4, seed=2)
+        run_headless_game(game, HeuristicPolicy(rng=random.Random(2)))
+        standings = get_final_standings(game)
+        self.assertEqual(game.get_player_by_id(standings[0]).rank, 1)
+        self.assertEqual(sorted(standings), sorted(p.player_id for p in game.players))
+
+
+    def test_sweep_rule_variants_plays_every_variant(self):
+        # Arrange
+        variants = [RuleSet(), RuleSet(bombs=False, skips=False), RuleSet(clear_rank=None, three_interrupts=False)]
+
+        # Act
+        summaries = sweep_rule_variants(variants, lambda seed: HeuristicPolicy(rng=random.Random(seed)), num_games=5)
+
+        # Assert
+        self.assertEqual([summary['rules'] for summary in summaries], [rules.to_dict() for rules in variants])
+        self.assertTrue(all(summary['games'] == 5 and summary['mean_steps'] > 0 for summary in summaries))
+
+
+if __name__ == '__main__':
+    unittest.main()
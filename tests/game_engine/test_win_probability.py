@@ -0,0 +1,114 @@
+import unittest
+import random
+import sys
+import os
+from concurrent.futures import Future
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from game_engine.simulation import create_simulated_game
+from game_engine.win_probability import WinProbabilityService, determinize, run_rollouts
+
+
+class ImmediateExecutor:
+    """Runs submitted work synchronously so the service can be tested without a process pool."""
+
+    def __init__(self):
+        self.submitted = 0
+
+    def submit(self, fn, *args):
+        self.submitted += 1
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+class TestDeterminize(unittest.TestCase):
+
+    def test_keeps_public_information(self):
+        # Arrange
+        game = create_simulated_game(4, seed=5)
+        viewer = game.players[0]
+
+        # Act
+        sample = determinize(game, random.Random(1), viewer_id=viewer.player_id)
+
+        # Assert
+        self.assertEqual([len(p.get_hand().cards) for p in sample.players], [len(p.get_hand().cards) for p in game.players])
+        self.assertEqual(sample.players[0].get_hand().cards, viewer.get_hand().cards)
+        original_hidden = sorted(c.to_string() for p in game.players[1:] for c in p.get_hand().cards)
+        sample_hidden = sorted(c.to_string() for p in sample.players[1:] for c in p.get_hand().cards)
+        self.assertEqual(original_hidden, sample_hidden)
+        self.assertNotEqual([c.to_string() for c in sample.players[1].get_hand().cards],
+                            [c.to_string() for c in game.players[1].get_hand().cards])
+        self.assertEqual(sample.state_hash, sample.compute_state_hash())
+
+    def test_does_not_mutate_live_game(self):
+        game = create_simulated_game(4, seed=5)
+        before = game.state_hash
+        determinize(game, random.Random(2))
+        self.assertEqual(game.state_hash, before)
+
+
+class TestWinProbabilityService(unittest.TestCase):
+
+    def test_rollout_counts_sum_to_samples(self):
+        game = create_simulated_game(4, seed=6)
+        counts = run_rollouts(game, 8, seed=1)
+        self.assertEqual(sum(president for president, _ in counts.values()), 8)
+        self.assertEqual(sum(asshole for _, asshole in counts.values()), 8)
+
+    def test_request_update_caches_by_state_hash_and_tops_up(self):
+        # Arrange
+        published = []
+        executor = ImmediateExecutor()
+        service = WinProbabilityService(samples_per_batch=4, target_samples=8, executor=executor,
+                                        min_publish_interval=0, publish=lambda room, est: published.append((room, est)))
+        game = create_simulated_game(4, seed=7)
+
+        # Act
+        first = service.request_update(game)
+        second = service.request_update(game)
+        third = service.request_update(game)
+
+        # Assert
+        self.assertEqual(first['samples'], 4)
+        self.assertEqual(second['samples'], 8)
+        self.assertEqual(third['samples'], 8)  # Target reached, served from cache
+        self.assertEqual(executor.submitted, 2)
+        self.assertEqual(published[-1][0], "SIM")
+        president_total = sum(p['president'] for p in third['players'].values())
+        self.assertAlmostEqual(president_total, 1.0)
+
+    def test_publish_is_throttled_per_room(self):
+        published = []
+        service = WinProbabilityService(samples_per_batch=2, target_samples=10, executor=ImmediateExecutor(),
+                                        min_publish_interval=60, publish=lambda room, est: published.append(est))
+        game = create_simulated_game(4, seed=8)
+
+        service.request_update(game)
+        service.request_update(game)
+
+        self.assertEqual(len(published), 1)
+
+    def test_requests_dropped_while_workers_busy(self):
+        class NeverFinishes(ImmediateExecutor):
+            def submit(self, fn, *args):
+                self.submitted += 1
+                return Future()
+
+        executor = NeverFinishes()
+        service = WinProbabilityService(max_workers=1, executor=executor)
+        game = create_simulated_game(4, seed=9)
+
+        service.request_update(game)
+        service.request_update(game)
+
+        self.assertEqual(executor.submitted, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
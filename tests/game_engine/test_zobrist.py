@@ -0,0 +1,91 @@
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from game_engine.card import Card
+from game_engine.zobrist import ZobristKeys, HashedAttribute, zobrist_keys, PILE, DISCARD
+
+
+class HashedThing:
+    value = HashedAttribute()
+
+    def __init__(self):
+        self.state_hash = 0
+
+
+class TestZobristKeys(unittest.TestCase):
+    """
+    Unit tests for the ZobristKeys table and the HashedAttribute descriptor.
+    """
+
+    def test_keys_are_deterministic_across_instances(self):
+        """
+        Two key tables with the same seed must agree, so separate processes hash states identically.
+        """
+        # Arrange
+        card = Card("S", "A")
+
+        # Act & Assert
+        self.assertEqual(ZobristKeys().card_key(card, 0), ZobristKeys().card_key(card, 0))
+        self.assertNotEqual(ZobristKeys(seed="other").card_key(card, 0), ZobristKeys().card_key(card, 0))
+
+    def test_card_keys_depend_on_card_and_location(self):
+        """
+        Tests that keys differ per card and per location and fit in 64 bits.
+        """
+        # Arrange
+        ace = Card("S", "A")
+        king = Card("S", "K")
+
+        # Act
+        keys = {zobrist_keys.card_key(ace, 0), zobrist_keys.card_key(ace, 1), zobrist_keys.card_key(ace, PILE),
+                zobrist_keys.card_key(ace, DISCARD), zobrist_keys.card_key(king, 0)}
+
+        # Assert
+        self.assertEqual(len(keys), 5)
+        self.assertTrue(all(0 <= key < 2 ** 64 for key in keys))
+
+    def test_move_key_is_reversible(self):
+        """
+        Tests that moving a card there and back restores the hash.
+        """
+        # Arrange
+        card = Card("H", "10")
+        state_hash = zobrist_keys.card_key(card, 2)
+
+        # Act
+        moved = state_hash ^ zobrist_keys.move_key(card, 2, PILE)
+        restored = moved ^ zobrist_keys.move_key(card, PILE, 2)
+
+        # Assert
+        self.assertEqual(moved, zobrist_keys.card_key(card, PILE))
+        self.assertEqual(restored, state_hash)
+
+    def test_none_attribute_contributes_nothing(self):
+        self.assertEqual(zobrist_keys.attribute_key("current_play_rank", None), 0)
+
+    def test_hashed_attribute_updates_owner_hash(self):
+        """
+        Tests that assignments through the descriptor XOR the old value out and the new value in.
+        """
+        # Arrange
+        thing = HashedThing()
+
+        # Act
+        thing.value = 5
+        after_first = thing.state_hash
+        thing.value = 7
+        thing.value = 5
+
+        # Assert
+        self.assertEqual(thing.value, 5)
+        self.assertEqual(after_first, zobrist_keys.attribute_key("value", 5))
+        self.assertEqual(thing.state_hash, after_first)
+        thing.value = None
+        self.assertEqual(thing.state_hash, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()